@@ -5,12 +5,13 @@ import os
 import tempfile
 from flask_login import login_required, current_user
 from app import db
-from models import User, VacationDays, VacationRequest, VacationStatus, Holiday, Role, EmploymentCertificate, CertificateStatus, CompanyInfo
-from forms import EmployeeVacationDaysForm, VacationApprovalForm, HolidayForm, CertificateApprovalForm, CompanyInfoForm, EmployeeHireDateForm, BulkUploadForm, VacationSearchForm, AdminVacationForm, EmployeeRegistrationForm, AdminCertificateIssueForm
+from models import User, VacationDays, VacationRequest, VacationRequestArchive, VacationStatus, Holiday, Role, EmploymentCertificate, CertificateStatus, CompanyInfo
+from forms import EmployeeVacationDaysForm, VacationApprovalForm, BulkVacationDecisionForm, HolidayForm, CertificateApprovalForm, CompanyInfoForm, EmployeeHireDateForm, BulkUploadForm, VacationSearchForm, AdminVacationForm, BulkVacationForm, EmployeeRegistrationForm, AdminCertificateIssueForm
 from functools import wraps
 from datetime import datetime, date
 import csv
 import io
+import time
 from docx import Document
 from docx.shared import Inches, Cm
 from docx.enum.text import WD_ALIGN_PARAGRAPH
@@ -20,7 +21,19 @@ import os
 import tempfile
 import pandas as pd
 from werkzeug.utils import secure_filename
-from utils import get_vacation_days_count
+from utils import get_vacation_days_count, check_overlapping_vacation
+from sqlalchemy import update
+from data_versions import VACATIONS, bump_version, get_user_versions, user_scope, department_scope
+from bulk_leave import post_bulk_leave
+from bulk_decision import decide_vacation_requests
+from year_rollover import provision_year, adjust_used_days
+from leave_policy import recalculate_entitlements
+from vacation_archive import year_range, query_vacations
+from asset_store import store_data_url
+from company_settings import get_company_settings
+from employee_search import name_filter, lookup_employees, TYPEAHEAD_LIMIT
+from metrics_registry import vacation_requests_created, vacation_decisions, certificate_generation_seconds, bulk_upload_rows, bulk_upload_rows_per_second, observe_export
+from department_stats import NON_DEDUCTIBLE_TYPES, department_usage as get_department_usage, record_vacation_added, record_vacation_removed, record_status_change, record_user_requests_removed
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -48,17 +61,11 @@ def dashboard():
     # 최근 신청된 휴가 목록 (10개)
     recent_requests = VacationRequest.query.order_by(VacationRequest.created_at.desc()).limit(10).all()
     
-    # 부서별 휴가 사용 통계
-    dept_stats = db.session.query(
-        User.department,
-        db.func.sum(VacationDays.used_days).label('used'),
-        db.func.sum(VacationDays.total_days).label('total')
-    ).join(VacationDays, User.id == VacationDays.user_id)\
-    .filter(User.department != None)\
-    .group_by(User.department).all()
-    
     current_year = datetime.now().year
     
+    # 부서별 휴가 사용 통계 (부서별 월간 집계 테이블에서 조회)
+    department_usage = get_department_usage(current_year)
+    
     # 추가 통계 데이터
     pending_vacations = VacationRequest.query.filter_by(status=VacationStatus.PENDING).count()
     pending_certificates = EmploymentCertificate.query.filter_by(status=CertificateStatus.PENDING).count()
@@ -85,6 +92,7 @@ def dashboard():
         recent_vacations=recent_vacations,
         recent_certificates=recent_certificates,
         department_stats=department_stats,
+        department_usage=department_usage,
         current_year=current_year
     )
 
@@ -118,10 +126,30 @@ def manage_employees():
         'admin/manage_employees.html',
         employees=employees,
         current_year=current_year,
-        upload_form=upload_form
+        upload_form=upload_form,
+        user_versions=get_user_versions(user.id for user in employees)  # 행 단위 조각 캐시 키
     )
 
 
+@admin_bp.route('/employees/recalculate-entitlements', methods=['POST'])
+@login_required
+@admin_required
+def recalculate_vacation_entitlements():
+    """입사일 기준 전 직원 연차 일괄 재계산"""
+    year = request.form.get('year', datetime.now().year, type=int)
+    
+    try:
+        provision_year(year)
+        changed = recalculate_entitlements(year)
+        db.session.commit()
+        flash(f'{year}년 연차가 입사일 기준으로 재계산되었습니다. (변경 {changed}명)', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'연차 재계산 중 오류가 발생했습니다: {str(e)}', 'danger')
+    
+    return redirect(url_for('admin.manage_employees'))
+
+
 @admin_bp.route('/employees/upload', methods=['POST'])
 @login_required
 @admin_required
@@ -131,6 +159,8 @@ def upload_employees():
     
     if form.validate_on_submit():
         try:
+            started = time.perf_counter()
+            
             # 업로드된 파일 처리
             file = form.file.data
             filename = secure_filename(file.filename)
@@ -206,9 +236,18 @@ def upload_employees():
                     error_count += 1
                     error_messages.append(f"행 {idx+1}: {str(e)}")
             
-            # 트랜잭션 완료
+            # 신규 직원 휴가 일수 일괄 생성 후 트랜잭션 완료
+            db.session.flush()
+            provision_year(datetime.now().year)
             db.session.commit()
             
+            # 처리량 지표
+            bulk_upload_rows.inc(success_count, upload='employees', result='created')
+            bulk_upload_rows.inc(error_count, upload='employees', result='failed')
+            elapsed = time.perf_counter() - started
+            if len(df) and elapsed > 0:
+                bulk_upload_rows_per_second.observe(len(df) / elapsed, upload='employees')
+            
             # 결과 메시지
             if success_count > 0:
                 flash(f'{success_count}명의 직원이 성공적으로 등록되었습니다.', 'success')
@@ -286,16 +325,10 @@ def add_employee():
             db.session.add(new_employee)
             db.session.flush()  # ID를 얻기 위해 flush
             
-            # 현재 연도와 내년 휴가 일수 설정
+            # 현재 연도와 내년 휴가 일수 설정 (입사일 기준 부여)
             current_year = datetime.now().year
             for year in [current_year, current_year + 1]:
-                vacation_days = VacationDays(
-                    user_id=new_employee.id,
-                    year=year,
-                    total_days=15,  # 기본 15일
-                    used_days=0
-                )
-                db.session.add(vacation_days)
+                provision_year(year, User.id == new_employee.id)
             
             db.session.commit()
             flash(f'{form.name.data}님이 성공적으로 등록되었습니다.', 'success')
@@ -315,11 +348,7 @@ def add_employee():
 @admin_required
 def add_vacation():
     """관리자가 직원에게 휴가 등록"""
-    form = AdminVacationForm()
-    
-    # 직원 목록을 폼에 설정
-    employees = User.query.filter_by(role=Role.EMPLOYEE).all()
-    form.user_id.choices = [(emp.id, f"{emp.name} ({emp.department})") for emp in employees]
+    form = AdminVacationForm()  # 직원은 자동완성으로 선택, 제출된 ID만 검증
     
     if form.validate_on_submit():
         try:
@@ -345,14 +374,7 @@ def add_vacation():
                         return render_template('admin/add_vacation.html', form=form)
             
             # 중복 휴가 신청 확인
-            existing_vacation = VacationRequest.query.filter(
-                VacationRequest.user_id == form.user_id.data,
-                VacationRequest.status.in_([VacationStatus.PENDING, VacationStatus.APPROVED]),
-                ((VacationRequest.start_date <= form.start_date.data) & (VacationRequest.end_date >= form.start_date.data)) |
-                ((VacationRequest.start_date <= form.end_date.data) & (VacationRequest.end_date >= form.end_date.data))
-            ).first()
-            
-            if existing_vacation:
+            if check_overlapping_vacation(form.user_id.data, form.start_date.data, form.end_date.data):
                 flash('해당 기간에 이미 휴가가 등록되어 있습니다.', 'danger')
                 return render_template('admin/add_vacation.html', form=form)
             
@@ -370,30 +392,16 @@ def add_vacation():
             )
             
             db.session.add(new_vacation)
+            record_vacation_added(new_vacation, form.user_id.employee)
             
             # 특별휴가가 아닌 경우 휴가 일수 차감
             if form.type.data != '특별휴가':
-                year = form.start_date.data.year
-                user_vacation_days = VacationDays.query.filter_by(
-                    user_id=form.user_id.data, 
-                    year=year
-                ).first()
-                
-                if user_vacation_days:
-                    user_vacation_days.used_days = (user_vacation_days.used_days or 0) + vacation_days
-                else:
-                    # 휴가 일수 레코드가 없으면 생성
-                    new_vacation_days = VacationDays(
-                        user_id=form.user_id.data,
-                        year=year,
-                        total_days=15,  # 기본 15일
-                        used_days=vacation_days
-                    )
-                    db.session.add(new_vacation_days)
+                adjust_used_days(form.user_id.data, form.start_date.data.year, vacation_days)
             
             db.session.commit()
+            vacation_requests_created.inc(source='admin')
             
-            user = User.query.get(form.user_id.data)
+            user = form.user_id.employee
             flash(f'{user.name}님의 휴가가 성공적으로 등록되었습니다.', 'success')
             return redirect(url_for('admin.manage_vacations'))
             
@@ -403,6 +411,45 @@ def add_vacation():
     
     return render_template('admin/add_vacation.html', form=form)
 
+@admin_bp.route('/vacations/bulk', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def bulk_vacation():
+    """전사 일괄 휴가 등록 (휴무일 등)"""
+    form = BulkVacationForm()
+    result = None
+
+    if form.validate_on_submit():
+        department = form.department.data if form.department.data != 'all' else None
+        position = form.position.data if form.position.data != 'all' else None
+
+        try:
+            result = post_bulk_leave(
+                form.start_date.data,
+                form.end_date.data,
+                form.type.data,
+                form.reason.data,
+                current_user.id,
+                department=department,
+                position=position,
+                dry_run=form.dry_run.data
+            )
+
+            if result['dry_run']:
+                flash(f"미리보기: {result['created']}명 등록 예정, {len(result['conflicts'])}명 제외", 'info')
+            else:
+                db.session.commit()
+                vacation_requests_created.inc(result['created'], source='bulk')
+                flash(f"{result['created']}명의 휴가가 일괄 등록되었습니다. (제외 {len(result['conflicts'])}명)", 'success')
+        except ValueError as e:
+            flash(str(e), 'danger')
+        except Exception as e:
+            db.session.rollback()
+            result = None
+            flash(f'일괄 등록 중 오류가 발생했습니다: {str(e)}', 'danger')
+
+    return render_template('admin/bulk_vacation.html', form=form, result=result)
+
 @admin_bp.route('/employees/vacation-days', methods=['GET', 'POST'])
 @login_required
 @admin_required
@@ -465,13 +512,12 @@ def manage_vacations():
     """휴가 관리 페이지 (기간 검색 및 엑셀 출력 지원)"""
     form = VacationSearchForm()
     
-    # 기본 쿼리
-    query = db.session.query(
-        VacationRequest,
-        User.name,
-        User.department,
-        User.position
-    ).join(User, User.id == VacationRequest.user_id)
+    # 검색 조건 (보관 테이블 조회 여부를 정하기 위해 모델과 분리해서 보관)
+    date_from = date_to = None
+    by_year = False
+    employee_name = None
+    status = None
+    department = None
     
     # 폼 처리 (POST 요청 모두 처리)
     if request.method == 'POST':
@@ -481,44 +527,60 @@ def manage_vacations():
         
         # 검색 필터 적용 (우선순위: 년도/월 > 기간 > 기타)
         
-        # 1. 년도/월 검색 (우선순위 높음)
+        # 1. 년도/월 검색 (우선순위 높음, 휴가 시작일 범위로 변환해서 인덱스 사용)
         if form.year.data and form.year.data != 0:
-            # SQLite에서는 extract 대신 strftime 사용
-            from sqlalchemy import func
-            query = query.filter(func.strftime('%Y', VacationRequest.start_date) == str(form.year.data))
-            
-            # 월이 선택된 경우 해당 월만 검색
-            if hasattr(form, 'month') and form.month.data and form.month.data != 0:
-                month_str = f'{form.month.data:02d}'  # 01, 02, ..., 12 형식
-                query = query.filter(func.strftime('%m', VacationRequest.start_date) == month_str)
+            date_from, date_to = year_range(form.year.data, form.month.data or None)
+            by_year = True
         
         # 2. 기간 검색 (년도가 선택되지 않은 경우에만 적용)
         elif form.start_date.data or form.end_date.data:
-            if form.start_date.data:
-                query = query.filter(VacationRequest.start_date >= form.start_date.data)
-            if form.end_date.data:
-                query = query.filter(VacationRequest.end_date <= form.end_date.data)
+            date_from, date_to = form.start_date.data, form.end_date.data
         
         # 3. 직원명 검색 (선택사항)
         if form.employee_name.data and form.employee_name.data.strip():
-            query = query.filter(User.name.contains(form.employee_name.data.strip()))
+            employee_name = form.employee_name.data.strip()
         
         # 4. 상태 검색
         if form.status.data != 'all':
-            query = query.filter(VacationRequest.status == form.status.data)
+            status = form.status.data
         
         # 5. 부서 검색
         if form.department.data != 'all':
-            query = query.filter(User.department == form.department.data)
+            department = form.department.data
     
     # URL 파라미터로부터 필터 적용 (기존 호환성)
     status_filter = request.args.get('status', 'all')
     if status_filter != 'all' and request.method != 'POST':
-        query = query.filter(VacationRequest.status == status_filter)
+        status = status_filter
         form.status.data = status_filter
     
-    # 정렬 (최신순)
-    results = query.order_by(VacationRequest.created_at.desc()).all()
+    def build_query(model):
+        query = db.session.query(
+            model,
+            User.name,
+            User.department,
+            User.position
+        ).join(User, User.id == model.user_id)
+        
+        if by_year:
+            query = query.filter(model.start_date.between(date_from, date_to))
+        else:
+            if date_from:
+                query = query.filter(model.start_date >= date_from)
+            if date_to:
+                query = query.filter(model.end_date <= date_to)
+        if employee_name:
+            query = query.filter(name_filter(employee_name))
+        if status:
+            query = query.filter(model.status == status)
+        if department:
+            query = query.filter(User.department == department)
+        
+        # 정렬 (최신순)
+        return query.order_by(model.created_at.desc())
+    
+    # 검색 기간이 보관된 연도에 닿을 때만 보관 테이블도 조회
+    results = query_vacations(build_query, date_from, date_to, key=lambda row: row[0].created_at)
     
     # 결과 정리
     vacation_requests = []
@@ -532,9 +594,119 @@ def manage_vacations():
         'admin/manage_vacations.html',
         vacation_requests=vacation_requests,
         status_filter=status_filter,
-        search_form=form
+        search_form=form,
+        decision_form=BulkVacationDecisionForm(formdata=None),
+        user_versions=get_user_versions(vacation_request.user_id for vacation_request in vacation_requests)
     )
 
+@admin_bp.route('/calendar')
+@login_required
+@admin_required
+def vacation_calendar():
+    """팀 휴가 현황 캘린더 API (날짜별 부서 휴가 인원 + 공휴일)"""
+    from vacation_calendar import build_calendar
+    from datetime import timedelta
+    
+    today = date.today()
+    try:
+        date_from = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if request.args.get('from') else today.replace(day=1)
+        if request.args.get('to'):
+            date_to = datetime.strptime(request.args['to'], '%Y-%m-%d').date()
+        else:
+            next_month = (date_from.replace(day=28) + timedelta(days=4)).replace(day=1)
+            date_to = next_month - timedelta(days=1)
+    except ValueError:
+        return jsonify({'error': '날짜는 YYYY-MM-DD 형식이어야 합니다.'}), 400
+    
+    if date_to < date_from:
+        return jsonify({'error': '종료일은 시작일보다 빠를 수 없습니다.'}), 400
+    if (date_to - date_from).days > 366:
+        return jsonify({'error': '조회 기간은 최대 1년입니다.'}), 400
+    
+    department = request.args.get('department') or None
+    return jsonify(build_calendar(date_from, date_to, department))
+
+@admin_bp.route('/employees/search')
+@login_required
+@admin_required
+def employee_typeahead():
+    """직원 선택 API (이름/아이디/부서/이메일 검색, 검색어가 없으면 이름순, page/limit으로 페이지 조회)"""
+    query = request.args.get('q', '')
+    page = request.args.get('page', 1, type=int)
+    limit = request.args.get('limit', TYPEAHEAD_LIMIT, type=int)
+    return jsonify(lookup_employees(query, page, limit))
+
+@admin_bp.route('/cache-stats')
+@login_required
+@admin_required
+def cache_stats():
+    """템플릿 조각 캐시 적중률 API"""
+    from fragment_cache import fragment_cache
+    return jsonify(fragment_cache.stats())
+
+@admin_bp.route('/metrics')
+@login_required
+@admin_required
+def metrics():
+    """경로별 응답 시간/캐시 지표 (Prometheus 텍스트 형식, 모든 워커 합산)"""
+    from request_metrics import render_metrics
+    return make_response(render_metrics(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'})
+
+@admin_bp.route('/profiles')
+@login_required
+@admin_required
+def profiles():
+    """저장된 느린 요청 프로파일 목록 API"""
+    from request_metrics import list_profiles
+    return jsonify(list_profiles())
+
+@admin_bp.route('/profiles/<name>')
+@login_required
+@admin_required
+def download_profile(name):
+    """느린 요청 프로파일 내려받기"""
+    from flask import abort, send_from_directory
+    from request_metrics import PROFILE_DIR, PROFILE_NAME
+    if not PROFILE_NAME.match(name):
+        abort(404)
+    return send_from_directory(PROFILE_DIR, name, as_attachment=name.endswith('.txt'))
+
+@admin_bp.route('/vacations/bulk-decision', methods=['POST'])
+@login_required
+@admin_required
+def bulk_process_vacations():
+    """선택한 휴가 신청 일괄 승인/반려"""
+    form = BulkVacationDecisionForm()
+    if not form.validate_on_submit():
+        flash('처리 방법을 선택하세요.', 'danger')
+        return redirect(url_for('admin.manage_vacations', status=VacationStatus.PENDING))
+    
+    try:
+        result = decide_vacation_requests(
+            request.form.getlist('request_ids', type=int),
+            form.status.data,
+            current_user.id,
+            comments=form.comments.data or None
+        )
+        db.session.commit()
+        vacation_decisions.inc(result['processed'], status=form.status.data, mode='bulk')
+    except ValueError as e:
+        db.session.rollback()
+        flash(str(e), 'danger')
+        return redirect(url_for('admin.manage_vacations', status=VacationStatus.PENDING))
+    except Exception as e:
+        db.session.rollback()
+        flash(f'일괄 처리 중 오류가 발생했습니다: {str(e)}', 'danger')
+        return redirect(url_for('admin.manage_vacations', status=VacationStatus.PENDING))
+    
+    label = '승인' if form.status.data == VacationStatus.APPROVED else '반려'
+    flash(f"휴가 신청 {result['processed']}건을 {label} 처리했습니다.", 'success')
+    if result['skipped']:
+        details = ', '.join(f"{item['name'] or '#' + str(item['id'])}({item['reason']})" for item in result['skipped'][:10])
+        more = f" 외 {len(result['skipped']) - 10}건" if len(result['skipped']) > 10 else ''
+        flash(f"제외된 신청 {len(result['skipped'])}건: {details}{more}", 'warning')
+    return redirect(url_for('admin.manage_vacations', status=VacationStatus.PENDING))
+
 @admin_bp.route('/vacations/<int:request_id>', methods=['GET', 'POST'])
 @login_required
 @admin_required
@@ -544,20 +716,43 @@ def process_vacation(request_id):
     form = VacationApprovalForm()
     
     if form.validate_on_submit():
-        vacation_request.status = form.status.data
-        vacation_request.comments = form.comments.data
-        vacation_request.approved_by = current_user.id
-        vacation_request.approval_date = datetime.now()
+        old_status = vacation_request.status
         
-        # 승인될 경우 휴가 일수 업데이트
-        if form.status.data == VacationStatus.APPROVED:
-            year = vacation_request.start_date.year
-            vacation_days = VacationDays.query.filter_by(user_id=vacation_request.user_id, year=year).first()
-            
-            if vacation_days:
-                vacation_days.used_days += vacation_request.days
+        # 화면을 연 뒤 다른 관리자가 먼저 처리했다면 이전 상태 조건이 맞지 않아 변경되지 않는다
+        claimed = db.session.execute(
+            update(VacationRequest)
+            .where(VacationRequest.id == request_id, VacationRequest.status == old_status)
+            .values(
+                status=form.status.data,
+                comments=form.comments.data,
+                approved_by=current_user.id,
+                approval_date=datetime.now()
+            )
+            .execution_options(synchronize_session='fetch')
+        ).rowcount
+        if not claimed:
+            db.session.rollback()
+            flash('다른 관리자가 먼저 처리한 요청입니다. 현재 상태를 확인하세요.', 'warning')
+            return redirect(url_for('admin.process_vacation', request_id=request_id))
+        
+        # 승인/승인 취소 시 휴가 일수 증감 (UPDATE 한 문장으로 처리해 동시 처리 시에도 누락 없음, 특별휴가는 차감 없음)
+        was_approved = old_status == VacationStatus.APPROVED
+        is_approved = form.status.data == VacationStatus.APPROVED
+        if was_approved != is_approved and vacation_request.type not in NON_DEDUCTIBLE_TYPES:
+            days = vacation_request.days if is_approved else -vacation_request.days
+            adjust_used_days(vacation_request.user_id, vacation_request.start_date.year, days)
+        
+        # 부서별 휴가 집계 및 변경 버전 반영 (세션을 거치지 않았으므로 직접 호출)
+        record_status_change(vacation_request, old_status)
+        department = vacation_request.user.department
+        bump_version(
+            VACATIONS,
+            user_scope(vacation_request.user_id),
+            *([department_scope(department)] if department else [])
+        )
             
         db.session.commit()
+        vacation_decisions.inc(status=form.status.data, mode='single')
         flash('휴가 요청이 처리되었습니다.', 'success')
         return redirect(url_for('admin.manage_vacations'))
     
@@ -572,59 +767,60 @@ def process_vacation(request_id):
 
 def export_vacation_data(form):
     """휴가 데이터 엑셀 다운로드 (검색 조건 적용)"""
+    started = time.perf_counter()
     try:
-        # 쿼리 생성
-        query = db.session.query(
-            User.name,
-            User.department,
-            User.position,
-            VacationRequest.start_date,
-            VacationRequest.end_date,
-            VacationRequest.days,
-            VacationRequest.type,
-            VacationRequest.reason,
-            VacationRequest.status,
-            VacationRequest.created_at,
-            VacationRequest.approval_date,
-            User.username
-        ).join(User, User.id == VacationRequest.user_id)
-        
-        # 검색 조건 적용 (엑셀 출력용)
+        # 1. 년도/월 검색 (우선순위 높음) 2. 기간 검색 (년도가 선택되지 않은 경우에만 적용)
+        by_year = hasattr(form, 'year') and form.year.data and form.year.data != 0
+        if by_year:
+            month = form.month.data if hasattr(form, 'month') and form.month.data else None
+            date_from, date_to = year_range(form.year.data, month)
+        else:
+            date_from = form.start_date.data if hasattr(form, 'start_date') else None
+            date_to = form.end_date.data if hasattr(form, 'end_date') else None
         
-        # 1. 년도/월 검색 (우선순위 높음)
-        if hasattr(form, 'year') and form.year.data and form.year.data != 0:
-            from sqlalchemy import func
-            query = query.filter(func.strftime('%Y', VacationRequest.start_date) == str(form.year.data))
+        def build_query(model):
+            # 쿼리 생성
+            query = db.session.query(
+                User.name,
+                User.department,
+                User.position,
+                model.start_date,
+                model.end_date,
+                model.days,
+                model.type,
+                model.reason,
+                model.status,
+                model.created_at,
+                model.approval_date,
+                User.username
+            ).join(User, User.id == model.user_id)
             
-            # 월이 선택된 경우 해당 월만 검색
-            if hasattr(form, 'month') and form.month.data and form.month.data != 0:
-                month_str = f'{form.month.data:02d}'  # 01, 02, ..., 12 형식
-                query = query.filter(func.strftime('%m', VacationRequest.start_date) == month_str)
-        
-        # 2. 기간 검색 (년도가 선택되지 않은 경우에만 적용)
-        elif (hasattr(form, 'start_date') and form.start_date.data) or (hasattr(form, 'end_date') and form.end_date.data):
-            if hasattr(form, 'start_date') and form.start_date.data:
-                query = query.filter(VacationRequest.start_date >= form.start_date.data)
-            if hasattr(form, 'end_date') and form.end_date.data:
-                query = query.filter(VacationRequest.end_date <= form.end_date.data)
-        
-        # 3. 직원명 검색 (선택사항)
-        if hasattr(form, 'employee_name') and form.employee_name.data and form.employee_name.data.strip():
-            query = query.filter(User.name.contains(form.employee_name.data.strip()))
-        
-        # 4. 상태 검색
-        if hasattr(form, 'status') and form.status.data != 'all':
-            query = query.filter(VacationRequest.status == form.status.data)
-        
-        # 5. 부서 검색
-        if hasattr(form, 'department') and form.department.data != 'all':
-            query = query.filter(User.department == form.department.data)
-        
-        # 정렬
-        query = query.order_by(VacationRequest.created_at.desc())
+            # 검색 조건 적용 (엑셀 출력용)
+            if by_year:
+                query = query.filter(model.start_date.between(date_from, date_to))
+            else:
+                if date_from:
+                    query = query.filter(model.start_date >= date_from)
+                if date_to:
+                    query = query.filter(model.end_date <= date_to)
+            
+            # 3. 직원명 검색 (선택사항)
+            if hasattr(form, 'employee_name') and form.employee_name.data and form.employee_name.data.strip():
+                query = query.filter(name_filter(form.employee_name.data.strip()))
+            
+            # 4. 상태 검색
+            if hasattr(form, 'status') and form.status.data != 'all':
+                query = query.filter(model.status == form.status.data)
+            
+            # 5. 부서 검색
+            if hasattr(form, 'department') and form.department.data != 'all':
+                query = query.filter(User.department == form.department.data)
+            
+            # 정렬
+            return query.order_by(model.created_at.desc())
         
-        # 결과 가져오기
-        results = query.all()
+        # 결과 가져오기 (검색 기간이 보관된 연도에 닿을 때만 보관 테이블도 조회)
+        results = query_vacations(build_query, date_from, date_to)
         
         if not results:
             # 데이터가 없는 경우 빈 엑셀 파일 생성
@@ -662,6 +858,7 @@ def export_vacation_data(form):
         
         output.seek(0)
         excel_data = output.getvalue()
+        observe_export('vacations', len(results), started)
         
         # 응답 생성
         response = make_response(excel_data)
@@ -683,20 +880,14 @@ def delete_vacation_request(request_id):
     vacation_request = VacationRequest.query.get_or_404(request_id)
     
     try:
-        # 승인된 휴가인 경우 휴가 일수 복구
-        if vacation_request.status == VacationStatus.APPROVED:
-            year = vacation_request.start_date.year
-            user_vacation_days = VacationDays.query.filter_by(
-                user_id=vacation_request.user_id, 
-                year=year
-            ).first()
-            
-            if user_vacation_days:
-                user_vacation_days.used_days = max(0, user_vacation_days.used_days - vacation_request.days)
+        # 승인된 휴가인 경우 휴가 일수 복구 (특별휴가는 차감하지 않았으므로 제외)
+        if vacation_request.status == VacationStatus.APPROVED and vacation_request.type not in NON_DEDUCTIBLE_TYPES:
+            adjust_used_days(vacation_request.user_id, vacation_request.start_date.year, -vacation_request.days)
         
         employee_name = vacation_request.user.name
         vacation_period = f"{vacation_request.start_date.strftime('%Y-%m-%d')} ~ {vacation_request.end_date.strftime('%Y-%m-%d')}"
         
+        record_vacation_removed(vacation_request)
         db.session.delete(vacation_request)
         db.session.commit()
         
@@ -717,12 +908,12 @@ def export_vacations():
     year = request.args.get('year', datetime.now().year, type=int)
     status = request.args.get('status', 'all')
     
-    # 폼 생성 및 데이터 설정
-    form = VacationSearchForm()
-    if year != datetime.now().year:
-        form.year.data = year
-    if status != 'all':
-        form.status.data = status
+    # 폼 생성 및 데이터 설정 (GET에서는 폼 기본값이 채워지지 않으므로 모든 조건을 직접 지정)
+    form = VacationSearchForm(formdata=None)
+    form.year.data = year
+    form.month.data = 0
+    form.status.data = status
+    form.department.data = request.args.get('department', 'all')
     
     return export_vacation_data(form)
 
@@ -795,18 +986,15 @@ def manage_certificates():
     # 정렬 (최신순)
     certificates = query.order_by(EmploymentCertificate.created_at.desc()).all()
     
-    # 관리자 직접 발행 폼
+    # 관리자 직접 발행 폼 (직원은 자동완성으로 선택)
     issue_form = AdminCertificateIssueForm()
     
-    # 직원 목록 (관리자 제외)
-    employees = User.query.filter_by(role=Role.EMPLOYEE).order_by(User.name).all()
-    issue_form.user_id.choices = [(emp.id, f"{emp.name} ({emp.department or '미지정'})") for emp in employees]
-    
     return render_template(
         'admin/manage_certificates.html',
         certificates=certificates,
         status_filter=status_filter,
-        issue_form=issue_form
+        issue_form=issue_form,
+        user_versions=get_user_versions(cert.EmploymentCertificate.user_id for cert in certificates)
     )
 
 
@@ -817,16 +1005,9 @@ def direct_issue_certificate():
     """관리자 직접 증명서 발행"""
     form = AdminCertificateIssueForm()
     
-    # 직원 목록 설정
-    employees = User.query.filter_by(role=Role.EMPLOYEE).order_by(User.name).all()
-    form.user_id.choices = [(emp.id, f"{emp.name} ({emp.department or '미지정'})") for emp in employees]
-    
+    # 직원 ID는 폼 검증에서 기본키로 확인 (직원 역할이 아니면 검증 실패)
     if form.validate_on_submit():
-        # 직원 정보 확인
-        employee = User.query.get(form.user_id.data)
-        if not employee or employee.role != Role.EMPLOYEE:
-            flash('유효하지 않은 직원입니다.', 'danger')
-            return redirect(url_for('admin.manage_certificates'))
+        employee = form.user_id.employee
         
         # 증명서 즉시 발급
         certificate = EmploymentCertificate(
@@ -907,22 +1088,13 @@ def download_certificate(certificate_id):
         flash('직원 정보를 찾을 수 없습니다.', 'danger')
         return redirect(url_for('admin.manage_certificates'))
     
-    # 회사 정보 조회
-    company_info = CompanyInfo.query.first()
-    if not company_info:
-        # 기본 회사 정보 설정
-        company_info = CompanyInfo(
-            name="에스에스전력 주식회사",
-            ceo_name="이상진",
-            registration_number="123-45-67890",
-            address="서울특별시 강남구 테헤란로 123",
-            phone="02-1234-5678",
-            fax="02-1234-5679"
-        )
+    # 회사 정보 조회 (워커별 캐시, 미등록 시 기본값)
+    company_info = get_company_settings()
     
     try:
         # PDF 생성
-        pdf_buffer = generate_certificate_pdf(certificate, employee, company_info)
+        with certificate_generation_seconds.time(channel='admin'):
+            pdf_buffer = generate_certificate_pdf(certificate, employee, company_info)
         
         # 파일명 생성
         filename = f"재직증명서_{employee.name}_{certificate.issued_date.strftime('%Y%m%d')}.docx"
@@ -940,7 +1112,7 @@ def download_certificate(certificate_id):
 
 
 def generate_certificate_pdf(certificate, employee, company_info):
-    """재직증명서 Word 문서 생성"""
+    """재직증명서 Word 문서 생성 (company_info: get_company_settings() 스냅샷)"""
     
     # Word 문서 생성
     doc = Document()
@@ -1044,7 +1216,7 @@ def generate_certificate_pdf(certificate, employee, company_info):
     company_para = doc.add_paragraph()
     company_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
     company_para.space_after = 0
-    company_run = company_para.add_run('주식회사 에스에스전력')
+    company_run = company_para.add_run(company_info.name)
     company_run.font.name = '맑은 고딕'
     company_run.font.size = Inches(0.21)  # 15pt
     company_run.bold = True
@@ -1054,7 +1226,7 @@ def generate_certificate_pdf(certificate, employee, company_info):
     ceo_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
     ceo_para.space_after = 0
     
-    ceo_run = ceo_para.add_run('대표이사: 김세인')
+    ceo_run = ceo_para.add_run(f'대표이사: {company_info.ceo_name}')
     ceo_run.font.name = '맑은 고딕'
     ceo_run.font.size = Inches(0.19)  # 14pt
     
@@ -1135,12 +1307,16 @@ def employee_vacation_report(user_id):
         # VacationDays 데이터 조회
         vacation_days = VacationDays.query.filter_by(user_id=user.id, year=year).first()
         
-        # 해당 연도 휴가 신청 내역
-        from sqlalchemy import func
-        vacation_requests = VacationRequest.query.filter(
-            VacationRequest.user_id == user.id,
-            func.strftime('%Y', VacationRequest.start_date) == str(year)
-        ).order_by(VacationRequest.start_date).all()
+        # 해당 연도 휴가 신청 내역 (보관된 연도면 보관 테이블에서 조회)
+        year_start, year_end = year_range(year)
+        vacation_requests = query_vacations(
+            lambda model: model.query.filter(
+                model.user_id == user.id,
+                model.start_date.between(year_start, year_end)
+            ).order_by(model.start_date),
+            year_start, year_end,
+            key=lambda req: req.start_date, reverse=False
+        )
         
         # 승인된 휴가 총 일수
         approved_days = sum(req.days for req in vacation_requests if req.status == '승인됨')
@@ -1178,15 +1354,20 @@ def export_employee_vacation_report(user_id):
         return redirect(url_for('admin.manage_employees'))
     
     # 데이터 준비
+    started = time.perf_counter()
     current_year = datetime.now().year
     all_requests = []
     
-    # 최근 3년간 휴가 신청 내역
-    from sqlalchemy import func
-    vacation_requests = VacationRequest.query.filter(
-        VacationRequest.user_id == user.id,
-        func.strftime('%Y', VacationRequest.start_date).between(str(current_year - 2), str(current_year))
-    ).order_by(VacationRequest.start_date).all()
+    # 최근 3년간 휴가 신청 내역 (보관된 연도 포함)
+    date_from, date_to = year_range(current_year - 2)[0], year_range(current_year)[1]
+    vacation_requests = query_vacations(
+        lambda model: model.query.filter(
+            model.user_id == user.id,
+            model.start_date.between(date_from, date_to)
+        ).order_by(model.start_date),
+        date_from, date_to,
+        key=lambda req: req.start_date, reverse=False
+    )
     
     for req in vacation_requests:
         all_requests.append({
@@ -1236,6 +1417,7 @@ def export_employee_vacation_report(user_id):
         summary_df.to_excel(writer, sheet_name='연도별요약', index=False)
     
     output.seek(0)
+    observe_export('employee_report', len(all_requests), started)
     
     # 파일명 생성
     filename = f"{user.name}_휴가보고서_{datetime.now().strftime('%Y%m%d')}.xlsx"
@@ -1264,10 +1446,14 @@ def delete_employee(user_id):
     user_name = user.name
     
     try:
+        # 부서별 휴가 집계에서 차감
+        record_user_requests_removed(user)
         # 휴가 데이터 삭제
         VacationDays.query.filter_by(user_id=user.id).delete()
-        # 휴가 신청 삭제
+        # 휴가 신청 삭제 (대량 삭제는 세션 이벤트를 거치지 않으므로 버전을 직접 증가)
         VacationRequest.query.filter_by(user_id=user.id).delete()
+        VacationRequestArchive.query.filter_by(user_id=user.id).delete()
+        bump_version(VACATIONS)
         # 재직증명서 신청 삭제
         EmploymentCertificate.query.filter_by(user_id=user.id).delete()
         
@@ -1306,7 +1492,17 @@ def manage_company_info():
         company_info.phone = form.phone.data
         company_info.fax = form.fax.data
         company_info.website = form.website.data
-        company_info.stamp_image = form.stamp_image.data
+        
+        # 직인은 새 이미지를 입력했을 때만 교체 (이미지 저장소에 보관하고 행에는 다이제스트만 저장)
+        if form.remove_stamp.data:
+            company_info.stamp_asset = None
+        elif form.stamp_image.data and form.stamp_image.data.strip():
+            try:
+                company_info.stamp_asset = store_data_url(form.stamp_image.data)
+            except ValueError as e:
+                db.session.rollback()
+                flash(f'직인 이미지 오류: {e}', 'danger')
+                return render_template('admin/manage_company_info.html', form=form, company_info=CompanyInfo.query.first())
         
         db.session.commit()
         flash('회사 정보가 성공적으로 저장되었습니다.', 'success')
@@ -1321,7 +1517,6 @@ def manage_company_info():
         form.phone.data = company_info.phone
         form.fax.data = company_info.fax
         form.website.data = company_info.website
-        form.stamp_image.data = company_info.stamp_image
     
     return render_template(
         'admin/manage_company_info.html',
@@ -1344,8 +1539,11 @@ def set_hire_date():
         # 해당 직원 정보 가져오기
         user = User.query.get_or_404(user_id)
         
-        # 입사일 업데이트
+        # 입사일 업데이트 후 올해/내년 연차 재계산
         user.hire_date = hire_date
+        current_year = datetime.now().year
+        for year in [current_year, current_year + 1]:
+            recalculate_entitlements(year, User.id == user.id)
         db.session.commit()
         
         flash(f'직원 {user.name}의 입사일이 설정되었습니다.', 'success')
@@ -7,8 +7,18 @@ from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_login import LoginManager
 
-# 로깅 설정
-logging.basicConfig(level=logging.DEBUG)
+# 로깅 설정 (환경별 기본 레벨, LOG_LEVEL로 전체 / LOG_LEVELS="이름=레벨,..."로 로거별 조정)
+APP_ENV = os.environ.get('APP_ENV') or os.environ.get('FLASK_ENV') or 'development'
+DEFAULT_LOG_LEVELS = {'production': 'INFO', 'staging': 'INFO', 'development': 'DEBUG'}
+
+logging.basicConfig(
+    level=os.environ.get('LOG_LEVEL', DEFAULT_LOG_LEVELS.get(APP_ENV, 'INFO')).upper(),
+    format='%(asctime)s %(levelname)s [%(name)s] %(message)s'
+)
+for entry in os.environ.get('LOG_LEVELS', '').split(','):
+    if '=' in entry:
+        logger_name, level = entry.split('=', 1)
+        logging.getLogger(logger_name.strip()).setLevel(level.strip().upper())
 
 class Base(DeclarativeBase):
     pass
@@ -88,10 +98,36 @@ login_manager.login_message_category = 'warning'
 with app.app_context():
     # 모델 임포트
     import models  # noqa: F401
+    import data_versions  # noqa: F401  변경 버전 카운터 이벤트 등록
     
     # 데이터베이스 테이블 생성
     db.create_all()
     
+    # 기존 테이블에 새로 선언된 컬럼/인덱스 생성
+    try:
+        from schema import ensure_columns, ensure_indexes
+        for column_name in ensure_columns():
+            print(f"✅ 컬럼 추가: {column_name}")
+        for index_name in ensure_indexes():
+            print(f"✅ 인덱스 생성: {index_name}")
+    except Exception as e:
+        print(f"⚠️ 스키마 보정 중 오류: {e}")
+    
+    # 직원 검색 색인 (SQLite FTS5 / PostgreSQL pg_trgm)
+    from employee_search import ensure_search_index
+    if ensure_search_index():
+        print("✅ 직원 검색 색인 생성")
+    
+    # 회사 정보 행에 base64로 저장된 직인 이미지를 이미지 저장소로 이동
+    try:
+        from asset_store import migrate_inline_images
+        moved = migrate_inline_images()
+        if moved:
+            print(f"✅ 직인 이미지 저장소 이동 완료: {moved}건")
+    except Exception as e:
+        db.session.rollback()
+        print(f"⚠️ 직인 이미지 이동 중 오류: {e}")
+    
     # 초기 데이터 설정 (관리자 계정 및 공휴일)
     try:
         from models import User, Role
@@ -138,17 +174,44 @@ with app.app_context():
             
     except Exception as e:
         print(f"⚠️ 초기 데이터 설정 중 오류: {e}")
+
+    # 부서 기준 정보 및 부서별 휴가 집계 초기화
+    try:
+        from models import DepartmentVacationStats, VacationRequest
+        from department_stats import seed_departments, rebuild_department_stats
+
+        seed_departments()
+        if DepartmentVacationStats.query.first() is None and VacationRequest.query.first() is not None:
+            rebuild_department_stats()
+            print("✅ 부서별 휴가 집계 생성 완료")
+    except Exception as e:
+        db.session.rollback()
+        print(f"⚠️ 부서 집계 초기화 중 오류: {e}")
+
+    # 정적 파일 해시 URL(asset_url) 및 사전 압축 파일 제공
+    import assets
+    assets.init_app(app)
+    
+    # 요청 ID/처리 시간 로그, 경로별 응답 시간 지표, 느린 요청 프로파일
+    import request_metrics
+    request_metrics.init_app(app)
+    
+    # 템플릿 조각 캐시 ({% cache %} 태그)
+    from fragment_cache import FragmentCacheExtension
+    app.jinja_env.add_extension(FragmentCacheExtension)
     
     # 라우트 등록
     from auth import auth_bp
     from admin import admin_bp
     from employee import employee_bp
     from routes import main_bp
+    from feeds import feeds_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(admin_bp, url_prefix='/admin')
     app.register_blueprint(employee_bp, url_prefix='/employee')
     app.register_blueprint(main_bp)
+    app.register_blueprint(feeds_bp)
     
     # User 로더 설정
     from models import User
@@ -0,0 +1,130 @@
+"""내용 주소 기반 이미지 저장소 (직인 등)
+
+이미지 바이트는 sha256 다이제스트를 키로 stored_assets 테이블에 한 번만 저장하고,
+회사 정보 행에는 다이제스트만 둔다. 같은 내용은 항상 같은 키이므로 디코딩/축소한 결과를
+프로세스 메모리에 만료 없이 캐시할 수 있고, 브라우저에도 영구 캐시로 내려줄 수 있다.
+
+(배포 환경의 디스크는 재시작 시 초기화될 수 있어 파일 대신 데이터베이스 BLOB 테이블을 사용한다)
+"""
+
+import base64
+import binascii
+import hashlib
+import io
+import re
+from functools import lru_cache
+
+from PIL import Image
+
+from app import db
+from models import StoredAsset, CompanyInfo
+from data_versions import COMPANY, bump_version
+
+# 허용 이미지 형식과 최대 크기
+ALLOWED_CONTENT_TYPES = {'image/png', 'image/jpeg', 'image/gif', 'image/webp'}
+MAX_ASSET_BYTES = 2 * 1024 * 1024
+
+# 화면에 쓰는 축소 이미지 크기 (픽셀, 비율 유지 축소) - /assets/<digest>/<variant>.png
+STAMP_SIZE = (300, 300)
+VARIANT_SIZES = {'stamp': STAMP_SIZE}
+
+_DATA_URL = re.compile(r'^data:(?P<content_type>[\w.+-]+/[\w.+-]+);base64,(?P<data>.*)$', re.S)
+
+
+def store_asset(data, content_type):
+    """바이트를 저장하고 다이제스트 반환 (이미 있으면 그대로 사용, 커밋은 호출하는 쪽에서 수행)"""
+    digest = hashlib.sha256(data).hexdigest()
+    exists = db.session.query(StoredAsset.digest).filter_by(digest=digest).first()
+    if not exists:
+        db.session.add(StoredAsset(digest=digest, content_type=content_type, size=len(data), data=data))
+    return digest
+
+
+def decode_data_url(value):
+    """'data:image/png;base64,...' 형식 문자열을 (content_type, bytes)로 변환
+
+    Raises:
+        ValueError: 형식/크기가 잘못되었거나 이미지가 아닌 경우
+    """
+    match = _DATA_URL.match(value.strip())
+    if not match:
+        raise ValueError('data:image/...;base64, 형식의 이미지가 아닙니다.')
+
+    content_type = match.group('content_type').lower()
+    if content_type not in ALLOWED_CONTENT_TYPES:
+        raise ValueError(f'지원하지 않는 이미지 형식입니다: {content_type}')
+
+    try:
+        data = base64.b64decode(re.sub(r'\s+', '', match.group('data')), validate=True)
+    except (binascii.Error, ValueError):
+        raise ValueError('base64 데이터가 올바르지 않습니다.')
+    if len(data) > MAX_ASSET_BYTES:
+        raise ValueError(f'이미지 크기는 {MAX_ASSET_BYTES // 1024 // 1024}MB 이하여야 합니다.')
+
+    try:
+        Image.open(io.BytesIO(data)).verify()
+    except Exception:
+        raise ValueError('이미지 파일을 읽을 수 없습니다.')
+    return content_type, data
+
+
+def store_data_url(value):
+    """data URL 이미지를 저장하고 다이제스트 반환"""
+    content_type, data = decode_data_url(value)
+    return store_asset(data, content_type)
+
+
+def load_asset(digest):
+    """(content_type, bytes) 또는 None"""
+    row = db.session.query(StoredAsset.content_type, StoredAsset.data).filter_by(digest=digest).first()
+    return (row.content_type, row.data) if row else None
+
+
+@lru_cache(maxsize=32)
+def _resized_png(digest, max_width, max_height):
+    asset = load_asset(digest)
+    if asset is None:
+        return None
+
+    image = Image.open(io.BytesIO(asset[1]))
+    image = image.convert('RGBA')
+    image.thumbnail((max_width, max_height), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def asset_png(digest, max_size=STAMP_SIZE):
+    """비율을 유지해 max_size 안으로 줄인 PNG 바이트 (디코딩 결과는 다이제스트별로 캐시)"""
+    if not digest:
+        return None
+    return _resized_png(digest, *max_size)
+
+
+def migrate_inline_images():
+    """company_info.stamp_image(base64)에 남아 있는 직인을 저장소로 옮기고 원래 컬럼을 비움
+
+    Returns:
+        int: 옮긴 행 수
+    """
+    moved = 0
+    rows = db.session.query(CompanyInfo.id, CompanyInfo.stamp_image).filter(
+        CompanyInfo.stamp_asset.is_(None),
+        CompanyInfo.stamp_image.isnot(None),
+        CompanyInfo.stamp_image != ''
+    ).all()
+    for company_id, stamp_image in rows:
+        try:
+            digest = store_data_url(stamp_image)
+        except ValueError as e:
+            print(f'⚠️ 회사 정보 {company_id}의 직인 이미지를 옮기지 못했습니다: {e}')
+            continue
+        db.session.query(CompanyInfo).filter_by(id=company_id).update(
+            {'stamp_asset': digest, 'stamp_image': None}, synchronize_session=False
+        )
+        moved += 1
+
+    if moved:
+        bump_version(COMPANY)
+        db.session.commit()
+    return moved
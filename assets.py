@@ -0,0 +1,96 @@
+"""정적 파일 URL(콘텐츠 해시) 및 사전 압축 파일 제공
+
+build_assets.py가 static/dist/에 만든 해시 파일명(main.3f9a1c2b7e.css)과 manifest.json을 사용한다.
+템플릿에서는 url_for('static', ...) 대신 asset_url(...)을 쓰면 배포 때마다 URL이 바뀌므로
+1년 캐시(immutable)를 유지하면서도 이전 파일이 남아 있는 문제가 생기지 않는다.
+
+    <link rel="stylesheet" href="{{ asset_url('css/performance.css') }}">
+
+빌드하지 않은 환경(개발 서버)에서는 원본 파일 URL에 내용 해시를 ?v= 로 붙인다.
+dist/ 파일은 브라우저의 Accept-Encoding에 따라 미리 압축해 둔 .br/.gz 파일을 그대로 보낸다.
+"""
+
+import hashlib
+import json
+import mimetypes
+import os
+
+from flask import current_app, request, send_from_directory, url_for
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = 'dist'  # static 하위 빌드 결과 디렉토리
+MANIFEST_PATH = os.path.join(STATIC_DIR, DIST_DIR, 'manifest.json')
+
+# 해시 파일명은 내용이 바뀌면 URL이 바뀌므로 영구 캐시
+IMMUTABLE_MAX_AGE = 31536000
+
+# 사전 압축 파일 (선호 순서)
+PRECOMPRESSED = [('br', '.br'), ('gzip', '.gz')]
+
+_manifest = {'mtime': None, 'files': {}}
+_file_hashes = {}
+
+
+def load_manifest():
+    """빌드 manifest {원본 경로: dist 하위 해시 경로} (파일이 바뀌면 다시 읽음)"""
+    try:
+        mtime = os.path.getmtime(MANIFEST_PATH)
+    except OSError:
+        _manifest.update(mtime=None, files={})
+        return _manifest['files']
+
+    if mtime != _manifest['mtime']:
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            _manifest.update(mtime=mtime, files=json.load(f))
+    return _manifest['files']
+
+
+def _content_hash(filename):
+    path = os.path.join(STATIC_DIR, filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    cached = _file_hashes.get(filename)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:10]
+    _file_hashes[filename] = (mtime, digest)
+    return digest
+
+
+def asset_url(filename):
+    """정적 파일의 캐시 무효화 URL (url_for('static', filename=...)와 같은 방식으로 사용)"""
+    hashed = load_manifest().get(filename)
+    if hashed:
+        return url_for('static', filename=f'{DIST_DIR}/{hashed}')
+    return url_for('static', filename=filename, v=_content_hash(filename))
+
+
+def send_static(filename):
+    """static 엔드포인트: dist/ 파일은 사전 압축본과 영구 캐시 헤더로 응답"""
+    if not filename.startswith(DIST_DIR + '/'):
+        return current_app.send_static_file(filename)
+
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    for encoding, suffix in PRECOMPRESSED:
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(STATIC_DIR, filename + suffix)):
+            response = send_from_directory(STATIC_DIR, filename + suffix, mimetype=mimetype,
+                                           max_age=IMMUTABLE_MAX_AGE)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(STATIC_DIR, filename, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def init_app(app):
+    """asset_url 템플릿 함수 등록 및 static 엔드포인트 교체"""
+    app.add_template_global(asset_url)
+    app.view_functions['static'] = send_static
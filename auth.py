@@ -2,8 +2,9 @@ from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, current_user, login_required
 from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
-from models import User, Role, VacationDays
+from models import User, Role
 from forms import LoginForm, RegisterForm, FindIdForm, FindPasswordForm, ResetPasswordForm
+from year_rollover import provision_year
 import secrets
 import string
 from datetime import datetime
@@ -70,17 +71,10 @@ def register():
         new_user.set_password(form.password.data)
         
         db.session.add(new_user)
-        db.session.commit()
+        db.session.flush()
         
         # 현재 연도의 휴가 일수 생성
-        current_year = datetime.now().year
-        vacation_days = VacationDays(
-            user_id=new_user.id,
-            year=current_year,
-            total_days=15,  # 기본 15일
-            used_days=0
-        )
-        db.session.add(vacation_days)
+        provision_year(datetime.now().year, User.id == new_user.id)
         db.session.commit()
         
         flash('회원가입이 완료되었습니다. 로그인해주세요.', 'success')
@@ -1,36 +1,215 @@
 #!/usr/bin/env python3
-"""데이터베이스 백업 및 복구 스크립트"""
+"""데이터베이스 백업 및 복구 스크립트
 
+앱이 실행 중이어도 일관된 백업을 만들 수 있도록 파일 복사 대신 SQLite 온라인 백업 API를 사용한다.
+페이지 단위로 나눠 복사하면서 단계마다 잠깐 쉬어 요청 처리를 막지 않고,
+결과는 gzip으로 압축해 sha256 체크섬 파일(sha256sum 형식)과 함께 저장한다.
+
+    python backup_database.py                      # 기존 점검 + 백업 + 최적화
+    python backup_database.py --backup             # 백업만 수행 (보관 정책 적용)
+    python backup_database.py --schedule --interval 360 --keep 14 --max-age-days 30
+    python backup_database.py --verify instance/backup_vacation_20260101_030000.db.gz
+    python backup_database.py --restore instance/backup_vacation_20260101_030000.db.gz
+"""
+
+import argparse
+import glob
+import gzip
+import hashlib
 import os
 import shutil
 import sqlite3
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 import sys
 
 # Flask 앱 컨텍스트 설정
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from app import app, db
 
-def backup_database():
-    """현재 데이터베이스를 백업합니다."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    # 현재 데이터베이스 파일 경로
-    db_path = "instance/vacation_permanent.db"
-    backup_path = f"instance/backup_vacation_{timestamp}.db"
-    
-    if os.path.exists(db_path):
+DB_PATH = "instance/vacation_permanent.db"
+BACKUP_DIR = os.environ.get("BACKUP_DIR", "instance")
+BACKUP_PREFIX = "backup_vacation_"
+
+# 온라인 백업 단계당 복사할 페이지 수와 단계 사이 대기 시간(초)
+BACKUP_PAGES = int(os.environ.get("BACKUP_PAGES", "256"))
+BACKUP_STEP_SLEEP = float(os.environ.get("BACKUP_STEP_SLEEP", "0.005"))
+# 단계 복사가 이 횟수보다 많이 재시작되면 한 번에 복사
+BACKUP_MAX_RESTARTS = 3
+
+# 보관 정책: 최근 N개는 항상 보관하고, 그 외에는 보관 기간이 지난 백업을 삭제
+BACKUP_KEEP = int(os.environ.get("BACKUP_KEEP", "14"))
+BACKUP_MAX_AGE_DAYS = int(os.environ.get("BACKUP_MAX_AGE_DAYS", "30"))
+
+CHECKSUM_SUFFIX = ".sha256"
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _BackupRestarted(Exception):
+    """단계 복사 중 다른 연결의 쓰기로 백업이 계속 처음부터 다시 시작됨"""
+
+
+def _online_copy(source_path, target_path, pages=BACKUP_PAGES, step_sleep=BACKUP_STEP_SLEEP):
+    """SQLite 백업 API로 실행 중인 DB를 일관된 스냅샷으로 복사 (WAL 내용 포함)
+
+    단계 복사 도중 다른 연결이 쓰면 SQLite가 백업을 처음부터 다시 시작하므로,
+    BACKUP_MAX_RESTARTS번 넘게 재시작되면 한 번에 복사하는 방식으로 전환한다.
+    (WAL 모드에서는 한 번에 복사해도 읽기 트랜잭션만 잡으므로 쓰기를 막지 않는다)
+    """
+    state = {'remaining': None, 'restarts': 0}
+
+    def throttle(status, remaining, total):
+        if state['remaining'] is not None and remaining > state['remaining']:
+            state['restarts'] += 1
+            if state['restarts'] > BACKUP_MAX_RESTARTS:
+                raise _BackupRestarted()
+        state['remaining'] = remaining
+        if remaining and step_sleep:
+            time.sleep(step_sleep)
+
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    try:
         try:
-            shutil.copy2(db_path, backup_path)
-            print(f"✓ 데이터베이스 백업 완료: {backup_path}")
-            return backup_path
-        except Exception as e:
-            print(f"❌ 백업 실패: {e}")
-            return None
-    else:
+            source.backup(target, pages=pages, progress=throttle)
+        except _BackupRestarted:
+            source.backup(target)
+        result = target.execute("PRAGMA quick_check;").fetchone()[0]
+        if result != "ok":
+            raise sqlite3.DatabaseError(f"백업본 검사 실패: {result}")
+    finally:
+        target.close()
+        source.close()
+
+
+def backup_database(db_path=DB_PATH, backup_dir=BACKUP_DIR, pages=BACKUP_PAGES, step_sleep=BACKUP_STEP_SLEEP):
+    """현재 데이터베이스를 온라인 백업해서 gzip 압축 + sha256 체크섬 파일로 저장합니다."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_path = os.path.join(backup_dir, f"{BACKUP_PREFIX}{timestamp}.db.gz")
+    snapshot_path = os.path.join(backup_dir, f".{BACKUP_PREFIX}{timestamp}.db.tmp")
+
+    if not os.path.exists(db_path):
         print(f"❌ 데이터베이스 파일이 없습니다: {db_path}")
         return None
 
+    try:
+        os.makedirs(backup_dir, exist_ok=True)
+        started = time.perf_counter()
+        _online_copy(db_path, snapshot_path, pages, step_sleep)
+
+        with open(snapshot_path, "rb") as src, gzip.open(backup_path, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+
+        checksum = _file_sha256(backup_path)
+        with open(backup_path + CHECKSUM_SUFFIX, "w", encoding="utf-8") as f:
+            f.write(f"{checksum}  {os.path.basename(backup_path)}\n")
+
+        elapsed = time.perf_counter() - started
+        print(f"✓ 데이터베이스 백업 완료: {backup_path} "
+              f"({os.path.getsize(backup_path):,} bytes, {elapsed:.1f}초, sha256 {checksum[:12]})")
+        return backup_path
+    except Exception as e:
+        for path in (backup_path, backup_path + CHECKSUM_SUFFIX):
+            if os.path.exists(path):
+                os.remove(path)
+        print(f"❌ 백업 실패: {e}")
+        return None
+    finally:
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+
+
+def verify_backup(backup_path):
+    """체크섬 파일과 비교해서 백업 파일이 손상되지 않았는지 확인합니다."""
+    checksum_path = backup_path + CHECKSUM_SUFFIX
+    if not os.path.exists(checksum_path):
+        print(f"❌ 체크섬 파일이 없습니다: {checksum_path}")
+        return False
+
+    with open(checksum_path, encoding="utf-8") as f:
+        expected = f.read().split()[0]
+
+    if _file_sha256(backup_path) != expected:
+        print(f"❌ 체크섬 불일치: {backup_path}")
+        return False
+
+    print(f"✓ 체크섬 확인: {backup_path}")
+    return True
+
+
+def restore_database(backup_path, db_path=DB_PATH):
+    """검증된 백업을 현재 데이터베이스에 복원합니다 (복원 전 현재 DB도 백업)."""
+    if not verify_backup(backup_path):
+        return False
+
+    restore_path = db_path + ".restore.tmp"
+    try:
+        with gzip.open(backup_path, "rb") as src, open(restore_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+
+        if os.path.exists(db_path) and not backup_database(db_path, os.path.dirname(db_path) or "."):
+            print("❌ 현재 데이터베이스 백업에 실패해서 복원을 중단합니다")
+            return False
+
+        # 파일을 덮어쓰지 않고 백업 API로 복사해야 열린 연결/WAL 파일과 충돌하지 않는다
+        _online_copy(restore_path, db_path)
+        print(f"✓ 데이터베이스 복원 완료: {backup_path} -> {db_path}")
+        return True
+    except Exception as e:
+        print(f"❌ 복원 실패: {e}")
+        return False
+    finally:
+        if os.path.exists(restore_path):
+            os.remove(restore_path)
+
+
+def list_backups(backup_dir=BACKUP_DIR):
+    """백업 파일 목록 (최신순, 체크섬 파일 제외)"""
+    paths = [
+        path for path in glob.glob(os.path.join(backup_dir, f"{BACKUP_PREFIX}*.db*"))
+        if not path.endswith(CHECKSUM_SUFFIX)
+    ]
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+def prune_backups(backup_dir=BACKUP_DIR, keep=BACKUP_KEEP, max_age_days=BACKUP_MAX_AGE_DAYS):
+    """보관 정책에 따라 오래된 백업 삭제 (최근 keep개는 기간과 관계없이 보관)"""
+    cutoff = time.time() - timedelta(days=max_age_days).total_seconds()
+    removed = []
+    for path in list_backups(backup_dir)[keep:]:
+        if os.path.getmtime(path) >= cutoff:
+            continue
+        for target in (path, path + CHECKSUM_SUFFIX):
+            if os.path.exists(target):
+                os.remove(target)
+        removed.append(path)
+
+    if removed:
+        print(f"🧹 오래된 백업 {len(removed)}개 삭제")
+    return removed
+
+
+def run_scheduler(interval_minutes, db_path=DB_PATH, backup_dir=BACKUP_DIR,
+                  keep=BACKUP_KEEP, max_age_days=BACKUP_MAX_AGE_DAYS):
+    """interval_minutes 간격으로 백업 + 보관 정책 적용 (Ctrl+C로 종료)"""
+    print(f"⏰ 백업 스케줄러 시작: {interval_minutes}분 간격, 최근 {keep}개 + {max_age_days}일 보관")
+    try:
+        while True:
+            started = time.monotonic()
+            if backup_database(db_path, backup_dir):
+                prune_backups(backup_dir, keep, max_age_days)
+            time.sleep(max(0, interval_minutes * 60 - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        print("⏹️  백업 스케줄러 종료")
+
+
 def verify_database_integrity():
     """데이터베이스 무결성을 검사합니다."""
     db_path = "instance/vacation_permanent.db"
@@ -137,5 +316,36 @@ def setup_persistent_storage():
     
     return True
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='데이터베이스 백업 및 복구')
+    parser.add_argument('--db', default=DB_PATH, help=f'SQLite 데이터베이스 경로 (기본값: {DB_PATH})')
+    parser.add_argument('--backup-dir', default=BACKUP_DIR, help=f'백업 저장 디렉토리 (기본값: {BACKUP_DIR})')
+    parser.add_argument('--backup', action='store_true', help='백업만 수행하고 보관 정책 적용')
+    parser.add_argument('--schedule', action='store_true', help='주기적으로 백업 (스케줄러 실행)')
+    parser.add_argument('--interval', type=int, default=360, help='스케줄러 백업 간격(분) (기본값: 360)')
+    parser.add_argument('--keep', type=int, default=BACKUP_KEEP, help=f'항상 보관할 최근 백업 수 (기본값: {BACKUP_KEEP})')
+    parser.add_argument('--max-age-days', type=int, default=BACKUP_MAX_AGE_DAYS,
+                        help=f'백업 보관 기간(일) (기본값: {BACKUP_MAX_AGE_DAYS})')
+    parser.add_argument('--verify', metavar='BACKUP', help='백업 파일 체크섬 확인')
+    parser.add_argument('--restore', metavar='BACKUP', help='백업 파일로 데이터베이스 복원')
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        return 0 if verify_backup(args.verify) else 1
+    if args.restore:
+        return 0 if restore_database(args.restore, args.db) else 1
+    if args.schedule:
+        run_scheduler(args.interval, args.db, args.backup_dir, args.keep, args.max_age_days)
+        return 0
+    if args.backup:
+        if not backup_database(args.db, args.backup_dir):
+            return 1
+        prune_backups(args.backup_dir, args.keep, args.max_age_days)
+        return 0
+
+    setup_persistent_storage()
+    return 0
+
+
 if __name__ == '__main__':
-    setup_persistent_storage()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""부하 테스트/벤치마크 데이터를 써도 되는 DB인지 판단
+
+generate_synthetic_data.py, benchmark_utils.py는 bench_ 계정을 대량으로 만들고 지우므로
+임시 디렉터리의 SQLite 파일(스크래치 DB)에만 기본으로 실행하고, 그 밖의 DB는 --force로 명시해야 한다.
+운영 DB(기본 SQLite 파일, 배포 환경의 DATABASE_URL)는 --force로도 허용하지 않는다.
+
+앱을 불러오기 전에 DB를 정해야 하는 스크립트에서도 쓸 수 있도록 app을 불러오지 않는다.
+"""
+
+import os
+import tempfile
+
+from sqlalchemy.engine import make_url
+
+# 기본 운영 SQLite 파일 (app.py)
+DEFAULT_DATABASE_PATH = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'vacation_permanent.db'))
+
+# 배포 환경에서 설정되는 환경변수 (Render/Railway)
+DEPLOY_ENV_MARKERS = ('RENDER', 'RAILWAY_ENVIRONMENT')
+
+
+def _sqlite_path(url):
+    parsed = make_url(url)
+    if parsed.get_backend_name() != 'sqlite':
+        return None
+    if not parsed.database or parsed.database == ':memory:':
+        return ':memory:'
+    return os.path.realpath(parsed.database)
+
+
+def is_production_environment():
+    app_env = os.environ.get('APP_ENV') or os.environ.get('FLASK_ENV')
+    return app_env == 'production' or any(os.environ.get(name) for name in DEPLOY_ENV_MARKERS)
+
+
+def is_production_database(url):
+    """기본 운영 SQLite 파일이거나, 배포 환경에서 설정된 DATABASE_URL인지"""
+    if _sqlite_path(url) == os.path.realpath(DEFAULT_DATABASE_PATH):
+        return True
+    deployed = os.environ.get('DATABASE_URL')
+    if deployed and is_production_environment():
+        return make_url(url) == make_url(deployed.replace('postgres://', 'postgresql://', 1))
+    return False
+
+
+def is_scratch_database(url):
+    """임시 디렉터리의 SQLite 파일(또는 메모리 DB)인지"""
+    path = _sqlite_path(url)
+    if path is None:
+        return False
+    return path == ':memory:' or path.startswith(os.path.realpath(tempfile.gettempdir()) + os.sep)
+
+
+def check_bench_database(url, force=False):
+    """부하 테스트 데이터를 써도 되는지 확인
+
+    Returns:
+        str | None: 거부 사유 (허용되면 None)
+    """
+    if is_production_database(url):
+        return '운영 DB에는 부하 테스트 데이터를 만들지 않습니다.'
+    if not is_scratch_database(url) and not force:
+        return (f'임시 디렉터리({tempfile.gettempdir()})의 SQLite 파일이 아닌 DB입니다. '
+                '이 DB에 bench_ 데이터를 만들고 지우려면 --force를 지정하세요.')
+    return None
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""핵심 유틸 함수 마이크로 벤치마크
+
+휴가 일수 계산/중복 검사/잔여 연차 계산/재직증명서 생성/엑셀 다운로드를
+데이터 규모별로 반복 실행해서 호출당 소요 시간과 쿼리 수를 JSON으로 저장한다.
+데이터는 generate_synthetic_data.generate()로 임시 SQLite 파일에 만들고 끝나면 삭제한다.
+DATABASE_URL은 무시하며, 다른 DB(예: PostgreSQL)에서 측정하려면 --database-url과 --force를 함께 지정한다
+(운영 DB는 허용하지 않음, 해당 DB의 bench_ 데이터를 지우고 다시 만든다).
+
+    python benchmark_utils.py --sizes 100,800 --output benchmark.json
+    python benchmark_utils.py --database-url postgresql://localhost/bench --force --output benchmark_pg.json
+
+변경 전 결과를 기준으로 저장해 두고 비교한다 (중앙값이 20% 이상 느려지거나 쿼리 수가 늘면 종료 코드 1):
+    python benchmark_utils.py --compare baseline.json benchmark.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+# Flask 앱 컨텍스트 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from bench_database import check_bench_database
+
+
+def _database_options(argv=None):
+    # 앱을 불러오기 전에 DB를 정해야 하므로 DB 옵션만 먼저 읽는다 (전체 옵션은 main()에서 처리)
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--database-url')
+    parser.add_argument('--force', action='store_true')
+    return parser.parse_known_args(argv)[0]
+
+
+# 기본은 항상 임시 DB (환경변수 DATABASE_URL이 운영 DB를 가리키고 있어도 사용하지 않는다)
+_options = _database_options()
+_temp_dir = None
+if _options.database_url:
+    _refusal = check_bench_database(_options.database_url, force=_options.force)
+    if _refusal or not _options.force:
+        print(f"❌ {_refusal or '--database-url로 지정한 DB의 bench_ 데이터를 지우고 다시 만들려면 --force를 함께 지정하세요.'}")
+        sys.exit(1)
+    os.environ['DATABASE_URL'] = _options.database_url
+else:
+    _temp_dir = tempfile.mkdtemp(prefix='benchmark_utils_')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_temp_dir, 'benchmark.db')}"
+
+from app import app, db
+from models import User, EmploymentCertificate, CertificateStatus
+from forms import VacationSearchForm
+from utils import get_vacation_days_count, check_overlapping_vacation, calculate_remaining_vacation_days
+from employee import create_docx_certificate
+from company_settings import get_company_settings
+from admin import export_vacation_data
+from generate_synthetic_data import BENCH_PREFIX, generate
+from loadtest import compare_results, print_regressions
+
+# 비교 시 허용하는 중앙값 증가율
+DEFAULT_THRESHOLD = 0.2
+
+# get_vacation_days_count 기간 길이(일)
+SPANS = [1, 7, 31, 365]
+
+
+class QueryCounter:
+    """같은 스레드에서 실행된 쿼리 수 측정"""
+
+    def __init__(self):
+        from sqlalchemy import event
+
+        self._local = threading.local()
+        event.listen(db.engine, 'before_cursor_execute', self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.queries = getattr(self._local, 'queries', 0) + 1
+
+    def reset(self):
+        self._local.queries = 0
+
+    @property
+    def queries(self):
+        return getattr(self._local, 'queries', 0)
+
+
+def measure(func, args_list, counter):
+    """인자 목록을 한 번씩 호출해서 호출당 시간/쿼리 수 통계 반환 (첫 호출은 워밍업으로 제외)"""
+    func(*args_list[0])
+
+    timings = []
+    queries = []
+    for args in args_list:
+        counter.reset()
+        started = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.queries)
+
+    return {
+        'count': len(timings),
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'queries_per_call': round(sum(queries) / len(queries), 2)
+    }
+
+
+def _export(form):
+    """엑셀 다운로드는 요청 컨텍스트(flash/make_response)가 필요하다"""
+    with app.test_request_context('/admin/vacations/export'):
+        response = export_vacation_data(form)
+        if response.status_code != 200:
+            raise RuntimeError(f'엑셀 다운로드 실패: {response.status_code}')
+        return response.get_data()
+
+
+def _search_form(year=0):
+    with app.test_request_context('/admin/vacations'):
+        form = VacationSearchForm(formdata=None, meta={'csrf': False})
+    form.employee_name.data = ''
+    form.year.data = year
+    form.month.data = 0
+    form.status.data = 'all'
+    form.department.data = 'all'
+    form.start_date.data = None
+    form.end_date.data = None
+    return form
+
+
+def _random_business_day(rng, year):
+    day = date(year, 1, 1) + timedelta(days=rng.randint(0, 364))
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+def benchmark_cases(rng, repeat):
+    """(이름, 함수, 인자 목록) 목록 (현재 DB의 bench_ 데이터 기준)"""
+    year = datetime.now().year
+    user_ids = [
+        user_id for (user_id,) in
+        db.session.query(User.id).filter(User.username.like(f'{BENCH_PREFIX}%')).all()
+    ]
+    # 느린 함수(문서/엑셀 생성)는 반복 횟수를 줄인다
+    slow_repeat = max(2, repeat // 4)
+
+    cases = []
+    for span in SPANS:
+        args_list = []
+        for _ in range(repeat):
+            start_date = _random_business_day(rng, year)
+            args_list.append((start_date, start_date + timedelta(days=span - 1), '연차'))
+        cases.append((f'get_vacation_days_count[{span}d]', get_vacation_days_count, args_list))
+
+    args_list = []
+    for _ in range(repeat):
+        start_date = _random_business_day(rng, year)
+        args_list.append((rng.choice(user_ids), start_date, start_date + timedelta(days=2)))
+    cases.append(('check_overlapping_vacation', check_overlapping_vacation, args_list))
+
+    cases.append((
+        'calculate_remaining_vacation_days', calculate_remaining_vacation_days,
+        [(rng.choice(user_ids), year) for _ in range(repeat)]
+    ))
+
+    certificates = EmploymentCertificate.query.filter(
+        EmploymentCertificate.status == CertificateStatus.ISSUED
+    ).order_by(EmploymentCertificate.id).limit(500).all()
+    company_info = get_company_settings()
+    if certificates:
+        cases.append((
+            'create_docx_certificate', create_docx_certificate,
+            [(certificate, certificate.user, company_info)
+             for certificate in rng.sample(certificates, min(slow_repeat, len(certificates)))]
+        ))
+
+    cases.append(('export_vacation_data[year]', _export, [(_search_form(year),)] * slow_repeat))
+    cases.append(('export_vacation_data[all]', _export, [(_search_form(),)] * slow_repeat))
+    return cases
+
+
+def run(args):
+    counter = QueryCounter()
+    results = {}
+    datasets = {}
+
+    for size in args.sizes:
+        started = time.perf_counter()
+        datasets[size] = generate(size, args.years, seed=args.seed, reset=True)
+        print(f'📦 직원 {size}명 데이터 생성 ({time.perf_counter() - started:.1f}초)')
+
+        rng = random.Random(args.seed)
+        for name, func, args_list in benchmark_cases(rng, args.repeat):
+            if args.only and not any(pattern in name for pattern in args.only):
+                continue
+            label = f'{name} users={size}'
+            results[label] = measure(func, args_list, counter)
+            db.session.rollback()
+
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': db.engine.url.get_backend_name(),
+            'sizes': args.sizes,
+            'years': args.years,
+            'repeat': args.repeat,
+            'seed': args.seed,
+            'datasets': datasets
+        },
+        'benchmarks': results
+    }
+
+
+def print_summary(result):
+    print(f"{'함수':<50} {'건수':>5} {'최소':>10} {'중앙값':>10} {'최대':>10} {'쿼리':>7}")
+    for label, stats in result['benchmarks'].items():
+        print(f"{label:<50} {stats['count']:>5} {stats['min_ms']:>8.2f}ms {stats['median_ms']:>8.2f}ms "
+              f"{stats['max_ms']:>8.2f}ms {stats['queries_per_call']:>7}")
+
+
+def _remove_temp_database():
+    if not _temp_dir:
+        return
+    with app.app_context():
+        db.engine.dispose()
+    for name in os.listdir(_temp_dir):
+        os.remove(os.path.join(_temp_dir, name))
+    os.rmdir(_temp_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='핵심 유틸 함수 마이크로 벤치마크')
+    parser.add_argument('--sizes', default='100,800',
+                        help='데이터 규모(직원 수) 목록, 쉼표로 구분 (기본값: 100,800)')
+    parser.add_argument('--years', type=int, default=3, help='휴가 이력 연수 (기본값: 3)')
+    parser.add_argument('--repeat', type=int, default=20, help='함수별 반복 횟수 (기본값: 20)')
+    parser.add_argument('--only', action='append', help='이름에 해당 문자열이 포함된 함수만 실행 (여러 번 지정 가능)')
+    parser.add_argument('--seed', type=int, default=42, help='난수 seed (기본값: 42)')
+    parser.add_argument('--database-url', help='임시 SQLite 대신 측정할 DB (--force 필요, 운영 DB 불가)')
+    parser.add_argument('--force', action='store_true', help='--database-url DB의 bench_ 데이터를 지우고 다시 생성')
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help='두 결과 JSON 비교')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='비교 시 허용하는 중앙값 증가율 (기본값: 0.2)')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.compare[1], encoding='utf-8') as f:
+            current = json.load(f)
+        regressions = compare_results(baseline, current, args.threshold, metric='median_ms',
+                                      section='benchmarks', queries_key='queries_per_call')
+        print_regressions(regressions, args.threshold)
+        return 1 if regressions else 0
+
+    # PostgreSQL 연결에 실패하면 app.py가 기본 SQLite 파일로 바꾸므로 실제 사용 DB를 다시 확인
+    refusal = check_bench_database(app.config['SQLALCHEMY_DATABASE_URI'], force=True)
+    if refusal:
+        print(f'❌ {refusal}')
+        return 1
+
+    args.sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    with app.app_context():
+        result = run(args)
+
+    print_summary(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f'📄 결과 저장: {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    try:
+        exit_code = main()
+    finally:
+        _remove_temp_database()
+    sys.exit(exit_code)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""gunicorn 워커 방식별 동시 대시보드 사용자 수 측정
+
+워커 방식(gunicorn.conf.py의 GUNICORN_PROFILE)마다 로컬 gunicorn 서버를 띄우고,
+직원 대시보드 시나리오(loadtest.py와 동일)의 동시 사용자 수를 단계적으로 늘려
+대시보드 p95가 기준 이하이고 오류가 없는 최대 동시 사용자 수를 찾는다.
+데이터는 generate_synthetic_data.py로 먼저 만들어 둔다.
+
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmark_workers.py \\
+        --profiles sync gthread gevent --steps 4 8 16 32 64 --output workers.json
+
+gevent가 설치되어 있지 않으면 gevent 방식은 건너뛴다.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from loadtest import BENCH_PREFIX, BENCH_PASSWORD, HttpSession, Recorder, scenario_employee_dashboard, scenario_login
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DASHBOARD_LABEL = 'GET /employee/dashboard'
+
+# 기본 응답 시간 기준 (대시보드 p95)
+DEFAULT_SLO_MS = 500
+
+
+def start_server(profile, port, args, log_file):
+    """gunicorn 실행 후 응답할 때까지 대기"""
+    env = dict(
+        os.environ,
+        GUNICORN_PROFILE=profile,
+        PORT=str(port),
+        WEB_CONCURRENCY=str(args.workers),
+        # 측정 중 느린 요청 프로파일이 결과에 섞이지 않도록 끈다
+        PROFILE_SAMPLE_RATE='0',
+        METRICS_DIR=os.path.join(tempfile.gettempdir(), f'bench_metrics_{profile}'),
+    )
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'main:app'],
+        cwd=BASE_DIR, env=env, stdout=log_file, stderr=subprocess.STDOUT
+    )
+
+    deadline = time.monotonic() + args.startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn이 종료되었습니다 (종료 코드 {process.returncode}, 로그: {log_file.name})')
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/login', timeout=2):
+                return process
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.5)
+
+    stop_server(process)
+    raise RuntimeError(f'{args.startup_timeout}초 안에 서버가 응답하지 않았습니다 (로그: {log_file.name})')
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def measure(base_url, users, args):
+    """동시 사용자 users명이 duration초 동안 대시보드를 반복 조회한 결과"""
+    recorder = Recorder()
+    ready = threading.Barrier(users + 1)
+    stop = threading.Event()
+
+    def run_user(index):
+        session = HttpSession(base_url, recorder)
+        try:
+            scenario_login(session, f'{BENCH_PREFIX}{index % args.users + 1:05d}', BENCH_PASSWORD)
+        finally:
+            ready.wait()
+        while not stop.is_set():
+            scenario_employee_dashboard(session, None)
+
+    threads = [threading.Thread(target=run_user, args=(index,), daemon=True) for index in range(users)]
+    for thread in threads:
+        thread.start()
+
+    # 모든 사용자가 로그인한 뒤부터 측정
+    ready.wait()
+    recorder.reset()
+    started = time.perf_counter()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=60)
+    elapsed = time.perf_counter() - started
+
+    routes = recorder.summary()
+    stats = routes.get(DASHBOARD_LABEL)
+    if not stats:
+        return {'users': users, 'requests': 0, 'errors': 0, 'p95_ms': None, 'rps': 0.0, 'sustained': False}
+    errors = sum(route['errors'] for route in routes.values())
+    return {
+        'users': users,
+        'requests': stats['count'],
+        'errors': errors,
+        'p50_ms': stats['p50_ms'],
+        'p95_ms': stats['p95_ms'],
+        'rps': round(stats['count'] / elapsed, 1),
+        'sustained': errors == 0 and stats['p95_ms'] <= args.slo_ms
+    }
+
+
+def benchmark_profile(profile, port, args):
+    with tempfile.NamedTemporaryFile('w', prefix=f'gunicorn_{profile}_', suffix='.log', delete=False) as log_file:
+        process = start_server(profile, port, args, log_file)
+        try:
+            base_url = f'http://127.0.0.1:{port}'
+            steps = []
+            for users in args.steps:
+                result = measure(base_url, users, args)
+                steps.append(result)
+                print(f"  {profile:<8} {users:>4}명  {result['rps']:>7.1f} req/s  "
+                      f"p95 {result['p95_ms'] if result['p95_ms'] is not None else '-':>8}ms  "
+                      f"오류 {result['errors']:>3}  {'✅' if result['sustained'] else '❌'}")
+                if not result['sustained'] and not args.keep_going:
+                    break
+        finally:
+            stop_server(process)
+
+    sustained = [step['users'] for step in steps if step['sustained']]
+    return {'max_users': max(sustained) if sustained else 0, 'steps': steps, 'log': log_file.name}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='gunicorn 워커 방식별 동시 대시보드 사용자 수 측정')
+    parser.add_argument('--profiles', nargs='+', default=['sync', 'gthread', 'gevent'],
+                        choices=['sync', 'gthread', 'gevent'], help='측정할 워커 방식')
+    parser.add_argument('--steps', nargs='+', type=int, default=[4, 8, 16, 32, 64],
+                        help='동시 사용자 수 단계 (기본값: 4 8 16 32 64)')
+    parser.add_argument('--duration', type=int, default=20, help='단계별 측정 시간(초) (기본값: 20)')
+    parser.add_argument('--slo-ms', type=float, default=DEFAULT_SLO_MS,
+                        help=f'대시보드 p95 기준 (기본값: {DEFAULT_SLO_MS}ms)')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn 워커 수 (기본값: 2)')
+    parser.add_argument('--port', type=int, default=8765, help='서버 포트 (기본값: 8765)')
+    parser.add_argument('--users', type=int, default=800, help='로그인에 사용할 bench_ 계정 수 (기본값: 800)')
+    parser.add_argument('--startup-timeout', type=int, default=120, help='서버 시작 대기 시간(초)')
+    parser.add_argument('--keep-going', action='store_true', help='기준을 넘은 뒤에도 남은 단계 측정')
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    args = parser.parse_args(argv)
+
+    if importlib.util.find_spec('gunicorn') is None:
+        print('❌ gunicorn이 설치되어 있지 않습니다.')
+        return 1
+
+    results = {}
+    for profile in args.profiles:
+        if profile == 'gevent' and importlib.util.find_spec('gevent') is None:
+            print('⚠️ gevent가 설치되어 있지 않아 gevent 방식은 건너뜁니다. (pip install gevent psycogreen)')
+            continue
+        print(f'📦 {profile} 측정 중...')
+        try:
+            results[profile] = benchmark_profile(profile, args.port, args)
+        except RuntimeError as e:
+            print(f'❌ {profile}: {e}')
+
+    print(f"\n{'워커 방식':<10} {'최대 동시 사용자':>16}  (대시보드 p95 ≤ {args.slo_ms:.0f}ms, 오류 없음)")
+    for profile, result in results.items():
+        print(f"{profile:<10} {result['max_users']:>16}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'meta': {
+                    'database': os.environ.get('DATABASE_URL'),
+                    'workers': args.workers,
+                    'steps': args.steps,
+                    'duration_s': args.duration,
+                    'slo_ms': args.slo_ms,
+                    'started_at': datetime.now().isoformat(timespec='seconds'),
+                    'python': platform.python_version()
+                },
+                'profiles': results
+            }, f, ensure_ascii=False, indent=2)
+        print(f'📄 결과 저장: {args.output}')
+    return 0 if results else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
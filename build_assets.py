@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+정적 파일 빌드 (배포 빌드 단계에서 1회 실행)
+
+static/의 CSS/JS/이미지를 static/dist/에 내용 해시 파일명으로 복사하고
+manifest.json을 만든다. 템플릿의 asset_url()이 이 manifest로 URL을 만든다 (assets.py 참고).
+
+- CSS/JS: 주석/공백 제거 (rcssmin/rjsmin이 설치되어 있으면 사용)
+- 텍스트 파일: gzip(.gz), brotli(.br, brotli 패키지 필요) 사전 압축본 생성
+- 이미지: Pillow로 무손실 최적화 (원본보다 작을 때만)
+
+static/fonts/의 폰트는 화면에서 쓰지 않으므로(화면은 시스템/웹 폰트 사용) 빌드하지 않는다.
+
+사용법:
+    python build_assets.py
+"""
+
+import argparse
+import glob
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from assets import STATIC_DIR, DIST_DIR
+
+# 빌드 대상 (static 기준 glob 패턴)
+SOURCE_PATTERNS = ['css/*.css', 'js/*.js', 'images/*']
+
+# 사전 압축할 확장자 (이미지는 이미 압축된 형식)
+COMPRESSIBLE = {'.css', '.js', '.svg', '.json', '.txt'}
+
+HASH_LENGTH = 10
+
+
+def minify_css(text):
+    """CSS 주석과 불필요한 공백 제거"""
+    try:
+        import rcssmin
+        return rcssmin.cssmin(text)
+    except ImportError:
+        pass
+
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+    text = re.sub(r':\s+', ':', text)
+    return text.replace(';}', '}').strip() + '\n'
+
+
+def minify_js(text):
+    """JS 주석과 줄 앞뒤 공백 제거 (문자열/정규식 리터럴은 그대로 유지, 줄바꿈은 남김)"""
+    try:
+        import rjsmin
+        return rjsmin.jsmin(text)
+    except ImportError:
+        pass
+
+    out = []
+    i, length = 0, len(text)
+    last = ''  # 마지막으로 출력한 공백 아닌 문자 (정규식 리터럴 판별용)
+    while i < length:
+        ch = text[i]
+        nxt = text[i + 1] if i + 1 < length else ''
+
+        if ch in '\'"`':
+            start = i
+            i += 1
+            while i < length and text[i] != ch:
+                i += 2 if text[i] == '\\' else 1
+            i += 1
+            out.append(text[start:i])
+            last = ch
+        elif ch == '/' and nxt == '/':
+            while i < length and text[i] != '\n':
+                i += 1
+        elif ch == '/' and nxt == '*':
+            end = text.find('*/', i + 2)
+            i = length if end < 0 else end + 2
+            out.append(' ')
+        elif ch == '/' and (not last or last in '(,=:[!&|?{};+-*%<>~^\n'):
+            start = i
+            i += 1
+            in_class = False
+            while i < length and (in_class or text[i] != '/') and text[i] != '\n':
+                if text[i] == '\\':
+                    i += 1
+                elif text[i] == '[':
+                    in_class = True
+                elif text[i] == ']':
+                    in_class = False
+                i += 1
+            i += 1
+            out.append(text[start:i])
+            last = '/'
+        else:
+            out.append(ch)
+            if not ch.isspace():
+                last = ch
+            i += 1
+
+    lines = (line.strip() for line in ''.join(out).splitlines())
+    return '\n'.join(line for line in lines if line) + '\n'
+
+
+def optimize_image(data, ext):
+    """Pillow 무손실 재압축 (작아지지 않으면 원본 유지)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return data
+
+    image = Image.open(io.BytesIO(data))
+    buffer = io.BytesIO()
+    if ext in ('.jpg', '.jpeg'):
+        image.save(buffer, 'JPEG', quality='keep', optimize=True, progressive=True)
+    elif ext == '.png':
+        image.save(buffer, 'PNG', optimize=True)
+    else:
+        return data
+    optimized = buffer.getvalue()
+    return optimized if len(optimized) < len(data) else data
+
+
+def _brotli_compress(data):
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(data, quality=11)
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def emit(output_dir, logical, data, source_size, manifest, report):
+    """해시 파일명으로 저장하고 압축본 생성"""
+    directory, name = os.path.split(logical)
+    stem, ext = os.path.splitext(name)
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    hashed = f'{directory}/{stem}.{digest}{ext}' if directory else f'{stem}.{digest}{ext}'
+
+    target = os.path.join(output_dir, hashed)
+    _write(target, data)
+    sizes = {'source': source_size, 'raw': len(data), 'gzip': None, 'br': None}
+
+    if ext in COMPRESSIBLE:
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(gz) < len(data):
+            _write(target + '.gz', gz)
+            sizes['gzip'] = len(gz)
+        br = _brotli_compress(data)
+        if br is not None and len(br) < len(data):
+            _write(target + '.br', br)
+            sizes['br'] = len(br)
+
+    manifest[logical] = hashed
+    report.append((logical, hashed, sizes))
+
+
+def build(output_dir=None):
+    """static/dist/ 재생성, manifest 반환"""
+    output_dir = output_dir or os.path.join(STATIC_DIR, DIST_DIR)
+    building_dir = output_dir + '.building'
+    shutil.rmtree(building_dir, ignore_errors=True)
+    os.makedirs(building_dir)
+
+    manifest = {}
+    report = []
+    for pattern in SOURCE_PATTERNS:
+        for path in sorted(glob.glob(os.path.join(STATIC_DIR, pattern))):
+            logical = os.path.relpath(path, STATIC_DIR).replace(os.sep, '/')
+            ext = os.path.splitext(path)[1].lower()
+            with open(path, 'rb') as f:
+                data = f.read()
+
+            original = len(data)
+            if ext == '.css':
+                data = minify_css(data.decode('utf-8')).encode('utf-8')
+            elif ext == '.js':
+                data = minify_js(data.decode('utf-8')).encode('utf-8')
+            elif ext in ('.jpg', '.jpeg', '.png'):
+                data = optimize_image(data, ext)
+            emit(building_dir, logical, data, original, manifest, report)
+
+    _write(os.path.join(building_dir, 'manifest.json'),
+           json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode('utf-8'))
+
+    # 완성된 빌드로 교체 (실행 중인 서버는 manifest 수정 시각으로 다시 읽음)
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.rename(building_dir, output_dir)
+    return manifest, report
+
+
+def _kb(size):
+    return f'{size / 1024:.1f}KB' if size is not None else '-'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='정적 파일 빌드 (해시 파일명, 압축)')
+    parser.add_argument('--output', help='출력 디렉토리 (기본값: static/dist)')
+    args = parser.parse_args(argv)
+
+    try:
+        manifest, report = build(args.output)
+    except Exception as e:
+        print(f'❌ 정적 파일 빌드 실패: {e}')
+        return 1
+
+    print(f"{'파일':<34}{'원본':>10}{'빌드':>10}{'gzip':>10}{'br':>10}")
+    for logical, hashed, sizes in report:
+        print(f"{hashed:<34}{_kb(sizes['source']):>10}{_kb(sizes['raw']):>10}"
+              f"{_kb(sizes['gzip']):>10}{_kb(sizes['br']):>10}")
+    print(f'✅ 정적 파일 빌드 완료: {len(manifest)}개')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""휴가 신청 일괄 승인/반려
+
+선택한 대기중 신청을 UPDATE 한 번으로 처리하고, 승인 시 연차 사용 일수는
+(직원, 연도)별 합계를 UPDATE 한 번으로 더한다. 잔여 연차 확인도 같은 합계로
+한 번에 수행하며, 부족한 (직원, 연도)의 신청은 대기 상태로 남기고 제외 목록으로 돌려준다.
+잔여 연차 확인 전에 대상 연차 행을 잠가서(PostgreSQL은 SELECT ... FOR UPDATE, SQLite는 쓰기 잠금)
+동시에 일괄 승인하는 다른 관리자가 확인과 차감 사이에 끼어들어 잔여 연차를 초과하지 못하게 한다.
+
+커밋은 호출하는 쪽에서 수행하므로 상태/연차/집계가 한 트랜잭션으로 처리된다.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import and_, func, select, tuple_, update
+
+from app import db
+from models import User, VacationDays, VacationRequest, VacationStatus
+from data_versions import VACATIONS, bump_version, user_scope, department_scope
+from department_stats import NON_DEDUCTIBLE_TYPES, record_bulk_approved
+from year_rollover import provision_year
+
+# 한 번에 처리할 수 있는 신청 수 (SQLite 바인드 변수 제한 고려)
+MAX_BULK_DECISIONS = 500
+
+# 제외 사유
+SKIP_NOT_FOUND = '존재하지 않는 신청'
+SKIP_NOT_PENDING = '대기중인 신청이 아님'
+SKIP_INSUFFICIENT = '잔여 연차 부족'
+
+_request_year = db.extract('year', VacationRequest.start_date)
+
+
+def _deductible_totals(request_ids):
+    """(직원, 연도)별 차감 일수 합계 서브쿼리"""
+    return select(
+        VacationRequest.user_id.label('user_id'),
+        _request_year.label('year'),
+        func.sum(VacationRequest.days).label('days')
+    ).where(
+        VacationRequest.id.in_(request_ids),
+        VacationRequest.type.notin_(NON_DEDUCTIBLE_TYPES)
+    ).group_by(VacationRequest.user_id, _request_year).subquery()
+
+
+def _lock_balances(groups):
+    """(직원, 연도) 연차 행을 트랜잭션이 끝날 때까지 잠금 (잔여 연차 확인 ~ 차감 사이의 동시 승인 방지)"""
+    if not groups:
+        return
+    target = tuple_(VacationDays.user_id, VacationDays.year).in_(sorted(groups))
+    if db.session.connection().dialect.name == 'sqlite':
+        # SQLite는 FOR UPDATE가 없으므로 변경 없는 UPDATE로 데이터베이스 쓰기 잠금을 먼저 잡는다
+        db.session.execute(
+            update(VacationDays).where(target).values(used_days=VacationDays.used_days)
+            .execution_options(synchronize_session=False)
+        )
+        return
+    # 교착을 피하도록 id 순서로 잠금
+    db.session.execute(select(VacationDays.id).where(target).order_by(VacationDays.id).with_for_update()).all()
+
+
+def _insufficient_groups(request_ids):
+    """잔여 연차보다 많이 신청된 (직원, 연도) 목록"""
+    totals = _deductible_totals(request_ids)
+    return db.session.execute(
+        select(totals.c.user_id, totals.c.year).join(
+            VacationDays,
+            and_(VacationDays.user_id == totals.c.user_id, VacationDays.year == totals.c.year)
+        ).where(VacationDays.total_days - VacationDays.used_days < totals.c.days)
+    ).all()
+
+
+def decide_vacation_requests(request_ids, status, approved_by, comments=None):
+    """대기중인 휴가 신청 일괄 승인/반려
+
+    특별휴가 등 NON_DEDUCTIBLE_TYPES는 잔여 연차 확인/사용 일수에서 제외한다 (단건 승인, 잔여 연차 계산과 같은 기준).
+
+    Returns:
+        dict: processed(처리 건수), skipped(제외 목록 [{'id', 'name', 'reason'}], 없는 신청은 name이 None)
+    """
+    if status not in (VacationStatus.APPROVED, VacationStatus.REJECTED):
+        raise ValueError('승인 또는 반려만 선택할 수 있습니다.')
+
+    request_ids = sorted(set(request_ids))
+    if not request_ids:
+        raise ValueError('처리할 휴가 신청을 선택하세요.')
+    if len(request_ids) > MAX_BULK_DECISIONS:
+        raise ValueError(f'한 번에 최대 {MAX_BULK_DECISIONS}건까지 처리할 수 있습니다.')
+
+    rows = db.session.query(
+        VacationRequest.id,
+        VacationRequest.user_id,
+        VacationRequest.status,
+        _request_year,
+        User.name,
+        VacationRequest.type
+    ).join(User, User.id == VacationRequest.user_id).filter(
+        VacationRequest.id.in_(request_ids)
+    ).all()
+
+    found = {row[0] for row in rows}
+    skipped = [
+        {'id': request_id, 'name': None, 'reason': SKIP_NOT_FOUND}
+        for request_id in request_ids if request_id not in found
+    ]
+    skipped.extend(
+        {'id': request_id, 'name': name, 'reason': SKIP_NOT_PENDING}
+        for request_id, _, current, _, name, _ in rows if current != VacationStatus.PENDING
+    )
+    pending = [row for row in rows if row[2] == VacationStatus.PENDING]
+
+    if status == VacationStatus.APPROVED and pending:
+        # 연도 레코드가 없는 직원은 먼저 만들고, (직원, 연도)별 합계로 잔여 연차를 한 번에 확인
+        for year in {int(row[3]) for row in pending}:
+            user_ids = {row[1] for row in pending if int(row[3]) == year}
+            provision_year(year, User.id.in_(user_ids))
+
+        _lock_balances({(row[1], int(row[3])) for row in pending})
+        insufficient = {(user_id, int(year)) for user_id, year in
+                        _insufficient_groups([row[0] for row in pending])}
+        # 차감되지 않는 휴가는 잔여 연차와 관계없이 승인한다
+        short = [row for row in pending
+                 if (row[1], int(row[3])) in insufficient and row[5] not in NON_DEDUCTIBLE_TYPES]
+        skipped.extend(
+            {'id': request_id, 'name': name, 'reason': SKIP_INSUFFICIENT}
+            for request_id, _, _, _, name, _ in short
+        )
+        short_ids = {row[0] for row in short}
+        pending = [row for row in pending if row[0] not in short_ids]
+
+    result = {'processed': 0, 'skipped': sorted(skipped, key=lambda item: item['id'])}
+    if not pending:
+        return result
+
+    eligible_ids = [row[0] for row in pending]
+
+    # 1) 상태 일괄 변경 (그 사이 다른 관리자가 처리한 건은 조건에서 빠진다)
+    batch_time = datetime.now()
+    updated = db.session.execute(
+        update(VacationRequest)
+        .where(VacationRequest.id.in_(eligible_ids), VacationRequest.status == VacationStatus.PENDING)
+        .values(status=status, comments=comments, approved_by=approved_by, approval_date=batch_time)
+        .execution_options(synchronize_session=False)
+    )
+    result['processed'] = updated.rowcount
+    if updated.rowcount != len(eligible_ids):
+        # 실제로 이번에 변경된 행만 연차/집계에 반영
+        eligible_ids = db.session.execute(
+            select(VacationRequest.id).where(
+                VacationRequest.id.in_(eligible_ids),
+                VacationRequest.approved_by == approved_by,
+                VacationRequest.approval_date == batch_time
+            )
+        ).scalars().all()
+        changed = set(eligible_ids)
+        pending = [row for row in pending if row[0] in changed]
+        if not pending:
+            return result
+
+    if status == VacationStatus.APPROVED:
+        # 2) 연차 사용 일수: (직원, 연도)별 합계를 UPDATE 한 번으로 반영
+        totals = _deductible_totals(eligible_ids)
+        group_total = select(totals.c.days).where(
+            totals.c.user_id == VacationDays.user_id,
+            totals.c.year == VacationDays.year
+        ).scalar_subquery()
+        db.session.execute(
+            update(VacationDays)
+            .where(tuple_(VacationDays.user_id, VacationDays.year).in_(
+                select(totals.c.user_id, totals.c.year)
+            ))
+            .values(used_days=VacationDays.used_days + group_total)
+            .execution_options(synchronize_session=False)
+        )
+
+        # 3) 부서별 집계 (반려는 신청 일수만 유지되므로 변화 없음)
+        month = db.extract('month', VacationRequest.start_date)
+        deductible = VacationRequest.type.notin_(NON_DEDUCTIBLE_TYPES)
+        department_totals = db.session.query(
+            User.department,
+            _request_year,
+            month,
+            func.sum(VacationRequest.days),
+            func.sum(db.case((deductible, VacationRequest.days), else_=0))
+        ).join(User, User.id == VacationRequest.user_id).filter(
+            VacationRequest.id.in_(eligible_ids)
+        ).group_by(User.department, _request_year, month).all()
+        record_bulk_approved(department_totals)
+
+    # 4) 변경 버전 반영 (세션을 거치지 않았으므로 직접 호출)
+    user_ids = {row[1] for row in pending}
+    departments = db.session.execute(
+        select(User.department).where(User.id.in_(user_ids)).distinct()
+    ).scalars().all()
+    bump_version(
+        VACATIONS,
+        *(user_scope(user_id) for user_id in user_ids),
+        *(department_scope(dept) for dept in departments if dept)
+    )
+
+    # 세션에 남아 있는 객체가 이전 상태를 보여주지 않도록 만료
+    db.session.expire_all()
+    return result
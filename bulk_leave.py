@@ -0,0 +1,224 @@
+"""전사 일괄 휴가 등록 (창립기념일, 하계 휴무 등)
+
+대상 직원 전체의 휴가 신청 행을 INSERT ... SELECT 한 번으로 만들고,
+연차 사용 일수도 UPDATE 한 번으로 차감한다. 기간이 겹치는 신청이 있거나
+잔여 연차가 부족한 직원은 건너뛰고 충돌 목록으로 돌려준다.
+
+커밋은 호출하는 쪽에서 수행하므로 등록/차감/집계가 한 트랜잭션으로 처리된다.
+
+명령행 실행:
+    python bulk_leave.py --start 2025-08-04 --end 2025-08-05 --reason "하계 휴무" [--department 공사팀] [--dry-run]
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from sqlalchemy import exists, false, func, insert, literal, select, update
+
+from app import db
+from models import User, Role, VacationDays, VacationRequest, VacationStatus
+from utils import ACTIVE_VACATION_STATUSES, get_vacation_days_count
+from data_versions import VACATIONS, bump_version, user_scope, department_scope
+from department_stats import NON_DEDUCTIBLE_TYPES, record_bulk_added
+from year_rollover import provision_year
+
+# 충돌 사유
+CONFLICT_OVERLAP = '기간 중복'
+CONFLICT_INSUFFICIENT = '잔여 연차 부족'
+
+
+def _target_criteria(department=None, position=None):
+    """일괄 등록 대상 직원 조건"""
+    criteria = [User.role == Role.EMPLOYEE]
+    if department:
+        criteria.append(User.department == department)
+    if position:
+        criteria.append(User.position == position)
+    return criteria
+
+
+def _overlap_exists(start_date, end_date):
+    """기간이 겹치는 대기/승인 신청 존재 여부 (상관 서브쿼리)"""
+    return exists().where(
+        VacationRequest.user_id == User.id,
+        VacationRequest.start_date <= end_date,
+        VacationRequest.end_date >= start_date,
+        VacationRequest.status.in_(ACTIVE_VACATION_STATUSES)
+    )
+
+
+def _insufficient_exists(year, days):
+    """잔여 연차 부족 여부 (연차 레코드가 없으면 부족으로 보지 않음)"""
+    return exists().where(
+        VacationDays.user_id == User.id,
+        VacationDays.year == year,
+        VacationDays.total_days - VacationDays.used_days < days
+    )
+
+
+def find_conflicts(start_date, end_date, days, vacation_type, department=None, position=None):
+    """등록에서 제외될 직원 목록 [{'user_id', 'name', 'department', 'reason'}]"""
+    overlap = _overlap_exists(start_date, end_date)
+    if vacation_type in NON_DEDUCTIBLE_TYPES:
+        insufficient = false()
+    else:
+        insufficient = _insufficient_exists(start_date.year, days)
+
+    rows = db.session.query(
+        User.id,
+        User.name,
+        User.department,
+        db.case((overlap, CONFLICT_OVERLAP), else_=CONFLICT_INSUFFICIENT)
+    ).filter(
+        *_target_criteria(department, position),
+        overlap | insufficient
+    ).order_by(User.department, User.name).all()
+
+    return [
+        {'user_id': user_id, 'name': name, 'department': dept, 'reason': reason}
+        for user_id, name, dept, reason in rows
+    ]
+
+
+def post_bulk_leave(start_date, end_date, vacation_type, reason, approved_by,
+                    department=None, position=None, dry_run=False):
+    """대상 직원 전체에 승인된 휴가 일괄 등록
+
+    Returns:
+        dict: days(1인당 일수), targets(대상 인원), created(등록 건수), conflicts(제외 목록), dry_run
+    """
+    days = get_vacation_days_count(start_date, end_date, vacation_type)
+    if days <= 0:
+        raise ValueError('선택한 기간에 근무일이 없습니다.')
+
+    year = start_date.year
+    deductible = vacation_type not in NON_DEDUCTIBLE_TYPES
+    criteria = _target_criteria(department, position)
+
+    targets = db.session.query(func.count(User.id)).filter(*criteria).scalar()
+    conflicts = find_conflicts(start_date, end_date, days, vacation_type, department, position)
+    result = {
+        'days': days,
+        'targets': targets,
+        'created': targets - len(conflicts),
+        'conflicts': conflicts,
+        'dry_run': dry_run
+    }
+    if dry_run or result['created'] == 0:
+        return result
+
+    # 1) 휴가 신청 일괄 생성
+    batch_time = datetime.now()
+    eligible = criteria + [~_overlap_exists(start_date, end_date)]
+    if deductible:
+        eligible.append(~_insufficient_exists(year, days))
+
+    source = select(
+        User.id,
+        literal(start_date),
+        literal(end_date),
+        literal(days),
+        literal(reason),
+        literal(VacationStatus.APPROVED),
+        literal(vacation_type),
+        literal(approved_by),
+        literal(batch_time),
+        literal(batch_time)
+    ).where(*eligible)
+
+    inserted = db.session.execute(
+        insert(VacationRequest).from_select(
+            ['user_id', 'start_date', 'end_date', 'days', 'reason', 'status', 'type',
+             'approved_by', 'approval_date', 'created_at'],
+            source
+        )
+    )
+    result['created'] = inserted.rowcount
+
+    # 이번에 등록된 행 (같은 등록 시각/등록자/기간으로 식별)
+    batch = (
+        VacationRequest.created_at == batch_time,
+        VacationRequest.approved_by == approved_by,
+        VacationRequest.start_date == start_date,
+        VacationRequest.end_date == end_date
+    )
+    batch_user_ids = select(VacationRequest.user_id).where(*batch)
+
+    # 2) 연차 차감: 레코드가 없는 직원은 먼저 만들고 UPDATE 한 번으로 사용 일수 증가
+    if deductible:
+        provision_year(year, User.id.in_(batch_user_ids))
+        db.session.execute(
+            update(VacationDays)
+            .where(VacationDays.year == year, VacationDays.user_id.in_(batch_user_ids))
+            .values(used_days=VacationDays.used_days + days)
+            .execution_options(synchronize_session=False)
+        )
+
+    # 3) 부서별 집계 및 변경 버전 반영 (세션을 거치지 않았으므로 직접 호출)
+    department_counts = db.session.query(User.department, func.count(User.id))\
+        .filter(User.id.in_(batch_user_ids))\
+        .group_by(User.department).all()
+    record_bulk_added(department_counts, start_date, days, vacation_type)
+
+    user_ids = db.session.execute(batch_user_ids).scalars().all()
+    bump_version(
+        VACATIONS,
+        *(user_scope(user_id) for user_id in user_ids),
+        *(department_scope(dept) for dept, _ in department_counts if dept)
+    )
+
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='전사 일괄 휴가 등록')
+    parser.add_argument('--start', required=True, help='시작일 (YYYY-MM-DD)')
+    parser.add_argument('--end', help='종료일 (YYYY-MM-DD, 기본값: 시작일)')
+    parser.add_argument('--type', default='연차', help='휴가 유형 (기본값: 연차)')
+    parser.add_argument('--reason', required=True, help='휴가 사유')
+    parser.add_argument('--department', help='대상 부서 (생략 시 전체)')
+    parser.add_argument('--position', help='대상 직급 (생략 시 전체)')
+    parser.add_argument('--admin', default='admin', help='등록 관리자 아이디 (기본값: admin)')
+    parser.add_argument('--dry-run', action='store_true', help='등록하지 않고 대상/충돌만 확인')
+    args = parser.parse_args(argv)
+
+    from app import app
+
+    start_date = datetime.strptime(args.start, '%Y-%m-%d').date()
+    end_date = datetime.strptime(args.end, '%Y-%m-%d').date() if args.end else start_date
+    if end_date < start_date:
+        print('❌ 종료일은 시작일보다 늦어야 합니다.')
+        return 1
+
+    with app.app_context():
+        admin = User.query.filter_by(username=args.admin, role=Role.ADMIN).first()
+        if not admin:
+            print(f'❌ 관리자 계정을 찾을 수 없습니다: {args.admin}')
+            return 1
+
+        try:
+            result = post_bulk_leave(
+                start_date, end_date, args.type, args.reason, admin.id,
+                department=args.department, position=args.position, dry_run=args.dry_run
+            )
+            if not args.dry_run:
+                db.session.commit()
+        except ValueError as e:
+            print(f'❌ {e}')
+            return 1
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ 일괄 등록 중 오류: {e}')
+            return 1
+
+    label = '등록 예정' if args.dry_run else '등록 완료'
+    print(f"📅 {start_date} ~ {end_date} {args.type} (1인당 {result['days']}일)")
+    print(f"✅ {label}: {result['created']}명 / 대상 {result['targets']}명")
+    for conflict in result['conflicts']:
+        print(f"⚠️ 제외: {conflict['name']} ({conflict['department'] or '-'}) - {conflict['reason']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""회사 정보 캐시
+
+회사 정보(company_info)는 한 행짜리 설정으로 거의 바뀌지 않으므로 워커 프로세스마다 한 번 읽어
+읽기 전용 스냅샷으로 보관한다. 회사 정보가 ORM으로 변경되면 data_versions의 'company' 버전이 올라가고,
+각 워커는 조회할 때 버전 값만 비교해서 바뀐 경우에만 행을 다시 읽는다 (gunicorn 다중 워커 대응).
+
+회사 정보가 아직 등록되지 않았을 때 쓰는 기본값도 여기서만 정의한다.
+"""
+
+from collections import namedtuple
+
+from models import CompanyInfo
+from data_versions import COMPANY, get_version
+
+_FIELDS = ['id', 'name', 'ceo_name', 'registration_number', 'address', 'phone', 'fax', 'website', 'stamp_asset']
+
+CompanySettings = namedtuple('CompanySettings', _FIELDS + ['version', 'is_default'])
+
+# 회사 정보 미등록 시 기본값
+DEFAULT_COMPANY = {
+    'id': None,
+    'name': '주식회사 에스에스전력',
+    'ceo_name': '김세인',
+    'registration_number': None,
+    'address': None,
+    'phone': None,
+    'fax': None,
+    'website': 'https://ss-electric.co.kr',
+    'stamp_asset': None,
+}
+
+# (버전, 스냅샷) - 튜플 통째로 교체해서 스레드 간에 일관된 값을 보게 한다
+_cache = (None, None)
+
+
+def _load(version):
+    company_info = CompanyInfo.query.order_by(CompanyInfo.id).first()
+    if company_info is None:
+        return CompanySettings(**DEFAULT_COMPANY, version=version, is_default=True)
+    values = {field: getattr(company_info, field) for field in _FIELDS}
+    return CompanySettings(**values, version=version, is_default=False)
+
+
+def get_company_settings():
+    """회사 정보 스냅샷 (버전이 바뀌었을 때만 다시 읽음)"""
+    global _cache
+
+    # 버전을 먼저 읽으므로 그 사이에 변경되어도 다음 조회에서 다시 읽게 된다
+    version = get_version(COMPANY)
+    cached_version, settings = _cache
+    if settings is None or cached_version != version:
+        settings = _load(version)
+        _cache = (version, settings)
+    return settings
+
+
+def clear_cache():
+    """스냅샷 폐기 (테스트/복원 후 사용)"""
+    global _cache
+    _cache = (None, None)
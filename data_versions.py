@@ -0,0 +1,179 @@
+"""데이터 변경 버전 카운터
+
+ORM으로 휴가 신청, 연차 일수, 재직증명서, 공휴일, 회사 정보가 변경되면 flush 시점에 같은 트랜잭션 안에서
+해당 범위(scope: 전체/직원별/부서별)의 버전을 1 올린다. 캐시는 원본 테이블을 다시 읽지 않고
+버전 값만 비교해서 무효화 여부를 판단한다.
+
+대량 UPDATE/INSERT처럼 세션을 거치지 않는 변경은 bump_version()을 직접 호출해야 한다.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app import db
+from models import DataVersion, User, VacationRequest, VacationDays, EmploymentCertificate, Holiday, CompanyInfo
+
+# 버전 범위
+VACATIONS = 'vacations'
+HOLIDAYS = 'holidays'
+COMPANY = 'company'
+
+# 한 번에 갱신할 범위 수 (SQLite 바인드 변수 제한 고려)
+BUMP_BATCH_SIZE = 500
+
+
+def user_scope(user_id):
+    """직원별 범위 이름"""
+    return f'user:{user_id}'
+
+
+def department_scope(department):
+    """부서별 범위 이름"""
+    return f'department:{department}'
+
+
+def _vacation_scopes(obj, connection):
+    scopes = {VACATIONS}
+    if obj.user_id is not None:
+        scopes.add(user_scope(obj.user_id))
+        department = connection.execute(
+            select(User.department).where(User.id == obj.user_id)
+        ).scalar()
+        if department:
+            scopes.add(department_scope(department))
+    return scopes
+
+
+def _user_scopes(obj, connection):
+    # 이름/부서가 피드에 표시되므로 직원 정보 변경 시 본인 및 (이전/새) 부서 범위를 모두 올린다
+    departments = set(inspect(obj).attrs.department.history.sum())
+    scopes = {department_scope(dept) for dept in departments if dept}
+    if obj.id is not None:
+        scopes.add(user_scope(obj.id))
+    return scopes
+
+
+def _owner_scopes(obj, connection):
+    # 직원 본인 화면에만 표시되는 데이터 (연차 일수, 재직증명서)
+    return {user_scope(obj.user_id)} if obj.user_id is not None else set()
+
+
+# 모델별로 변경 시 올려야 할 버전 범위
+_SCOPE_RESOLVERS = {
+    VacationRequest: _vacation_scopes,
+    Holiday: lambda obj, connection: {HOLIDAYS},
+    CompanyInfo: lambda obj, connection: {COMPANY},
+    User: _user_scopes,
+    VacationDays: _owner_scopes,
+    EmploymentCertificate: _owner_scopes,
+}
+
+
+def get_version(scope):
+    """범위의 현재 버전 (기록이 없으면 0)"""
+    version = db.session.execute(
+        select(DataVersion.version).where(DataVersion.scope == scope)
+    ).scalar()
+    return version or 0
+
+
+def get_versions(*scopes):
+    """여러 범위의 현재 버전을 한 번에 조회 {scope: version}"""
+    rows = db.session.execute(
+        select(DataVersion.scope, DataVersion.version).where(DataVersion.scope.in_(scopes))
+    ).all()
+    versions = {scope: 0 for scope in scopes}
+    versions.update({scope: version for scope, version in rows})
+    return versions
+
+
+def get_user_versions(user_ids):
+    """직원별 범위 버전을 한 번에 조회 {user_id: version} (목록 화면의 행 단위 캐시 키용)"""
+    user_ids = sorted(set(user_ids))
+    versions = {user_id: 0 for user_id in user_ids}
+    for i in range(0, len(user_ids), BUMP_BATCH_SIZE):
+        chunk = {user_scope(user_id): user_id for user_id in user_ids[i:i + BUMP_BATCH_SIZE]}
+        rows = db.session.execute(
+            select(DataVersion.scope, DataVersion.version).where(DataVersion.scope.in_(list(chunk)))
+        ).all()
+        versions.update({chunk[scope]: version for scope, version in rows})
+    return versions
+
+
+def get_version_stamps(*scopes):
+    """여러 범위의 버전과 가장 최근 변경 시각 ({scope: version}, updated_at 또는 None)"""
+    rows = db.session.execute(
+        select(DataVersion.scope, DataVersion.version, DataVersion.updated_at)
+        .where(DataVersion.scope.in_(scopes))
+    ).all()
+    versions = {scope: 0 for scope in scopes}
+    versions.update({scope: version for scope, version, _ in rows})
+    updated = [updated_at for _, _, updated_at in rows if updated_at is not None]
+    return versions, max(updated) if updated else None
+
+
+def _upsert_statement(table, dialect_name, now):
+    """범위가 없으면 버전 1로 추가, 있으면 1 증가하는 INSERT (지원하지 않는 DB면 None)"""
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+
+    return dialect_insert(table).on_conflict_do_update(
+        index_elements=[table.c.scope],
+        set_={'version': table.c.version + 1, 'updated_at': now}
+    )
+
+
+def bump_version(*scopes, connection=None):
+    """범위 버전 증가 (커밋은 호출하는 쪽 트랜잭션에서 수행)
+
+    PostgreSQL/SQLite는 한 문장의 upsert로 처리하므로 동시에 같은 새 범위를 올려도
+    기본키 충돌(IntegrityError)이 나지 않는다.
+    """
+    conn = connection or db.session.connection()
+    table = DataVersion.__table__
+    now = datetime.now()
+    # 정렬된 순서로 잠가서 동시 갱신 간 교착을 피한다
+    scopes = sorted(set(scopes))
+    upsert = _upsert_statement(table, conn.dialect.name, now)
+
+    for i in range(0, len(scopes), BUMP_BATCH_SIZE):
+        chunk = scopes[i:i + BUMP_BATCH_SIZE]
+        if upsert is not None:
+            conn.execute(upsert.values([{'scope': scope, 'version': 1, 'updated_at': now} for scope in chunk]))
+            continue
+
+        conn.execute(
+            update(table)
+            .where(table.c.scope.in_(chunk))
+            .values(version=table.c.version + 1, updated_at=now)
+        )
+        existing = set(conn.execute(select(table.c.scope).where(table.c.scope.in_(chunk))).scalars())
+        missing = [{'scope': scope, 'version': 1, 'updated_at': now} for scope in chunk if scope not in existing]
+        if missing:
+            conn.execute(insert(table), missing)
+
+
+def _scopes_for(obj, connection):
+    resolver = _SCOPE_RESOLVERS.get(type(obj))
+    return resolver(obj, connection) if resolver else set()
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_changed_scopes(session, flush_context):
+    """flush된 변경 사항에 해당하는 범위 버전을 같은 트랜잭션에서 증가"""
+    connection = session.connection()
+    scopes = set()
+    for obj in list(session.new) + list(session.deleted):
+        scopes |= _scopes_for(obj, connection)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            scopes |= _scopes_for(obj, connection)
+
+    if scopes:
+        bump_version(*scopes, connection=connection)
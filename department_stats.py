@@ -0,0 +1,291 @@
+"""부서 기준 정보 및 부서별 월간 휴가 집계 관리
+
+휴가 신청/승인/삭제 시 같은 트랜잭션 안에서 집계 행을 증감시켜,
+부서별 보고서가 전체 이력 GROUP BY 대신 집계 테이블 조회 한 번으로 끝나도록 한다.
+"""
+
+from sqlalchemy import func, update
+
+from app import db
+from models import User, Department, DepartmentVacationStats, VacationRequest, VacationRequestArchive, VacationStatus
+
+# 초기 부서 목록 (기존 검색 폼에 하드코딩되어 있던 순서 유지)
+DEFAULT_DEPARTMENTS = [
+    '공사팀', '공무부', '경리부', '인사팀', '총무팀',
+    '영업팀', '안전팀', '품질팀', '기술팀', '관리팀'
+]
+
+# 연차에서 차감되지 않는 휴가 유형
+NON_DEDUCTIBLE_TYPES = ('특별휴가',)
+
+
+def get_department(name, create=True):
+    """부서명으로 부서 기준 정보 조회 (없으면 생성)"""
+    if not name:
+        return None
+
+    department = Department.query.filter_by(name=name).first()
+    if department is None and create:
+        max_order = db.session.query(func.coalesce(func.max(Department.sort_order), 0)).scalar()
+        department = Department(name=name, sort_order=max_order + 1)
+        db.session.add(department)
+        db.session.flush()
+    return department
+
+
+def seed_departments():
+    """기본 부서 및 직원 정보에 등록된 부서를 기준 정보 테이블에 반영"""
+    existing = {name for (name,) in db.session.query(Department.name).all()}
+
+    names = list(DEFAULT_DEPARTMENTS)
+    user_departments = db.session.query(User.department).filter(
+        User.department != None, User.department != ''
+    ).distinct().all()
+    names.extend(sorted(name for (name,) in user_departments if name not in DEFAULT_DEPARTMENTS))
+
+    added = 0
+    for order, name in enumerate(names, start=1):
+        if name not in existing:
+            db.session.add(Department(name=name, sort_order=order))
+            existing.add(name)
+            added += 1
+
+    if added:
+        db.session.commit()
+    return added
+
+
+def department_choices(include_all=True):
+    """검색 폼용 부서 선택지"""
+    departments = Department.query.filter_by(is_active=True).order_by(
+        Department.sort_order, Department.name
+    ).all()
+
+    choices = [('all', '전체')] if include_all else []
+    choices.extend((dept.name, dept.name) for dept in departments)
+    return choices
+
+
+def _upsert_statement(table, dialect_name):
+    """기간 행이 없으면 추가, 있으면 값을 더하는 INSERT (지원하지 않는 DB면 None)"""
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+
+    statement = dialect_insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.department_id, table.c.year, table.c.month],
+        set_={name: table.c[name] + statement.excluded[name]
+              for name in ('requested_days', 'approved_days', 'used_days')}
+    )
+
+
+def _apply_delta(department_id, year, month, requested=0, approved=0, used=0):
+    """집계 행 증감 (행이 없으면 생성). 커밋은 호출하는 쪽에서 수행
+
+    PostgreSQL/SQLite는 한 문장의 upsert로 처리하므로 동시에 같은 기간의 첫 행을 만들어도
+    uq_department_vacation_stats_period 충돌(IntegrityError)이 나지 않는다.
+    """
+    if not (requested or approved or used):
+        return
+
+    upsert = _upsert_statement(DepartmentVacationStats.__table__, db.session.connection().dialect.name)
+    if upsert is not None:
+        db.session.execute(upsert.values(
+            department_id=department_id,
+            year=year,
+            month=month,
+            requested_days=requested,
+            approved_days=approved,
+            used_days=used
+        ))
+        return
+
+    result = db.session.execute(
+        update(DepartmentVacationStats)
+        .where(
+            DepartmentVacationStats.department_id == department_id,
+            DepartmentVacationStats.year == year,
+            DepartmentVacationStats.month == month
+        )
+        .values(
+            requested_days=DepartmentVacationStats.requested_days + requested,
+            approved_days=DepartmentVacationStats.approved_days + approved,
+            used_days=DepartmentVacationStats.used_days + used
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    if result.rowcount == 0:
+        db.session.add(DepartmentVacationStats(
+            department_id=department_id,
+            year=year,
+            month=month,
+            requested_days=requested,
+            approved_days=approved,
+            used_days=used
+        ))
+        db.session.flush()
+
+
+def _vacation_delta(vacation_request, sign, status=None):
+    """휴가 신청 한 건이 집계에 기여하는 값 (requested, approved, used)"""
+    status = status or vacation_request.status
+    days = float(vacation_request.days or 0) * sign
+
+    approved = days if status == VacationStatus.APPROVED else 0
+    used = approved if vacation_request.type not in NON_DEDUCTIBLE_TYPES else 0
+    return days, approved, used
+
+
+def _department_id_for(vacation_request, user=None):
+    user = user or vacation_request.user or User.query.get(vacation_request.user_id)
+    department = get_department(user.department) if user else None
+    return department.id if department else None
+
+
+def record_vacation_added(vacation_request, user=None):
+    """휴가 신청(또는 관리자 직접 등록) 반영"""
+    department_id = _department_id_for(vacation_request, user)
+    if department_id is None:
+        return
+
+    requested, approved, used = _vacation_delta(vacation_request, 1)
+    _apply_delta(department_id, vacation_request.start_date.year, vacation_request.start_date.month,
+                 requested, approved, used)
+
+
+def record_vacation_removed(vacation_request, user=None):
+    """휴가 신청 취소/삭제 반영"""
+    department_id = _department_id_for(vacation_request, user)
+    if department_id is None:
+        return
+
+    requested, approved, used = _vacation_delta(vacation_request, -1)
+    _apply_delta(department_id, vacation_request.start_date.year, vacation_request.start_date.month,
+                 requested, approved, used)
+
+
+def record_status_change(vacation_request, old_status, user=None):
+    """승인/반려 처리 반영 (신청 일수는 그대로, 승인/사용 일수만 증감)"""
+    if old_status == vacation_request.status:
+        return
+
+    department_id = _department_id_for(vacation_request, user)
+    if department_id is None:
+        return
+
+    _, old_approved, old_used = _vacation_delta(vacation_request, 1, status=old_status)
+    _, new_approved, new_used = _vacation_delta(vacation_request, 1)
+    _apply_delta(department_id, vacation_request.start_date.year, vacation_request.start_date.month,
+                 approved=new_approved - old_approved, used=new_used - old_used)
+
+
+def record_user_requests_removed(user):
+    """직원 삭제 전 해당 직원의 휴가 신청 전체를 집계에서 차감"""
+    department = get_department(user.department, create=False)
+    if department is None:
+        return
+
+    for model in (VacationRequest, VacationRequestArchive):
+        for year, month, requested, approved, used in _grouped_totals(model, model.user_id == user.id):
+            _apply_delta(department.id, year, month, -requested, -approved, -used)
+
+
+def record_bulk_added(department_counts, start_date, days, vacation_type):
+    """일괄 등록(승인 상태) 반영. department_counts: [(부서명, 인원)]"""
+    deductible = vacation_type not in NON_DEDUCTIBLE_TYPES
+    for name, count in department_counts:
+        department = get_department(name) if name else None
+        if department is None:
+            continue
+
+        total = float(days) * count
+        _apply_delta(department.id, start_date.year, start_date.month,
+                     total, total, total if deductible else 0)
+
+
+def record_bulk_approved(department_totals):
+    """일괄 승인 반영. department_totals: [(부서명, 연, 월, 승인 일수, 연차 차감 일수)]"""
+    for name, year, month, approved, used in department_totals:
+        department = get_department(name) if name else None
+        if department is None:
+            continue
+
+        _apply_delta(department.id, int(year), int(month), approved=float(approved), used=float(used or 0))
+
+
+def _grouped_totals(model, *criteria):
+    """휴가 신청(model: 현재 또는 보관 테이블)을 (연, 월) 단위로 합산"""
+    year = db.extract('year', model.start_date)
+    month = db.extract('month', model.start_date)
+    approved = model.status == VacationStatus.APPROVED
+    deductible = model.type.notin_(NON_DEDUCTIBLE_TYPES)
+
+    rows = db.session.query(
+        year,
+        month,
+        func.coalesce(func.sum(model.days), 0),
+        func.coalesce(func.sum(db.case((approved, model.days), else_=0)), 0),
+        func.coalesce(func.sum(db.case((approved & deductible, model.days), else_=0)), 0)
+    ).filter(*criteria).group_by(year, month).all()
+
+    return [(int(y), int(m), float(requested), float(approved_days), float(used))
+            for y, m, requested, approved_days, used in rows]
+
+
+def rebuild_department_stats():
+    """전체 휴가 이력으로 집계 테이블 재생성 (최초 적용 또는 정합성 복구용)"""
+    seed_departments()
+    DepartmentVacationStats.query.delete()
+
+    departments = {dept.name: dept.id for dept in Department.query.all()}
+    user_departments = db.session.query(User.department).filter(User.department != None).distinct().all()
+
+    count = 0
+    for (name,) in user_departments:
+        department_id = departments.get(name)
+        if department_id is None:
+            continue
+
+        # 보관된 과거 신청도 포함해서 (연, 월)별로 합산
+        user_ids = db.select(User.id).where(User.department == name)
+        totals = {}
+        for model in (VacationRequest, VacationRequestArchive):
+            for year, month, requested, approved, used in _grouped_totals(model, model.user_id.in_(user_ids)):
+                previous = totals.get((year, month), (0, 0, 0))
+                totals[(year, month)] = (previous[0] + requested, previous[1] + approved, previous[2] + used)
+
+        for (year, month), (requested, approved, used) in totals.items():
+            db.session.add(DepartmentVacationStats(
+                department_id=department_id,
+                year=year,
+                month=month,
+                requested_days=requested,
+                approved_days=approved,
+                used_days=used
+            ))
+            count += 1
+
+    db.session.commit()
+    return count
+
+
+def department_usage(year):
+    """연도별 부서 휴가 사용 현황 {부서명: {'requested', 'approved', 'used'}}"""
+    rows = db.session.query(
+        Department.name,
+        func.sum(DepartmentVacationStats.requested_days),
+        func.sum(DepartmentVacationStats.approved_days),
+        func.sum(DepartmentVacationStats.used_days)
+    ).join(Department, Department.id == DepartmentVacationStats.department_id)\
+    .filter(DepartmentVacationStats.year == year)\
+    .group_by(Department.name).all()
+
+    return {
+        name: {'requested': requested or 0, 'approved': approved or 0, 'used': used or 0}
+        for name, requested, approved, used in rows
+    }
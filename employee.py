@@ -1,14 +1,22 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, make_response
 from flask_login import login_required, current_user
 from app import db
-from models import VacationDays, VacationRequest, VacationStatus, EmploymentCertificate, CertificateStatus, CompanyInfo
+from models import VacationRequest, VacationStatus, EmploymentCertificate, CertificateStatus
 from forms import VacationRequestForm, EmploymentCertificateRequestForm, VacationSearchForm
-from datetime import datetime
-from utils import get_vacation_days_count, check_overlapping_vacation
+from datetime import datetime, date
+from utils import get_vacation_days_count, check_overlapping_vacation, holiday_dates
+from department_stats import record_vacation_added, record_vacation_removed
+from year_rollover import get_vacation_days
+from vacation_archive import year_range, query_vacations
+from data_versions import HOLIDAYS, user_scope
+from http_cache import conditional_page
+from company_settings import DEFAULT_COMPANY, get_company_settings
+from metrics_registry import vacation_requests_created, certificate_generation_seconds, observe_export
 import tempfile
 import os
 import urllib.parse
 import io
+import time
 import pandas as pd
 # WeasyPrint는 시스템 종속성 문제가 있어 사용하지 않습니다
 # 필요한 경우 reportlab을 사용합니다
@@ -33,25 +41,12 @@ employee_bp = Blueprint('employee', __name__)
 
 @employee_bp.route('/dashboard')
 @login_required
+@conditional_page(lambda: [user_scope(current_user.id), HOLIDAYS])
 def dashboard():
     """직원 대시보드"""
     # 현재 연도의 휴가 정보 가져오기
     current_year = datetime.now().year
-    vacation_days = VacationDays.query.filter_by(
-        user_id=current_user.id,
-        year=current_year
-    ).first()
-    
-    # 없으면 생성
-    if not vacation_days:
-        vacation_days = VacationDays(
-            user_id=current_user.id,
-            year=current_year,
-            total_days=15,  # 기본값
-            used_days=0
-        )
-        db.session.add(vacation_days)
-        db.session.commit()
+    vacation_days = get_vacation_days(current_user.id, current_year, current_user)
     
     # 실시간 잔여 휴가일수 계산
     from utils import calculate_remaining_vacation_days
@@ -125,6 +120,12 @@ def dashboard():
     upcoming_events.sort(key=lambda x: x['date'])
     upcoming_events = upcoming_events[:10]  # 최대 10개
 
+    # 캘린더 앱 구독 URL
+    from feeds import feed_url
+    calendar_feeds = {'user': feed_url('user', current_user)}
+    if current_user.department:
+        calendar_feeds['department'] = feed_url('department', current_user)
+
     return render_template(
         'employee/dashboard_gov.html',
         remaining_vacation_days=remaining_vacation_days,
@@ -132,9 +133,20 @@ def dashboard():
         pending_requests=pending_requests,
         recent_my_vacations=recent_my_vacations,
         upcoming_events=upcoming_events,
+        calendar_feeds=calendar_feeds,
         current_year=current_year
     )
 
+@employee_bp.route('/calendar-feeds/reset', methods=['POST'])
+@login_required
+def reset_calendar_feeds():
+    """캘린더 구독 URL 재발급 (이전 URL은 더 이상 열리지 않음)"""
+    from feeds import rotate_feed_secret
+    rotate_feed_secret(current_user)
+    db.session.commit()
+    flash('캘린더 구독 URL을 새로 발급했습니다. 캘린더 앱에 새 URL을 다시 등록하세요.', 'success')
+    return redirect(url_for('employee.dashboard'))
+
 @employee_bp.route('/request-vacation', methods=['GET', 'POST'])
 @login_required
 def request_vacation():
@@ -144,30 +156,13 @@ def request_vacation():
     if form.validate_on_submit():
         # 현재 연도의 휴가 정보 가져오기
         year = form.start_date.data.year
-        vacation_days = VacationDays.query.filter_by(
-            user_id=current_user.id,
-            year=year
-        ).first()
-        
-        # 없으면 생성
-        if not vacation_days:
-            vacation_days = VacationDays(
-                user_id=current_user.id,
-                year=year,
-                total_days=15,  # 기본값
-                used_days=0
-            )
-            db.session.add(vacation_days)
-            db.session.commit()
-        
-        # 휴가 일수 계산
-        type_days = {
-            '연차': float(form.days.data),
-            '반차(오전)': 0.5,
-            '반차(오후)': 0.5,
-            '특별휴가': float(form.days.data)
-        }
-        days = type_days.get(form.type.data, float(form.days.data))
+        vacation_days = get_vacation_days(current_user.id, year, current_user)
+        
+        # 휴가 일수 계산 (화면에서 계산한 값은 참고용, 저장 시에는 서버에서 다시 계산)
+        days = get_vacation_days_count(form.start_date.data, form.end_date.data, form.type.data)
+        if days == 0:
+            flash('선택한 기간에 평일이 없습니다. 날짜를 확인해주세요.', 'danger')
+            return render_template('employee/request_vacation.html', form=form)
         
         # 남은 휴가 일수 확인 (특별휴가는 연차 차감 없음)
         if form.type.data != '특별휴가' and days > vacation_days.remaining_days():
@@ -191,7 +186,9 @@ def request_vacation():
         )
         
         db.session.add(vacation_request)
+        record_vacation_added(vacation_request, current_user)
         db.session.commit()
+        vacation_requests_created.inc(source='employee')
         
         flash('휴가 신청이 완료되었습니다.', 'success')
         return redirect(url_for('employee.my_vacations'))
@@ -200,17 +197,20 @@ def request_vacation():
 
 @employee_bp.route('/my-vacations', methods=['GET', 'POST'])
 @login_required
+@conditional_page(lambda: [user_scope(current_user.id)])
 def my_vacations():
     """내 휴가 내역 페이지 (기간 검색 및 엑셀 출력 지원)"""
     form = VacationSearchForm()
     
-    # 기본 쿼리
-    query = VacationRequest.query.filter_by(user_id=current_user.id)
-    
     # 기본 연도 설정
     current_year = datetime.now().year
     search_year = current_year
     
+    # 검색 조건 (보관 테이블 조회 여부를 정하기 위해 모델과 분리해서 보관)
+    date_from = date_to = None
+    by_year = False
+    status = None
+    
     # 폼 처리 (POST 요청 모두 처리)
     if request.method == 'POST':
         # 엑셀 다운로드 요청
@@ -219,61 +219,54 @@ def my_vacations():
         
         # 검색 필터 적용 (우선순위: 년도/월 > 기간 > 기타)
         
-        # 1. 년도/월 검색 (우선순위 높음)
+        # 1. 년도/월 검색 (우선순위 높음, 휴가 시작일 범위로 변환해서 인덱스 사용)
         if form.year.data and form.year.data != 0:
-            # SQLite에서는 extract 대신 strftime 사용
-            from sqlalchemy import func
-            query = query.filter(func.strftime('%Y', VacationRequest.start_date) == str(form.year.data))
+            date_from, date_to = year_range(form.year.data, form.month.data or None)
+            by_year = True
             search_year = form.year.data
-            
-            # 월이 선택된 경우 해당 월만 검색
-            if hasattr(form, 'month') and form.month.data and form.month.data != 0:
-                month_str = f'{form.month.data:02d}'  # 01, 02, ..., 12 형식
-                query = query.filter(func.strftime('%m', VacationRequest.start_date) == month_str)
         
         # 2. 기간 검색 (년도가 선택되지 않은 경우에만 적용)
         elif form.start_date.data or form.end_date.data:
-            if form.start_date.data:
-                query = query.filter(VacationRequest.start_date >= form.start_date.data)
-            if form.end_date.data:
-                query = query.filter(VacationRequest.end_date <= form.end_date.data)
+            date_from, date_to = form.start_date.data, form.end_date.data
         
         # 3. 상태 검색
         if form.status.data != 'all':
-            query = query.filter(VacationRequest.status == form.status.data)
+            status = form.status.data
     else:
         # URL 파라미터로부터 필터 적용 (기존 호환성)
         year = request.args.get('year', current_year, type=int)
-        status = request.args.get('status', 'all')
+        status_arg = request.args.get('status', 'all')
         
         if year != current_year:
-            from sqlalchemy import func
-            query = query.filter(func.strftime('%Y', VacationRequest.start_date) == str(year))
+            date_from, date_to = year_range(year)
+            by_year = True
             form.year.data = year
             search_year = year
         
-        if status != 'all':
-            query = query.filter(VacationRequest.status == status)
-            form.status.data = status
+        if status_arg != 'all':
+            status = status_arg
+            form.status.data = status_arg
     
-    # 정렬 (최신순)
-    vacation_requests = query.order_by(VacationRequest.created_at.desc()).all()
+    def build_query(model):
+        query = model.query.filter_by(user_id=current_user.id)
+        if by_year:
+            query = query.filter(model.start_date.between(date_from, date_to))
+        else:
+            if date_from:
+                query = query.filter(model.start_date >= date_from)
+            if date_to:
+                query = query.filter(model.end_date <= date_to)
+        if status:
+            query = query.filter(model.status == status)
+        
+        # 정렬 (최신순)
+        return query.order_by(model.created_at.desc())
     
-    # 연도별 휴가 정보
-    vacation_days = VacationDays.query.filter_by(
-        user_id=current_user.id,
-        year=search_year
-    ).first()
+    # 검색 기간이 보관된 연도에 닿을 때만 보관 테이블도 조회
+    vacation_requests = query_vacations(build_query, date_from, date_to)
     
-    if not vacation_days:
-        vacation_days = VacationDays(
-            user_id=current_user.id,
-            year=search_year,
-            total_days=15,  # 기본값
-            used_days=0
-        )
-        db.session.add(vacation_days)
-        db.session.commit()
+    # 연도별 휴가 정보
+    vacation_days = get_vacation_days(current_user.id, search_year, current_user)
     
     return render_template(
         'employee/my_vacations_gov.html',
@@ -301,6 +294,7 @@ def cancel_vacation(request_id):
         return redirect(url_for('employee.my_vacations'))
     
     # 취소 처리
+    record_vacation_removed(vacation_request, current_user)
     db.session.delete(vacation_request)
     db.session.commit()
     
@@ -310,38 +304,39 @@ def cancel_vacation(request_id):
 
 def export_my_vacation_data(form):
     """개인 휴가 데이터 엑셀 다운로드"""
+    started = time.perf_counter()
     try:
-        # 쿼리 생성
-        query = VacationRequest.query.filter_by(user_id=current_user.id)
-        
-        # 검색 조건 적용 (엑셀 출력용)
+        # 1. 년도/월 검색 (우선순위 높음) 2. 기간 검색 (년도가 선택되지 않은 경우에만 적용)
+        by_year = hasattr(form, 'year') and form.year.data and form.year.data != 0
+        if by_year:
+            month = form.month.data if hasattr(form, 'month') and form.month.data else None
+            date_from, date_to = year_range(form.year.data, month)
+        else:
+            date_from = form.start_date.data if hasattr(form, 'start_date') else None
+            date_to = form.end_date.data if hasattr(form, 'end_date') else None
         
-        # 1. 년도/월 검색 (우선순위 높음)
-        if hasattr(form, 'year') and form.year.data and form.year.data != 0:
-            from sqlalchemy import func
-            query = query.filter(func.strftime('%Y', VacationRequest.start_date) == str(form.year.data))
+        def build_query(model):
+            # 쿼리 생성
+            query = model.query.filter_by(user_id=current_user.id)
             
-            # 월이 선택된 경우 해당 월만 검색
-            if hasattr(form, 'month') and form.month.data and form.month.data != 0:
-                month_str = f'{form.month.data:02d}'  # 01, 02, ..., 12 형식
-                query = query.filter(func.strftime('%m', VacationRequest.start_date) == month_str)
-        
-        # 2. 기간 검색 (년도가 선택되지 않은 경우에만 적용)
-        elif (hasattr(form, 'start_date') and form.start_date.data) or (hasattr(form, 'end_date') and form.end_date.data):
-            if hasattr(form, 'start_date') and form.start_date.data:
-                query = query.filter(VacationRequest.start_date >= form.start_date.data)
-            if hasattr(form, 'end_date') and form.end_date.data:
-                query = query.filter(VacationRequest.end_date <= form.end_date.data)
-        
-        # 3. 상태 검색
-        if hasattr(form, 'status') and form.status.data != 'all':
-            query = query.filter(VacationRequest.status == form.status.data)
-        
-        # 정렬
-        query = query.order_by(VacationRequest.created_at.desc())
+            # 검색 조건 적용 (엑셀 출력용)
+            if by_year:
+                query = query.filter(model.start_date.between(date_from, date_to))
+            else:
+                if date_from:
+                    query = query.filter(model.start_date >= date_from)
+                if date_to:
+                    query = query.filter(model.end_date <= date_to)
+            
+            # 3. 상태 검색
+            if hasattr(form, 'status') and form.status.data != 'all':
+                query = query.filter(model.status == form.status.data)
+            
+            # 정렬
+            return query.order_by(model.created_at.desc())
         
-        # 결과 가져오기
-        results = query.all()
+        # 결과 가져오기 (검색 기간이 보관된 연도에 닿을 때만 보관 테이블도 조회)
+        results = query_vacations(build_query, date_from, date_to)
         
         if not results:
             # 데이터가 없는 경우 빈 엑셀 파일 생성
@@ -375,6 +370,7 @@ def export_my_vacation_data(form):
         
         output.seek(0)
         excel_data = output.getvalue()
+        observe_export('my_vacations', len(results), started)
         
         # 응답 생성
         response = make_response(excel_data)
@@ -422,6 +418,39 @@ def calculate_vacation_days():
     return jsonify({'days': days})
 
 
+# 공휴일 비트마스크 조회 기간 제한 (연 단위)
+HOLIDAY_MASK_MAX_YEARS = 5
+
+@employee_bp.route('/holiday-mask')
+@login_required
+@conditional_page(lambda: [HOLIDAYS])
+def holiday_mask():
+    """공휴일 비트마스크 API (화면에서 휴가 일수를 서버 왕복 없이 계산하기 위한 데이터)
+
+    start부터 하루 1비트(하위 비트부터, 1 = 공휴일)로 채운 바이트열을 base64로 전달한다.
+    """
+    year = request.args.get('year', datetime.now().year, type=int)
+    years = min(max(request.args.get('years', 2, type=int), 1), HOLIDAY_MASK_MAX_YEARS)
+    if not 1900 <= year <= 9999 - years:
+        return jsonify({'error': '조회할 수 없는 연도입니다.'}), 400
+    
+    start = date(year, 1, 1)
+    end = date(year + years - 1, 12, 31)
+    total_days = (end - start).days + 1
+    
+    mask = bytearray((total_days + 7) // 8)
+    for holiday in holiday_dates(start, end):
+        offset = (holiday - start).days
+        mask[offset // 8] |= 1 << (offset % 8)
+    
+    return jsonify({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'days': total_days,
+        'mask': base64.b64encode(bytes(mask)).decode('ascii')
+    })
+
+
 @employee_bp.route('/request-certificate', methods=['GET', 'POST'])
 @login_required
 def request_certificate():
@@ -447,6 +476,7 @@ def request_certificate():
 
 @employee_bp.route('/my-certificates')
 @login_required
+@conditional_page(lambda: [user_scope(current_user.id)])
 def my_certificates():
     """내 재직증명서 신청 내역 페이지"""
     # 재직증명서 신청 내역 (최신순)
@@ -624,9 +654,9 @@ def create_barcode(data, width=400, height=100):
 
 
 def create_docx_certificate(certificate, current_user, company_info):
-    """워드 파일로 재직증명서 생성 - 이미지와 정확히 동일한 형식"""
-    company_name = company_info.name if company_info else '주식회사 에스에스전력'
-    ceo_name = company_info.ceo_name if company_info else '김세인'
+    """워드 파일로 재직증명서 생성 - 이미지와 정확히 동일한 형식 (company_info: get_company_settings() 스냅샷)"""
+    company_name = company_info.name
+    ceo_name = company_info.ceo_name
     
     today = datetime.now().date()
     today_str = f"{today.year}년 {today.month}월 {today.day}일"
@@ -798,7 +828,7 @@ def create_docx_certificate(certificate, current_user, company_info):
     ceo_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
     ceo_p.space_before = Pt(0)
     ceo_p.space_after = Pt(0)
-    ceo_run = ceo_p.add_run(f"대표이사 김세인")  # 이름 수정
+    ceo_run = ceo_p.add_run(f"대표이사 {ceo_name}")
     ceo_run.font.name = 'HY견고딕'
     ceo_run.font.size = Pt(15)  # 폰트 크기 15로 변경
     ceo_run.font.bold = True
@@ -856,7 +886,7 @@ def create_docx_certificate(certificate, current_user, company_info):
     guide_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
     guide_p.space_before = Pt(1)
     guide_p.space_after = Pt(0)
-    guide_run = guide_p.add_run(f"문서확인 사이트: {company_info.website if company_info and company_info.website else 'https://ss-electric.co.kr'}")
+    guide_run = guide_p.add_run(f"문서확인 사이트: {company_info.website or DEFAULT_COMPANY['website']}")
     guide_run.font.name = 'HY견고딕'
     guide_run.font.size = Pt(8)
     
@@ -884,14 +914,13 @@ def download_certificate(certificate_id):
         flash('아직 발급되지 않은 재직증명서입니다.', 'warning')
         return redirect(url_for('employee.my_certificates'))
     
-    # 회사 정보 가져오기
-    company_info = CompanyInfo.query.first()
-    company_name = company_info.name if company_info else '주식회사 에스에스전력'
-    ceo_name = company_info.ceo_name if company_info else '대표이사'
+    # 회사 정보 가져오기 (워커별 캐시)
+    company_info = get_company_settings()
     
     try:
         # 워드 문서 생성
-        buffer = create_docx_certificate(certificate, current_user, company_info)
+        with certificate_generation_seconds.time(channel='employee'):
+            buffer = create_docx_certificate(certificate, current_user, company_info)
         
         # 응답 생성
         response = make_response(buffer.getvalue())
@@ -0,0 +1,209 @@
+"""직원 검색 색인 (이름/아이디/부서/이메일)
+
+관리자 화면의 직원 검색은 User.name.contains()(앞에 %가 붙는 LIKE)로 매번 직원 테이블 전체를 읽었다.
+데이터베이스 종류에 맞는 부분 문자열 색인을 만들어 검색어가 들어간 직원을 색인으로 찾는다.
+
+- SQLite: FTS5 trigram 가상 테이블(user_search). users 테이블 트리거로 함께 갱신되므로
+  ORM을 거치지 않는 대량 INSERT/UPDATE에도 색인이 맞게 유지된다.
+- PostgreSQL: pg_trgm GIN 표현식 색인 (LIKE '%검색어%'가 색인을 사용)
+- 그 외/색인 생성 실패: 기존과 같은 LIKE 검색
+
+trigram 색인은 3글자 이상 검색어에만 쓰인다. 2글자 이하(예: 성씨, 두 글자 이름)는
+색인 테이블을 순차 조회하지만 색인 테이블은 검색 대상 컬럼만 담고 있어 직원 테이블보다 작다.
+"""
+
+from sqlalchemy import func, or_, select, text
+
+from app import db
+from models import User, Role
+
+# 색인 대상 컬럼
+SEARCH_COLUMNS = ('name', 'username', 'department', 'email')
+SEARCH_TABLE = 'user_search'
+
+# trigram 색인을 쓸 수 있는 최소 검색어 길이
+MIN_INDEXED_LENGTH = 3
+
+# 자동완성 결과 수
+TYPEAHEAD_LIMIT = 10
+MAX_TYPEAHEAD_LIMIT = 50
+
+_SQLITE_DDL = {
+    SEARCH_TABLE: f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5({', '.join(SEARCH_COLUMNS)}, tokenize='trigram')",
+    f'{SEARCH_TABLE}_ai': f"""CREATE TRIGGER {SEARCH_TABLE}_ai AFTER INSERT ON users BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, name, username, department, email)
+        VALUES (new.id, new.name, new.username, coalesce(new.department, ''), new.email);
+    END""",
+    f'{SEARCH_TABLE}_ad': f"""CREATE TRIGGER {SEARCH_TABLE}_ad AFTER DELETE ON users BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id;
+    END""",
+    f'{SEARCH_TABLE}_au': f"""CREATE TRIGGER {SEARCH_TABLE}_au AFTER UPDATE OF name, username, department, email ON users BEGIN
+        UPDATE {SEARCH_TABLE}
+        SET name = new.name, username = new.username, department = coalesce(new.department, ''), email = new.email
+        WHERE rowid = new.id;
+    END""",
+}
+
+# 검색 방식 ('fts5', 'pg_trgm', None=LIKE), ensure_search_index()에서 결정
+_backend = {'name': None}
+
+
+def _document(*columns):
+    """PostgreSQL 색인/검색에 공통으로 쓰는 소문자 문서 표현식 (색인 식에 쓸 수 있도록 || 연결만 사용)"""
+    document = None
+    for column in columns:
+        part = func.coalesce(getattr(User, column), '')
+        document = part if document is None else document + ' ' + part
+    return func.lower(document)
+
+
+_PG_INDEXES = {
+    'ix_users_search_trgm': SEARCH_COLUMNS,
+    'ix_users_name_trgm': ('name',),
+}
+
+
+def _ensure_sqlite(connection):
+    existing = set(connection.execute(
+        text("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+    ).scalars())
+    missing = [name for name in _SQLITE_DDL if name not in existing]
+    if not missing:
+        return False
+
+    # 트리거가 빠진 동안의 변경은 색인에 없으므로 무엇이든 새로 만들었으면 다시 채운다
+    for name in missing:
+        connection.execute(text(_SQLITE_DDL[name]))
+    rebuild_search_index(connection)
+    return True
+
+
+def _ensure_postgres(connection):
+    connection.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    created = False
+    for name, columns in _PG_INDEXES.items():
+        exists = connection.execute(text('SELECT to_regclass(:name)'), {'name': name}).scalar()
+        if exists:
+            continue
+        expression = _document(*columns).compile(
+            dialect=connection.dialect, compile_kwargs={'literal_binds': True}
+        )
+        connection.execute(text(f'CREATE INDEX {name} ON users USING gin (({expression}) gin_trgm_ops)'))
+        created = True
+    return created
+
+
+def ensure_search_index():
+    """검색 색인 생성 (이미 있으면 그대로 사용)
+
+    Returns:
+        bool: 새로 만들었는지 여부
+    """
+    dialect = db.engine.dialect.name
+    try:
+        with db.engine.begin() as connection:
+            if dialect == 'sqlite':
+                created = _ensure_sqlite(connection)
+                _backend['name'] = 'fts5'
+            elif dialect == 'postgresql':
+                created = _ensure_postgres(connection)
+                _backend['name'] = 'pg_trgm'
+            else:
+                _backend['name'] = None
+                created = False
+    except Exception as e:
+        _backend['name'] = None
+        print(f'⚠️ 직원 검색 색인을 만들지 못해 LIKE 검색을 사용합니다: {e}')
+        return False
+    return created
+
+
+def rebuild_search_index(connection=None):
+    """SQLite 검색 색인을 users 테이블 내용으로 다시 채움 (트리거 없이 변경된 경우 복구용)"""
+    conn = connection or db.session.connection()
+    conn.execute(text(f'DELETE FROM {SEARCH_TABLE}'))
+    conn.execute(text(
+        f"INSERT INTO {SEARCH_TABLE}(rowid, name, username, department, email) "
+        f"SELECT id, name, username, coalesce(department, ''), email FROM users"
+    ))
+
+
+def _like_pattern(query):
+    escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def matching_user_ids(query, columns=SEARCH_COLUMNS):
+    """검색어가 포함된 직원 ID 서브쿼리 (User.id.in_(...)에 사용)"""
+    query = query.strip()
+    backend = _backend['name']
+
+    if backend == 'fts5':
+        if len(query) >= MIN_INDEXED_LENGTH:
+            # 검색어 전체를 하나의 구문으로 (큰따옴표는 두 번 써서 이스케이프)
+            phrase = '"' + query.replace('"', '""') + '"'
+            if tuple(columns) != SEARCH_COLUMNS:
+                phrase = '{' + ' '.join(columns) + '} : ' + phrase
+            return select(text('rowid')).select_from(text(SEARCH_TABLE)).where(
+                text(f'{SEARCH_TABLE} MATCH :phrase').bindparams(phrase=phrase)
+            )
+        conditions = ' OR '.join(f'instr(lower({column}), :needle) > 0' for column in columns)
+        return select(text('rowid')).select_from(text(SEARCH_TABLE)).where(
+            text(f'({conditions})').bindparams(needle=query.lower())
+        )
+
+    if backend == 'pg_trgm':
+        return select(User.id).where(_document(*columns).like(_like_pattern(query.lower()), escape='\\'))
+
+    pattern = _like_pattern(query)
+    return select(User.id).where(or_(*(getattr(User, column).like(pattern, escape='\\') for column in columns)))
+
+
+def name_filter(query):
+    """이름 검색 조건 (User가 조인된 쿼리에 사용)"""
+    return User.id.in_(matching_user_ids(query, columns=('name',)))
+
+
+def search_employees(query, limit=TYPEAHEAD_LIMIT, role=Role.EMPLOYEE, offset=0):
+    """자동완성/직원 선택용 검색 (이름이 검색어로 시작하는 직원 우선, 검색어가 없으면 이름순 전체)
+
+    Returns:
+        list[dict]: [{'id', 'name', 'username', 'department', 'position'}]
+    """
+    query = (query or '').strip()
+    limit = max(1, min(limit, MAX_TYPEAHEAD_LIMIT))
+
+    criteria = []
+    order = [User.name, User.id]
+    if query:
+        criteria.append(User.id.in_(matching_user_ids(query)))
+        order.insert(0, db.case((User.name.startswith(query, autoescape=True), 0), else_=1))
+    if role:
+        criteria.append(User.role == role)
+
+    rows = db.session.query(
+        User.id, User.name, User.username, User.department, User.position
+    ).filter(*criteria).order_by(*order).offset(max(offset, 0)).limit(limit).all()
+
+    return [
+        {'id': user_id, 'name': name, 'username': username, 'department': department, 'position': position}
+        for user_id, name, username, department, position in rows
+    ]
+
+
+def lookup_employees(query, page=1, per_page=TYPEAHEAD_LIMIT, role=Role.EMPLOYEE):
+    """직원 선택 API 페이지 (다음 페이지 여부는 한 건 더 읽어서 판단, 전체 개수는 세지 않음)
+
+    Returns:
+        dict: query, page, per_page, has_next, results
+    """
+    page = max(page, 1)
+    per_page = max(1, min(per_page, MAX_TYPEAHEAD_LIMIT - 1))
+    rows = search_employees(query, per_page + 1, role, offset=(page - 1) * per_page)
+    return {
+        'query': query,
+        'page': page,
+        'per_page': per_page,
+        'has_next': len(rows) > per_page,
+        'results': rows[:per_page]
+    }
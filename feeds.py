@@ -0,0 +1,185 @@
+"""iCalendar(.ics) 구독 피드
+
+캘린더 앱은 로그인 세션 없이 주기적으로 피드를 가져가므로 URL에 서명된 토큰을 넣는다.
+토큰에는 발급받은 직원 id와 그 직원의 구독 비밀값(users.feed_secret)이 들어가며, 요청마다
+직원이 남아 있고 비밀값이 같은지(부서 피드는 아직 그 부서인지)를 확인한다. 직원이 URL을 재발급하거나
+퇴사/부서 이동하면 이전 URL은 더 이상 열리지 않는다 (삭제된 직원의 id가 재사용되어도 비밀값이 다르다).
+ETag는 data_versions 테이블의 범위별 버전으로만 계산하므로, 변경이 없는 폴링은
+휴가 신청 테이블을 조회하지 않고 304로 응답한다.
+"""
+
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timedelta
+
+from flask import Blueprint, abort, current_app, make_response, request, url_for
+from itsdangerous import BadSignature, URLSafeSerializer
+
+from app import db
+from models import User, VacationRequest, VacationStatus, Holiday
+from data_versions import HOLIDAYS, get_versions, user_scope, department_scope
+
+feeds_bp = Blueprint('feeds', __name__)
+
+# 피드에 포함할 과거 기간 (일)
+FEED_HISTORY_DAYS = 365
+
+
+def _serializer():
+    return URLSafeSerializer(current_app.secret_key, salt='ics-feed')
+
+
+def rotate_feed_secret(user):
+    """구독 비밀값 재발급 (이전에 발급한 개인/부서 URL 모두 무효, 커밋은 호출하는 쪽에서 수행)"""
+    user.feed_secret = secrets.token_urlsafe(16)
+
+
+def feed_url(kind, user):
+    """user에게 발급하는 구독 URL (kind: 'user' 또는 'department' - user의 현재 부서)"""
+    if not user.feed_secret:
+        rotate_feed_secret(user)
+        db.session.commit()
+    key = user.id if kind == 'user' else user.department
+    token = _serializer().dumps([kind, key, user.id, user.feed_secret])
+    return url_for('feeds.ics_feed', token=token, _external=True)
+
+
+def _feed_owner(kind, key, user_id, secret):
+    """토큰을 발급받은 직원 (토큰이 더 이상 유효하지 않으면 None)"""
+    user = db.session.get(User, user_id) if isinstance(user_id, int) else None
+    if user is None or not user.feed_secret or not isinstance(secret, str):
+        return None
+    if not hmac.compare_digest(user.feed_secret, secret):
+        return None
+    if kind == 'user' and key != user.id:
+        return None
+    if kind == 'department' and (not user.department or key != user.department):
+        return None
+    return user
+
+
+def _feed_scope(kind, key):
+    if kind == 'user':
+        return user_scope(key)
+    if kind == 'department':
+        return department_scope(key)
+    return None
+
+
+def _escape(text):
+    """iCalendar TEXT 값 이스케이프"""
+    return (text or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def _fold(line):
+    """75 옥텟 단위 줄 접기 (RFC 5545)"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+
+    parts = []
+    current = ''
+    limit = 75
+    for char in line:
+        if len((current + char).encode('utf-8')) > limit:
+            parts.append(current)
+            current = char
+            limit = 74  # 이어지는 줄은 앞에 공백 한 칸이 붙는다
+        else:
+            current += char
+    parts.append(current)
+    return '\r\n '.join(parts)
+
+
+def _event(uid, start_date, end_date, summary, stamp, description=None):
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{uid}',
+        f'DTSTAMP:{stamp}',
+        f'DTSTART;VALUE=DATE:{start_date.strftime("%Y%m%d")}',
+        f'DTEND;VALUE=DATE:{(end_date + timedelta(days=1)).strftime("%Y%m%d")}',
+        f'SUMMARY:{_escape(summary)}',
+        'TRANSP:TRANSPARENT',
+    ]
+    if description:
+        lines.append(f'DESCRIPTION:{_escape(description)}')
+    lines.append('END:VEVENT')
+    return lines
+
+
+def build_calendar(title, vacations, holidays, host):
+    """휴가/공휴일 목록으로 iCalendar 문서 생성"""
+    stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//SS Power//Vacation Management//KO',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{_escape(title)}',
+        'X-WR-TIMEZONE:Asia/Seoul',
+    ]
+
+    for vacation, name in vacations:
+        lines.extend(_event(
+            f'vacation-{vacation.id}@{host}',
+            vacation.start_date,
+            vacation.end_date,
+            f'{name} {vacation.type}' if name else vacation.type,
+            stamp,
+            f'{vacation.days}일'
+        ))
+
+    for holiday in holidays:
+        lines.extend(_event(f'holiday-{holiday.id}@{host}', holiday.date, holiday.date, holiday.name, stamp))
+
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
+
+
+@feeds_bp.route('/feeds/<token>.ics')
+def ics_feed(token):
+    """직원별/부서별 휴가 및 공휴일 구독 피드"""
+    try:
+        kind, key, user_id, secret = _serializer().loads(token)
+    except (BadSignature, ValueError, TypeError):
+        abort(404)
+
+    scope = _feed_scope(kind, key)
+    owner = _feed_owner(kind, key, user_id, secret) if scope else None
+    if owner is None:
+        abort(404)
+
+    # 버전 테이블만 조회해서 ETag 계산 (피드 기간이 날짜 기준이므로 오늘 날짜 포함)
+    today = datetime.now().date()
+    versions = get_versions(scope, HOLIDAYS)
+    etag = hashlib.sha1(
+        f'{scope}:{versions[scope]}:{versions[HOLIDAYS]}:{today}'.encode('utf-8')
+    ).hexdigest()
+
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+
+    since = today - timedelta(days=FEED_HISTORY_DAYS)
+    query = db.session.query(VacationRequest, User.name)\
+        .join(User, User.id == VacationRequest.user_id)\
+        .filter(VacationRequest.status == VacationStatus.APPROVED, VacationRequest.end_date >= since)
+
+    if kind == 'user':
+        title = f'{owner.name} 휴가'
+        query = query.filter(VacationRequest.user_id == owner.id)
+    else:
+        title = f'{key} 휴가'
+        query = query.filter(User.department == key)
+
+    vacations = query.order_by(VacationRequest.start_date).all()
+    holidays = Holiday.query.filter(Holiday.date >= since).order_by(Holiday.date).all()
+
+    response = make_response(build_calendar(title, vacations, holidays, request.host))
+    response.headers['Content-Type'] = 'text/calendar; charset=utf-8'
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.set_etag(etag)
+    return response
@@ -4,6 +4,9 @@ from wtforms import StringField, PasswordField, SubmitField, SelectField, TextAr
 from wtforms.validators import DataRequired, Email, EqualTo, Length, NumberRange, ValidationError
 from datetime import date, datetime
 
+from app import db
+from models import User, Role
+
 class LoginForm(FlaskForm):
     """로그인 폼"""
     username = StringField('아이디', validators=[DataRequired('아이디를 입력하세요.')])
@@ -38,9 +41,52 @@ class ResetPasswordForm(FlaskForm):
     submit = SubmitField('비밀번호 변경')
 
 
+class EmployeeField(SelectField):
+    """직원 선택 필드
+
+    선택지로 직원 전체를 채우지 않고, 제출된 직원 ID 하나만 기본키로 조회해서 검증한다.
+    화면에는 선택된 직원만 선택지로 표시되며 검색은 직원 자동완성 API(employee_picker.js)로 한다.
+    검증을 통과하면 조회한 직원 객체를 field.employee로 쓸 수 있다.
+    """
+
+    def __init__(self, label=None, validators=None, role=Role.EMPLOYEE, **kwargs):
+        kwargs.setdefault('choices', [])
+        super().__init__(label, validators, coerce=int, **kwargs)
+        self.role = role
+        self._employee = None
+
+    @property
+    def employee(self):
+        if self.data is None:
+            return None
+        if self._employee is None or self._employee.id != self.data:
+            self._employee = db.session.get(User, self.data)
+        return self._employee
+
+    def process_formdata(self, valuelist):
+        # 빈 값/숫자가 아닌 값은 미선택으로 처리 (DataRequired 메시지로 안내)
+        try:
+            self.data = int(valuelist[0]) if valuelist and valuelist[0] else None
+        except ValueError:
+            self.data = None
+
+    def iter_choices(self):
+        yield ('', '직원을 검색하세요', self.data is None, {})
+        employee = self.employee
+        if employee is not None:
+            yield (employee.id, f"{employee.name} ({employee.department or '미지정'})", True, {})
+
+    def pre_validate(self, form):
+        if self.data is None:
+            return
+        employee = self.employee
+        if employee is None or (self.role and employee.role != self.role):
+            raise ValidationError('존재하지 않는 직원입니다.')
+
+
 class AdminVacationForm(FlaskForm):
     """관리자 휴가 등록 폼"""
-    user_id = SelectField('직원 선택', validators=[DataRequired('직원을 선택하세요.')], coerce=int)
+    user_id = EmployeeField('직원 선택', validators=[DataRequired('직원을 선택하세요.')])
     start_date = DateField('시작일', validators=[DataRequired('시작일을 선택하세요.')], format='%Y-%m-%d')
     end_date = DateField('종료일', validators=[DataRequired('종료일을 선택하세요.')], format='%Y-%m-%d')
     type = SelectField('휴가 유형', choices=[
@@ -61,6 +107,46 @@ class AdminVacationForm(FlaskForm):
         if hasattr(self, 'start_date') and self.start_date.data and field.data < self.start_date.data:
             raise ValidationError('종료일은 시작일보다 늦어야 합니다.')
 
+class BulkVacationForm(FlaskForm):
+    """전사 일괄 휴가 등록 폼"""
+    start_date = DateField('시작일', validators=[DataRequired('시작일을 선택하세요.')], format='%Y-%m-%d')
+    end_date = DateField('종료일', validators=[DataRequired('종료일을 선택하세요.')], format='%Y-%m-%d')
+    type = SelectField('휴가 유형', choices=[
+        ('연차', '연차'),
+        ('반차(오전)', '반차(오전)'),
+        ('반차(오후)', '반차(오후)'),
+        ('특별휴가', '특별휴가')
+    ], validators=[DataRequired('휴가 유형을 선택하세요.')])
+    reason = StringField('휴가 사유', validators=[DataRequired('휴가 사유를 입력하세요.')],
+                         render_kw={"placeholder": "예: 하계 휴무, 창립기념일"})
+    department = SelectField('대상 부서', choices=[('all', '전체')])
+    position = SelectField('대상 직급', choices=[
+        ('all', '전체'),
+        ('사원', '사원'),
+        ('주임', '주임'),
+        ('대리', '대리'),
+        ('과장', '과장'),
+        ('차장', '차장'),
+        ('부장', '부장'),
+        ('이사', '이사')
+    ])
+    dry_run = BooleanField('미리보기 (등록하지 않고 대상 및 제외 인원만 확인)')
+    submit = SubmitField('일괄 등록')
+
+    def __init__(self, *args, **kwargs):
+        super(BulkVacationForm, self).__init__(*args, **kwargs)
+        from department_stats import department_choices
+        self.department.choices = department_choices()
+
+    def validate_start_date(self, field):
+        if field.data and field.data < date.today():
+            raise ValidationError('시작일은 오늘 이후여야 합니다.')
+
+    def validate_end_date(self, field):
+        if hasattr(self, 'start_date') and self.start_date.data and field.data < self.start_date.data:
+            raise ValidationError('종료일은 시작일보다 늦어야 합니다.')
+
+
 class VacationSearchForm(FlaskForm):
     """휴가 검색 폼 (기간 검색용)"""
     employee_name = StringField('직원명', render_kw={"placeholder": "직원명으로 검색 (선택사항)"})
@@ -77,19 +163,7 @@ class VacationSearchForm(FlaskForm):
         ('승인됨', '승인됨'),
         ('반려됨', '반려됨')
     ])
-    department = SelectField('부서', choices=[
-        ('all', '전체'),
-        ('공사팀', '공사팀'),
-        ('공무부', '공무부'),
-        ('경리부', '경리부'),
-        ('인사팀', '인사팀'),
-        ('총무팀', '총무팀'),
-        ('영업팀', '영업팀'),
-        ('안전팀', '안전팀'),
-        ('품질팀', '품질팀'),
-        ('기술팀', '기술팀'),
-        ('관리팀', '관리팀')
-    ])
+    department = SelectField('부서', choices=[('all', '전체')])
     start_date = DateField('시작일', format='%Y-%m-%d', render_kw={"placeholder": "YYYY-MM-DD (선택사항)"})
     end_date = DateField('종료일', format='%Y-%m-%d', render_kw={"placeholder": "YYYY-MM-DD (선택사항)"})
     submit = SubmitField('검색')
@@ -104,6 +178,10 @@ class VacationSearchForm(FlaskForm):
             year_choices.append((year, f'{year}년'))
         self.year.choices = year_choices
 
+        # 부서 선택지는 부서 기준 정보 테이블에서 조회
+        from department_stats import department_choices
+        self.department.choices = department_choices()
+
 
 class RegisterForm(FlaskForm):
     """회원가입 폼"""
@@ -183,6 +261,16 @@ class VacationApprovalForm(FlaskForm):
     submit = SubmitField('처리')
 
 
+class BulkVacationDecisionForm(FlaskForm):
+    """휴가 신청 일괄 승인/반려 폼 (선택한 신청 ID는 request_ids 체크박스로 전달)"""
+    status = SelectField('처리', choices=[
+        ('승인됨', '승인'),
+        ('반려됨', '반려')
+    ], validators=[DataRequired('처리 방법을 선택하세요.')])
+    comments = StringField('코멘트', render_kw={"placeholder": "선택한 신청 전체에 남길 코멘트"})
+    submit = SubmitField('선택 항목 처리')
+
+
 class EmployeeVacationDaysForm(FlaskForm):
     """직원 연간 휴가일수 설정 폼"""
     user_id = HiddenField('사용자 ID')
@@ -223,7 +311,7 @@ class CertificateApprovalForm(FlaskForm):
 
 class AdminCertificateIssueForm(FlaskForm):
     """관리자 직접 증명서 발행 폼"""
-    user_id = SelectField('직원 선택', coerce=int, validators=[DataRequired('직원을 선택하세요.')])
+    user_id = EmployeeField('직원 선택', validators=[DataRequired('직원을 선택하세요.')])
     purpose = StringField('사용 목적', validators=[
         DataRequired('사용 목적을 입력하세요.'), 
         Length(max=200, message='사용 목적은 200자를 초과할 수 없습니다.')
@@ -241,7 +329,8 @@ class CompanyInfoForm(FlaskForm):
     phone = StringField('전화번호')
     fax = StringField('팩스번호')
     website = StringField('웹사이트')
-    stamp_image = TextAreaField('직인 이미지')
+    stamp_image = TextAreaField('직인 이미지')  # 새로 등록할 때만 입력 (data:image/...;base64,...)
+    remove_stamp = BooleanField('등록된 직인 삭제')
     submit = SubmitField('저장')
 
 
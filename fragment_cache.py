@@ -0,0 +1,184 @@
+"""템플릿 조각 캐시 ({% cache %} 태그)
+
+관리자 목록 화면처럼 행이 많은 표는 데이터가 바뀌지 않았는데도 요청마다 행 HTML을 다시 렌더링한다.
+키에 데이터 버전(data_versions)을 넣어 렌더링 결과를 저장해두고, 버전이 같으면 저장된 HTML을 그대로 쓴다.
+
+    {% cache 'vacation_row', request.id, request.is_archived, user_versions[request.user_id] %}
+        <tr>...</tr>
+    {% endcache %}
+
+첫 번째 인자는 조각 이름(통계 구분용), 나머지는 키 구성 값이다. 데이터가 바뀌면 버전이 달라져 새 키로
+렌더링되고, 이전 키의 항목은 LRU에서 자연히 밀려난다.
+
+기본 저장소는 프로세스별 LRU이며, FRAGMENT_CACHE_REDIS_URL을 설정하고 redis 패키지가 설치되어 있으면
+여러 워커 프로세스가 렌더링 결과를 함께 쓰도록 Redis를 공유 저장소로 사용한다.
+조각 안의 CSRF 토큰은 저장할 때 자리표시자로 바꾸고 꺼낼 때 현재 요청의 토큰으로 채운다.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from flask import current_app, g
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+# 프로세스별 LRU 최대 항목 수
+FRAGMENT_CACHE_SIZE = int(os.environ.get('FRAGMENT_CACHE_SIZE', '5000'))
+
+# 공유 저장소 (선택)
+FRAGMENT_CACHE_REDIS_URL = os.environ.get('FRAGMENT_CACHE_REDIS_URL')
+FRAGMENT_CACHE_TTL = int(os.environ.get('FRAGMENT_CACHE_TTL', '86400'))  # 초
+_SHARED_PREFIX = 'fragment:'
+
+_CSRF_PLACEHOLDER = '\x00csrf_token\x00'
+
+
+class FragmentCache:
+    """렌더링된 HTML 조각 저장소 (프로세스 LRU + 선택적 공유 저장소)"""
+
+    def __init__(self, max_entries=FRAGMENT_CACHE_SIZE, shared=None):
+        self.max_entries = max_entries
+        self.shared = shared
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _count(self, name, field):
+        with self._lock:
+            stats = self._stats.setdefault(name, {'hits': 0, 'shared_hits': 0, 'misses': 0})
+            stats[field] += 1
+
+    def _local_get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def _local_set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _shared_get(self, key):
+        try:
+            value = self.shared.get(_SHARED_PREFIX + key)
+        except Exception as e:
+            current_app.logger.warning(f'조각 캐시 공유 저장소 조회 실패: {e}')
+            return None
+        return value.decode('utf-8') if isinstance(value, bytes) else value
+
+    def _shared_set(self, key, value):
+        try:
+            self.shared.setex(_SHARED_PREFIX + key, FRAGMENT_CACHE_TTL, value)
+        except Exception as e:
+            current_app.logger.warning(f'조각 캐시 공유 저장소 저장 실패: {e}')
+
+    def get_or_render(self, name, parts, render):
+        """키에 해당하는 조각을 돌려주고, 없으면 render()로 만들어 저장"""
+        key = hashlib.sha1(repr((name, tuple(parts))).encode('utf-8')).hexdigest()
+
+        value = self._local_get(key)
+        if value is not None:
+            self._count(name, 'hits')
+            return value
+
+        if self.shared is not None:
+            value = self._shared_get(key)
+            if value is not None:
+                self._count(name, 'shared_hits')
+                self._local_set(key, value)
+                return value
+
+        self._count(name, 'misses')
+        value = render()
+        self._local_set(key, value)
+        if self.shared is not None:
+            self._shared_set(key, value)
+        return value
+
+    def clear(self):
+        """프로세스 LRU와 통계 초기화 (공유 저장소 항목은 TTL로 만료)"""
+        with self._lock:
+            self._entries.clear()
+            self._stats = {}
+
+    def stats(self):
+        """조각별/전체 적중 통계"""
+        with self._lock:
+            snapshot = {name: dict(counts) for name, counts in self._stats.items()}
+            entries = len(self._entries)
+
+        fragments = {}
+        total = {'hits': 0, 'shared_hits': 0, 'misses': 0}
+        for name, counts in sorted(snapshot.items()):
+            lookups = sum(counts.values())
+            fragments[name] = dict(counts, hit_rate=round((counts['hits'] + counts['shared_hits']) / lookups, 4))
+            for field in total:
+                total[field] += counts[field]
+
+        lookups = sum(total.values())
+        return {
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'shared': self.shared is not None,
+            **total,
+            'hit_rate': round((total['hits'] + total['shared_hits']) / lookups, 4) if lookups else 0.0,
+            'fragments': fragments
+        }
+
+
+def _connect_shared():
+    if not FRAGMENT_CACHE_REDIS_URL:
+        return None
+    try:
+        import redis
+    except ImportError:
+        print('⚠️ redis 패키지가 없어 조각 캐시는 프로세스 메모리만 사용합니다 (pip install redis)')
+        return None
+    return redis.Redis.from_url(FRAGMENT_CACHE_REDIS_URL, socket_timeout=0.5)
+
+
+fragment_cache = FragmentCache(shared=_connect_shared())
+
+
+def _csrf_token_in_use():
+    # 이 요청에서 이미 만든 CSRF 토큰 (없으면 None, 새로 만들지 않는다)
+    field_name = current_app.config.get('WTF_CSRF_FIELD_NAME', 'csrf_token')
+    return g.get(field_name)
+
+
+class FragmentCacheExtension(Extension):
+    """{% cache name, key... %} ... {% endcache %} 태그"""
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(['name:endcache'], drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('_cache_support', [nodes.List(args)]), [], [], body
+        ).set_lineno(lineno)
+
+    def _cache_support(self, args, caller):
+        name, parts = args[0], args[1:]
+
+        def render():
+            html = str(caller())
+            token = _csrf_token_in_use()
+            if token:
+                html = html.replace(token, _CSRF_PLACEHOLDER)
+            return html
+
+        html = fragment_cache.get_or_render(name, parts, render)
+        if _CSRF_PLACEHOLDER in html:
+            from flask_wtf.csrf import generate_csrf
+            html = html.replace(_CSRF_PLACEHOLDER, generate_csrf())
+        return Markup(html)
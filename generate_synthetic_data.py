@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""부하 테스트용 대량 데이터 생성 스크립트
+
+N명의 직원과 M년치 휴가 신청/연차/재직증명서/공휴일 데이터를 executemany 일괄 INSERT로 생성한다.
+같은 seed면 같은 데이터가 만들어지므로 성능 측정 결과를 서로 비교할 수 있다.
+
+운영 DB를 덮어쓰지 않도록 DATABASE_URL로 임시 디렉터리의 SQLite 파일을 지정해서 실행한다.
+그 밖의 DB(PostgreSQL 등)는 --force를 지정해야 하고, 운영 DB는 --force로도 실행하지 않는다.
+앱을 불러오면 그 DB에 스키마 보정/초기 데이터 작업이 실행되므로, 대상 DB 확인은 앱을 불러오기 전에 한다
+(DATABASE_URL이 없으면 운영 SQLite 파일이 대상이 되므로 거부).
+    DATABASE_URL=sqlite:////tmp/bench.db python generate_synthetic_data.py --users 800 --years 3
+    DATABASE_URL=sqlite:////tmp/bench.db python generate_synthetic_data.py --users 800 --years 3 --reset
+
+생성된 직원 계정: bench_00001 ~ (비밀번호: bench1234)
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select
+from werkzeug.security import generate_password_hash
+
+# Flask 앱 컨텍스트 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from bench_database import DEFAULT_DATABASE_PATH, check_bench_database
+
+
+def _database_refusal(argv=None):
+    """환경변수의 대상 DB 확인 (앱을 불러오기 전에 호출, --force만 먼저 읽는다)"""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--force', action='store_true')
+    force = parser.parse_known_args(argv)[0].force
+    url = os.environ.get('DATABASE_URL') or f'sqlite:///{DEFAULT_DATABASE_PATH}'
+    return check_bench_database(url.replace('postgres://', 'postgresql://', 1), force=force)
+
+
+if __name__ == '__main__':
+    _refusal = _database_refusal()
+    if _refusal:
+        print(f'❌ {_refusal}')
+        sys.exit(1)
+
+from app import app, db
+from models import User, Role, VacationDays, VacationRequest, VacationRequestArchive, VacationStatus, EmploymentCertificate, CertificateStatus, Holiday
+from holidays import add_korean_holidays
+from leave_policy import annual_entitlement
+from department_stats import DEFAULT_DEPARTMENTS, NON_DEDUCTIBLE_TYPES, rebuild_department_stats
+from data_versions import VACATIONS, HOLIDAYS, bump_version
+
+# 생성 계정 규칙
+BENCH_PREFIX = 'bench_'
+BENCH_PASSWORD = 'bench1234'
+
+# 한 번에 INSERT할 행 수
+CHUNK_SIZE = 1000
+
+POSITIONS = ['사원', '사원', '사원', '주임', '주임', '대리', '대리', '과장', '차장', '부장']
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN_NAMES = ['민준', '서연', '도윤', '지우', '하준', '서윤', '시우', '지민', '주원', '하은',
+               '지호', '수아', '준서', '지유', '건우', '채원', '현우', '다은', '우진', '예린']
+PURPOSES = ['은행 제출용', '관공서 제출용', '비자 신청용', '대출 신청용', '개인 보관용']
+
+# 휴가 유형별 비율
+VACATION_TYPES = ['연차', '반차(오전)', '반차(오후)', '특별휴가']
+VACATION_TYPE_WEIGHTS = [60, 15, 15, 10]
+
+
+def bench_username(index):
+    return f'{BENCH_PREFIX}{index:05d}'
+
+
+def _bulk_insert(model, rows):
+    """executemany 일괄 INSERT (CHUNK_SIZE 단위)"""
+    for i in range(0, len(rows), CHUNK_SIZE):
+        db.session.execute(insert(model), rows[i:i + CHUNK_SIZE])
+
+
+def _business_days(start_date, end_date, holiday_dates):
+    """주말/공휴일 제외 근무일 수 (대량 생성용 로컬 계산)"""
+    count = 0
+    current = start_date
+    while current <= end_date:
+        if current.weekday() < 5 and current not in holiday_dates:
+            count += 1
+        current += timedelta(days=1)
+    return count
+
+
+def _next_business_day(day, holiday_dates):
+    while day.weekday() >= 5 or day in holiday_dates:
+        day += timedelta(days=1)
+    return day
+
+
+def delete_bench_data():
+    """이전에 생성한 부하 테스트 데이터 삭제"""
+    bench_ids = select(User.id).where(User.username.like(f'{BENCH_PREFIX}%'))
+    for model in (VacationRequest, VacationRequestArchive, VacationDays, EmploymentCertificate):
+        db.session.execute(delete(model).where(model.user_id.in_(bench_ids)))
+    result = db.session.execute(delete(User).where(User.username.like(f'{BENCH_PREFIX}%')))
+    return result.rowcount
+
+
+def _generate_requests(rng, user_id, year, requests_per_year, holiday_dates, approver_id, today):
+    """직원 한 명의 한 해 휴가 신청 (기간이 겹치지 않도록 날짜순 생성)"""
+    count = rng.randint(max(1, requests_per_year // 2), requests_per_year * 3 // 2)
+    starts = sorted(rng.sample(range(0, 360), count))
+
+    rows = []
+    cursor = date(year, 1, 1)
+    for offset in starts:
+        start_date = _next_business_day(max(cursor, date(year, 1, 1) + timedelta(days=offset)), holiday_dates)
+        if start_date.year != year:
+            break
+
+        vacation_type = rng.choices(VACATION_TYPES, VACATION_TYPE_WEIGHTS)[0]
+        if vacation_type.startswith('반차'):
+            end_date = start_date
+            days = 0.5
+        else:
+            end_date = start_date
+            for _ in range(rng.randint(0, 2)):
+                end_date = _next_business_day(end_date + timedelta(days=1), holiday_dates)
+            if end_date.year != year:
+                end_date = start_date
+            days = float(_business_days(start_date, end_date, holiday_dates))
+
+        if start_date > today:
+            status = rng.choice([VacationStatus.PENDING, VacationStatus.APPROVED])
+        else:
+            status = rng.choices(
+                [VacationStatus.APPROVED, VacationStatus.REJECTED, VacationStatus.PENDING], [85, 10, 5]
+            )[0]
+
+        created_at = datetime.combine(start_date - timedelta(days=rng.randint(3, 30)), datetime.min.time())
+        rows.append({
+            'user_id': user_id,
+            'start_date': start_date,
+            'end_date': end_date,
+            'days': days,
+            'reason': '개인 사유',
+            'status': status,
+            'type': vacation_type,
+            'approved_by': approver_id if status != VacationStatus.PENDING else None,
+            'approval_date': created_at + timedelta(days=1) if status != VacationStatus.PENDING else None,
+            'created_at': created_at
+        })
+        cursor = end_date + timedelta(days=1)
+
+    return rows
+
+
+def generate(users, years, seed=42, requests_per_year=8, certificates_per_user=2, reset=False):
+    """부하 테스트 데이터 생성 (생성 건수 dict 반환)"""
+    rng = random.Random(seed)
+    today = date.today()
+    year_list = list(range(today.year - years + 1, today.year + 1))
+
+    if reset:
+        delete_bench_data()
+
+    # 공휴일 (생성 연도 + 다음 연도)
+    for year in year_list + [today.year + 1]:
+        add_korean_holidays(year)
+    holiday_dates = set(db.session.execute(select(Holiday.date)).scalars())
+
+    admin = User.query.filter_by(role=Role.ADMIN).first()
+    approver_id = admin.id if admin else None
+
+    # 직원 (비밀번호 해시는 한 번만 계산해서 재사용)
+    existing = User.query.filter(User.username.like(f'{BENCH_PREFIX}%')).count()
+    last_user_id = db.session.query(func.max(User.id)).scalar() or 0
+    password_hash = generate_password_hash(BENCH_PASSWORD, method='pbkdf2:sha256')
+    user_rows = []
+    for index in range(existing + 1, existing + users + 1):
+        hire_date = date(rng.randint(2000, year_list[0]), rng.randint(1, 12), rng.randint(1, 28))
+        user_rows.append({
+            'username': bench_username(index),
+            'email': f'{bench_username(index)}@bench.local',
+            'password_hash': password_hash,
+            'name': rng.choice(SURNAMES) + rng.choice(GIVEN_NAMES),
+            'resident_id_first': f'{rng.randint(70, 99)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}',
+            'resident_id_last_digit': rng.choice('12'),
+            'role': Role.EMPLOYEE,
+            'department': rng.choice(DEFAULT_DEPARTMENTS),
+            'position': rng.choice(POSITIONS),
+            'hire_date': hire_date,
+            'created_at': datetime.combine(hire_date, datetime.min.time())
+        })
+    _bulk_insert(User, user_rows)
+
+    created_users = db.session.execute(
+        select(User.id, User.hire_date)
+        .where(User.id > last_user_id, User.username.like(f'{BENCH_PREFIX}%'))
+        .order_by(User.id)
+    ).all()
+
+    # 휴가 신청 / 연차 / 재직증명서
+    request_rows = []
+    days_rows = []
+    certificate_rows = []
+    for user_id, hire_date in created_users:
+        for year in year_list:
+            rows = _generate_requests(rng, user_id, year, requests_per_year, holiday_dates, approver_id, today)
+            request_rows.extend(rows)
+            used = sum(
+                row['days'] for row in rows
+                if row['status'] == VacationStatus.APPROVED and row['type'] not in NON_DEDUCTIBLE_TYPES
+            )
+            days_rows.append({
+                'user_id': user_id,
+                'year': year,
+                'total_days': annual_entitlement(hire_date, year),
+                'used_days': used
+            })
+
+        for _ in range(rng.randint(0, certificates_per_user * 2)):
+            requested = today - timedelta(days=rng.randint(0, 365 * years))
+            issued = rng.random() < 0.85
+            certificate_rows.append({
+                'user_id': user_id,
+                'purpose': rng.choice(PURPOSES),
+                'status': CertificateStatus.ISSUED if issued else CertificateStatus.PENDING,
+                'issued_date': requested + timedelta(days=1) if issued else None,
+                'approved_by': approver_id if issued else None,
+                'approval_date': datetime.combine(requested + timedelta(days=1), datetime.min.time()) if issued else None,
+                'created_at': datetime.combine(requested, datetime.min.time())
+            })
+
+    _bulk_insert(VacationRequest, request_rows)
+    _bulk_insert(VacationDays, days_rows)
+    _bulk_insert(EmploymentCertificate, certificate_rows)
+
+    # 집계/버전 반영 (세션을 거치지 않은 변경이므로 직접 호출)
+    rebuild_department_stats()
+    bump_version(VACATIONS, HOLIDAYS)
+    db.session.commit()
+
+    return {
+        'users': len(user_rows),
+        'vacation_requests': len(request_rows),
+        'vacation_days': len(days_rows),
+        'certificates': len(certificate_rows),
+        'holidays': len(holiday_dates)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='부하 테스트용 대량 데이터 생성')
+    parser.add_argument('--users', type=int, default=800, help='생성할 직원 수 (기본값: 800)')
+    parser.add_argument('--years', type=int, default=3, help='휴가 이력 연수 (기본값: 3)')
+    parser.add_argument('--requests-per-year', type=int, default=8, help='직원별 연평균 휴가 신청 수 (기본값: 8)')
+    parser.add_argument('--certificates-per-user', type=int, default=2, help='직원별 평균 재직증명서 수 (기본값: 2)')
+    parser.add_argument('--seed', type=int, default=42, help='난수 seed (기본값: 42)')
+    parser.add_argument('--reset', action='store_true', help='기존 bench_ 데이터를 삭제하고 다시 생성')
+    parser.add_argument('--force', action='store_true',
+                        help='임시 디렉터리의 SQLite 파일이 아닌 DB에도 생성 허용 (운영 DB는 허용하지 않음)')
+    args = parser.parse_args(argv)
+
+    # PostgreSQL 연결 실패 시 앱이 기본 SQLite 파일로 전환했을 수 있으므로 실제 사용 중인 DB도 확인
+    refusal = check_bench_database(app.config['SQLALCHEMY_DATABASE_URI'], force=args.force)
+    if refusal:
+        print(f'❌ {refusal}')
+        return 1
+
+    started = time.perf_counter()
+    with app.app_context():
+        try:
+            counts = generate(
+                args.users, args.years, seed=args.seed,
+                requests_per_year=args.requests_per_year,
+                certificates_per_user=args.certificates_per_user,
+                reset=args.reset
+            )
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ 데이터 생성 중 오류: {e}')
+            return 1
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ 직원 {counts['users']}명, 휴가 신청 {counts['vacation_requests']}건, "
+          f"연차 {counts['vacation_days']}건, 재직증명서 {counts['certificates']}건 생성 ({elapsed:.1f}초)")
+    print(f'🔑 로그인: {bench_username(1)} / {BENCH_PASSWORD}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
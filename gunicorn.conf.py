@@ -0,0 +1,101 @@
+"""Gunicorn 설정 (start.sh, render.yaml에서 --config로 사용)
+
+GUNICORN_PROFILE로 워커 방식을 고른다.
+- gthread (기본값): 워커당 GUNICORN_THREADS개 스레드. DB 대기 중에도 같은 워커의 다른 요청을 처리한다.
+- gevent: 워커당 GUNICORN_WORKER_CONNECTIONS개 greenlet. gevent가 없으면 gthread로 실행한다.
+  PostgreSQL 사용 시 psycogreen이 있어야 DB 대기 중 다른 요청으로 전환된다.
+- sync: 워커당 요청 하나 (이전 방식)
+
+워커의 업무/응답 시간 지표는 워커별 파일로 합산한다(METRICS_MULTIPROCESS=1, 앱을 불러오기 전에 설정).
+max_requests로 재시작된 워커의 파일은 마스터가 child_exit에서 누적 파일로 합치고 삭제한다.
+
+앱은 마스터에서 한 번만 불러오고(preload, 스키마 점검/초기 데이터 작업을 한 번만 수행) 워커를 포크한다.
+마스터가 불러오는 동안 연 DB 연결이 워커 사이에 공유되지 않도록 포크 직후 각 워커에서 엔진 연결 풀을 버린다
+(gevent는 몽키패치 이후에 새 풀이 만들어지도록 워커 초기화가 끝난 뒤 버린다).
+"""
+
+import importlib.util
+import os
+import sys
+
+PROFILES = ('sync', 'gthread', 'gevent')
+
+# preload로 앱(metrics_registry)을 불러오기 전에 설정해야 하므로 모듈 수준에서 지정
+os.environ.setdefault('METRICS_MULTIPROCESS', '1')
+
+profile = os.environ.get('GUNICORN_PROFILE', 'gthread')
+if profile not in PROFILES:
+    print(f"⚠️ 알 수 없는 GUNICORN_PROFILE '{profile}', gthread로 실행합니다.")
+    profile = 'gthread'
+if profile == 'gevent' and importlib.util.find_spec('gevent') is None:
+    print('⚠️ gevent가 설치되어 있지 않아 gthread로 실행합니다. (pip install gevent psycogreen)')
+    profile = 'gthread'
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+worker_class = profile
+if profile == 'gthread':
+    threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+elif profile == 'gevent':
+    worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '100'))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '2'))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = 50
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+accesslog = '-'
+errorlog = '-'
+
+# 컨테이너의 /tmp가 디스크인 경우 워커 heartbeat 파일 쓰기가 느려지지 않도록 메모리 파일시스템 사용
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+
+def _dispose_engines(worker):
+    """마스터에서 만든 연결 풀을 버림 (부모가 연 연결은 닫지 않고 참조만 정리)"""
+    module = sys.modules.get('app')
+    if module is None:
+        # preload 없이 워커에서 앱을 불러오는 경우 공유된 연결이 없다
+        return
+    with module.app.app_context():
+        for engine in module.db.engines.values():
+            engine.dispose(close=False)
+    worker.log.info(f'DB 연결 풀 초기화 (pid {worker.pid}, {profile})')
+
+
+def on_starting(server):
+    # 이전 실행의 워커별 지표 파일 정리
+    from metrics_registry import registry
+    registry.clear_directory()
+    server.log.info(f'워커 방식: {profile}, 워커 {workers}개')
+
+
+def post_fork(server, worker):
+    if profile != 'gevent':
+        _dispose_engines(worker)
+
+
+def post_worker_init(worker):
+    if profile != 'gevent':
+        return
+    _dispose_engines(worker)
+    try:
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+    except ImportError:
+        if os.environ.get('DATABASE_URL', '').startswith(('postgres://', 'postgresql://')):
+            worker.log.warning('⚠️ psycogreen이 없어 PostgreSQL 쿼리 중에는 다른 요청으로 전환되지 않습니다.')
+
+
+def worker_exit(server, worker):
+    from metrics_registry import registry
+    registry.flush()
+
+
+def child_exit(server, worker):
+    # 마스터에서 실행: 종료된 워커의 지표 파일을 누적 파일로 옮겨 파일 수가 늘어나지 않게 한다
+    from metrics_registry import registry
+    if registry.merge_worker_file(worker.pid):
+        server.log.info(f'종료된 워커 지표 합산 (pid {worker.pid})')
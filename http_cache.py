@@ -0,0 +1,114 @@
+"""버전 기반 HTTP 조건부 응답 (ETag / Last-Modified)
+
+직원 화면처럼 자주 새로고침되지만 잘 바뀌지 않는 페이지는 data_versions의 범위 버전만 조회해서
+ETag를 계산하고, 브라우저가 가진 값과 같으면 뷰를 실행하지 않고 304를 돌려준다.
+
+    @employee_bp.route('/my-certificates')
+    @login_required
+    @conditional_page(lambda: [user_scope(current_user.id)])
+    def my_certificates(): ...
+
+ETag에는 요청 경로/쿼리, 로그인 사용자, 범위 버전 외에 날짜(오늘 기준 표시), 템플릿 수정 시각,
+CSRF 토큰 유효 구간이 함께 들어가서 페이지 안의 폼 토큰이 만료되기 전에 새로 렌더링된다.
+대기 중인 flash 메시지도 ETag에 포함되며, 렌더링하면서 flash를 표시(소비)한 응답은 한 번만 보여야 하므로 캐시하지 않는다.
+"""
+
+import hashlib
+import os
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+
+from data_versions import get_version_stamps
+
+_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+
+def _latest_template_mtime():
+    """템플릿 파일 중 가장 최근 수정 시각 (배포 시 화면이 바뀌면 ETag도 바뀌도록)"""
+    latest = 0
+    for root, _, files in os.walk(_TEMPLATE_DIR):
+        for name in files:
+            latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+    return int(latest)
+
+
+TEMPLATE_MTIME = _latest_template_mtime()
+
+
+def _csrf_window():
+    """CSRF 토큰 유효 시간의 절반 단위 구간 시작 시각 (토큰을 쓰지 않으면 0)"""
+    if not current_app.config.get('WTF_CSRF_ENABLED', True):
+        return 0
+    time_limit = current_app.config.get('WTF_CSRF_TIME_LIMIT', 3600)
+    if not time_limit:
+        return 0
+    window = max(1, time_limit // 2)
+    return int(time.time() // window * window)
+
+
+def _to_utc(value):
+    # updated_at은 서버 로컬 시각(datetime.now)으로 저장된다
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def conditional_page(scopes):
+    """GET 응답에 범위 버전 기반 ETag/Last-Modified를 붙이고 변경이 없으면 304 반환
+
+    scopes: 요청마다 호출되는 함수, 페이지 내용이 의존하는 data_versions 범위 목록 반환
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+
+            scope_list = sorted(set(scopes()))
+            versions, updated_at = get_version_stamps(*scope_list)
+            today = datetime.now().date()
+            csrf_window = _csrf_window()
+            pending_flashes = session.get('_flashes')
+
+            key = '|'.join([
+                request.full_path,
+                str(current_user.get_id() if current_user.is_authenticated else ''),
+                ','.join(f'{scope}={versions[scope]}' for scope in scope_list),
+                today.isoformat(),
+                str(TEMPLATE_MTIME),
+                str(csrf_window),
+                repr(pending_flashes or '')
+            ])
+            etag = hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+            # 날짜/배포/CSRF 구간이 바뀐 시각도 변경 시각으로 본다
+            candidates = [
+                datetime.combine(today, datetime.min.time()),
+                datetime.fromtimestamp(TEMPLATE_MTIME),
+                datetime.fromtimestamp(csrf_window)
+            ]
+            if updated_at is not None:
+                candidates.append(updated_at)
+            last_modified = _to_utc(max(candidates))
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains(etag)
+            else:
+                not_modified = request.if_modified_since is not None and last_modified <= request.if_modified_since
+
+            if not_modified:
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                # 렌더링 중 flash 메시지를 표시했거나 새로 추가했으면 다시 쓰면 안 된다
+                if response.status_code != 200 or session.get('_flashes') != pending_flashes:
+                    return response
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Cookie')
+            return response
+        return wrapped
+    return decorator
@@ -0,0 +1,163 @@
+"""연차 부여 기준 (근로기준법 제60조, 회계연도 단위 적용)
+
+대상 연도(year)에 돌아오는 입사 기념일 기준 근속연수 n = year - 입사연도
+  - n <= 0 (해당 연도 입사): 1개월 개근 시 1일씩, 연말까지 발생하는 일수 (최대 11일)
+  - n == 1 (첫 1년이 되는 해): 남은 월차 (입사월 - 1)일 + 1년 근속 연차 15일
+  - n >= 2: 15일 + 최초 1년을 초과하는 근속 2년마다 1일 (최대 25일)
+입사일이 없는 직원은 기존과 같이 기본 15일을 부여한다.
+
+같은 규칙을 파이썬 함수(annual_entitlement), SQL 식(entitlement_expression),
+pandas 벡터 연산(entitlement_series) 세 가지로 제공해서, 직원 한 명 등록 시와
+전 직원 일괄 생성(INSERT ... SELECT), 일괄 재계산(recalculate_entitlements) 결과가 같도록 한다.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Integer, case, cast, literal, select, update
+
+from app import db
+from models import User, VacationDays
+from data_versions import bump_version, user_scope
+
+# 입사일 미등록 직원 및 1년 이상 근속자의 기본 연차
+BASE_DAYS = 15
+# 1년 미만 근속자의 월 단위 연차 최대 일수
+FIRST_YEAR_MAX_DAYS = 11
+# 근속 가산 연차 포함 최대 일수
+MAX_DAYS = 25
+
+# 전년도 미사용 연차 이월 한도 (기본 0일: 미사용 연차 소멸)
+CARRYOVER_MAX_DAYS = int(os.environ.get('VACATION_CARRYOVER_MAX_DAYS', '0'))
+
+
+def annual_entitlement(hire_date, year):
+    """해당 연도 부여 연차 일수"""
+    if hire_date is None:
+        return BASE_DAYS
+
+    service_years = year - hire_date.year
+    if service_years < 0:
+        return 0
+    if service_years == 0:
+        return min(FIRST_YEAR_MAX_DAYS, 12 - hire_date.month)
+    if service_years == 1:
+        return BASE_DAYS + min(FIRST_YEAR_MAX_DAYS, hire_date.month - 1)
+    return min(MAX_DAYS, BASE_DAYS + (service_years - 1) // 2)
+
+
+def carryover_days(remaining_days):
+    """전년도 잔여 일수 중 이월되는 일수"""
+    if not remaining_days or remaining_days <= 0:
+        return 0
+    return min(CARRYOVER_MAX_DAYS, int(remaining_days))
+
+
+def entitlement_expression(year):
+    """annual_entitlement와 같은 규칙의 SQL 식 (User 컬럼 기준)"""
+    hire_year = db.extract('year', User.hire_date)
+    hire_month = db.extract('month', User.hire_date)
+    service_years = literal(year) - hire_year
+    tenure_days = BASE_DAYS + (service_years - 1) // 2
+
+    return case(
+        (User.hire_date.is_(None), BASE_DAYS),
+        (service_years < 0, 0),
+        (service_years == 0, 12 - hire_month),
+        (service_years == 1, BASE_DAYS - 1 + hire_month),
+        (tenure_days > MAX_DAYS, MAX_DAYS),
+        else_=tenure_days
+    )
+
+
+def carryover_expression(previous):
+    """carryover_days와 같은 규칙의 SQL 식 (previous: 전년도 VacationDays 별칭)"""
+    if CARRYOVER_MAX_DAYS <= 0:
+        return literal(0)
+
+    remaining = previous.total_days - previous.used_days
+    return case(
+        (remaining >= CARRYOVER_MAX_DAYS, CARRYOVER_MAX_DAYS),
+        (remaining > 0, cast(remaining, Integer)),
+        else_=0
+    )
+
+
+def entitlement_series(hire_dates, year):
+    """annual_entitlement의 벡터 연산 버전 (입사일 Series -> 부여 일수 Series)"""
+    hire = pd.to_datetime(hire_dates, errors='coerce')
+    service_years = year - hire.dt.year
+    month = hire.dt.month
+    tenure_days = np.minimum(MAX_DAYS, BASE_DAYS + (service_years - 1) // 2)
+
+    days = np.select(
+        [hire.isna(), service_years < 0, service_years == 0, service_years == 1],
+        [BASE_DAYS, 0, 12 - month, BASE_DAYS - 1 + month],
+        default=tenure_days
+    )
+    return pd.Series(days, index=hire_dates.index).astype(int)
+
+
+def carryover_series(remaining_days):
+    """carryover_days의 벡터 연산 버전"""
+    remaining = pd.to_numeric(remaining_days, errors='coerce').fillna(0)
+    return remaining.clip(lower=0, upper=CARRYOVER_MAX_DAYS).astype(int)
+
+
+def recalculate_entitlements(year, *criteria):
+    """입사일 기준으로 해당 연도 total_days 일괄 재계산 (커밋은 호출하는 쪽에서 수행)
+
+    대상 직원/연차/전년도 잔여일수를 각각 한 번씩 읽어 pandas로 계산하고,
+    값이 바뀐 행만 기본키 기준 일괄 UPDATE(executemany) 한 번으로 반영한다.
+    관리자가 직접 조정한 일수도 기준값으로 덮어쓰므로 입사일 변경/인사 데이터 반영 후에 사용한다.
+
+    Returns:
+        int: 변경된 레코드 수
+    """
+    # pandas는 세션을 거치지 않고 연결로 직접 읽으므로 대기 중인 변경(입사일 등)을 먼저 반영
+    db.session.flush()
+    connection = db.session.connection()
+
+    users = pd.read_sql(
+        select(User.id.label('user_id'), User.hire_date).where(*criteria),
+        connection
+    )
+    if users.empty:
+        return 0
+
+    current = pd.read_sql(
+        select(VacationDays.id, VacationDays.user_id, VacationDays.total_days)
+        .where(VacationDays.year == year),
+        connection
+    )
+    previous = pd.read_sql(
+        select(
+            VacationDays.user_id,
+            (VacationDays.total_days - VacationDays.used_days).label('previous_remaining')
+        ).where(VacationDays.year == year - 1),
+        connection
+    ).drop_duplicates('user_id')
+
+    frame = current.merge(users, on='user_id').merge(previous, on='user_id', how='left')
+    if frame.empty:
+        return 0
+
+    frame['entitled'] = (
+        entitlement_series(frame['hire_date'], year)
+        + carryover_series(frame['previous_remaining'])
+    )
+    changed = frame[frame['entitled'] != frame['total_days']]
+    if changed.empty:
+        return 0
+
+    db.session.execute(
+        update(VacationDays),
+        [
+            {'id': int(row_id), 'total_days': int(total_days)}
+            for row_id, total_days in zip(changed['id'], changed['entitled'])
+        ]
+    )
+    # 세션을 거치지 않은 변경이므로 직원별 버전을 직접 증가
+    bump_version(*[user_scope(int(user_id)) for user_id in changed['user_id']])
+    return len(changed)
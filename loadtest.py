@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""라우트별 부하 테스트 스크립트
+
+직원(로그인/대시보드/휴가 신청)과 관리자(휴가 승인/엑셀 다운로드) 시나리오를 반복 실행하고
+라우트별 p50/p95/p99 응답 시간과 요청당 쿼리 수를 JSON으로 저장한다.
+데이터는 generate_synthetic_data.py로 먼저 만들어 둔다.
+
+Flask 테스트 클라이언트 (요청당 쿼리 수까지 측정):
+    DATABASE_URL=sqlite:////tmp/bench.db python loadtest.py --iterations 50 --output results.json
+
+로컬 gunicorn 서버 (응답 시간만 측정):
+    DATABASE_URL=sqlite:////tmp/bench.db gunicorn -w 4 -b 127.0.0.1:8000 main:app
+    python loadtest.py --target http://127.0.0.1:8000 --concurrency 8 --output results.json
+
+이전 결과와 비교 (p95가 기준보다 20% 이상 느려지거나 쿼리 수가 늘면 종료 코드 1):
+    python loadtest.py --compare baseline.json results.json
+"""
+
+import argparse
+import http.cookiejar
+import json
+import os
+import platform
+import random
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import date, datetime, timedelta
+
+# Flask 앱 컨텍스트 설정 (테스트 클라이언트 모드에서만 앱을 불러온다)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# 생성 데이터 계정 규칙 (generate_synthetic_data.py와 동일)
+BENCH_PREFIX = 'bench_'
+BENCH_PASSWORD = 'bench1234'
+
+# 비교 시 허용하는 p95 증가율
+DEFAULT_THRESHOLD = 0.2
+
+_CSRF_PATTERN = re.compile(r'name="csrf_token"[^>]*value="([^"]+)"')
+_PENDING_PATTERN = re.compile(r'/admin/vacations/(\d+)"')
+
+
+def percentile(sorted_values, pct):
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Recorder:
+    """라우트별 응답 시간/쿼리 수 기록 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._errors = {}
+
+    def record(self, label, elapsed_ms, queries, ok):
+        with self._lock:
+            self._samples.setdefault(label, []).append((elapsed_ms, queries))
+            if not ok:
+                self._errors[label] = self._errors.get(label, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._errors.clear()
+
+    def summary(self):
+        routes = {}
+        for label, samples in sorted(self._samples.items()):
+            timings = sorted(elapsed for elapsed, _ in samples)
+            queries = [count for _, count in samples if count is not None]
+            routes[label] = {
+                'count': len(samples),
+                'errors': self._errors.get(label, 0),
+                'p50_ms': round(percentile(timings, 50), 2),
+                'p95_ms': round(percentile(timings, 95), 2),
+                'p99_ms': round(percentile(timings, 99), 2),
+                'mean_ms': round(sum(timings) / len(timings), 2),
+                'max_ms': round(timings[-1], 2),
+                'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None
+            }
+        return routes
+
+
+class TestClientSession:
+    """Flask 테스트 클라이언트 세션 (같은 스레드에서 실행된 쿼리 수 측정)"""
+
+    _local = threading.local()
+    _counting_engines = set()
+
+    def __init__(self, app, recorder):
+        self.client = app.test_client()
+        self.recorder = recorder
+        self._install_counter(app)
+
+    @classmethod
+    def _install_counter(cls, app):
+        from sqlalchemy import event
+        from app import db
+
+        with app.app_context():
+            engine = db.engine
+        if engine in cls._counting_engines:
+            return
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            cls._local.queries = getattr(cls._local, 'queries', 0) + 1
+
+        cls._counting_engines.add(engine)
+
+    def request(self, label, method, path, data=None):
+        TestClientSession._local.queries = 0
+        started = time.perf_counter()
+        response = self.client.open(path, method=method, data=data)
+        body = response.get_data(as_text=True) if response.mimetype.startswith('text/') else ''
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.recorder.record(label, elapsed_ms, TestClientSession._local.queries, response.status_code < 400)
+        return response.status_code, body
+
+
+class HttpSession:
+    """실행 중인 서버 대상 HTTP 세션 (쿠키 유지, 쿼리 수는 측정하지 않음)"""
+
+    def __init__(self, base_url, recorder):
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def request(self, label, method, path, data=None):
+        body_bytes = urllib.parse.urlencode(data).encode('utf-8') if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body_bytes, method=method)
+        started = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=60) as response:
+                status = response.status
+                content = response.read()
+                is_text = response.headers.get_content_type().startswith('text/')
+                body = content.decode('utf-8', errors='replace') if is_text else ''
+        except urllib.error.HTTPError as e:
+            status = e.code
+            body = e.read().decode('utf-8', errors='replace')
+        except urllib.error.URLError:
+            status = 599
+            body = ''
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.recorder.record(label, elapsed_ms, None, status < 400)
+        return status, body
+
+
+def _with_csrf(body, data):
+    """폼 페이지의 CSRF 토큰을 POST 데이터에 추가 (CSRF 비활성화 시 토큰 없음)"""
+    match = _CSRF_PATTERN.search(body or '')
+    if match:
+        data = dict(data, csrf_token=match.group(1))
+    return data
+
+
+# ---------------------------------------------------------------------------
+# 시나리오
+# ---------------------------------------------------------------------------
+
+def scenario_login(session, username, password):
+    _, body = session.request('GET /login', 'GET', '/login')
+    session.request('POST /login', 'POST', '/login',
+                    _with_csrf(body, {'username': username, 'password': password}))
+
+
+def scenario_employee_dashboard(session, rng):
+    session.request('GET /employee/dashboard', 'GET', '/employee/dashboard')
+    session.request('GET /employee/my-vacations', 'GET', '/employee/my-vacations')
+
+
+def scenario_request_vacation(session, rng):
+    _, body = session.request('GET /employee/request-vacation', 'GET', '/employee/request-vacation')
+    start_date = date.today() + timedelta(days=rng.randint(30, 330))
+    while start_date.weekday() >= 5:
+        start_date += timedelta(days=1)
+    session.request('POST /employee/request-vacation', 'POST', '/employee/request-vacation', _with_csrf(body, {
+        'start_date': start_date.isoformat(),
+        'end_date': start_date.isoformat(),
+        'type': '연차',
+        'days': '1',
+        'reason': '부하 테스트'
+    }))
+
+
+def scenario_admin_dashboard(session, rng):
+    session.request('GET /admin/dashboard', 'GET', '/admin/dashboard')
+
+
+def scenario_approve(session, rng):
+    pending = urllib.parse.quote('대기중')
+    _, body = session.request('GET /admin/vacations?status=대기중', 'GET', f'/admin/vacations?status={pending}')
+    request_ids = _PENDING_PATTERN.findall(body or '')
+    if not request_ids:
+        return
+    request_id = rng.choice(request_ids)
+    _, form_body = session.request('GET /admin/vacations/<id>', 'GET', f'/admin/vacations/{request_id}')
+    session.request('POST /admin/vacations/<id>', 'POST', f'/admin/vacations/{request_id}', _with_csrf(form_body, {
+        'request_id': request_id,
+        'status': '승인됨',
+        'comments': '부하 테스트 승인'
+    }))
+
+
+def scenario_export(session, rng):
+    # 휴가 관리 화면의 검색 조건(올해, 전체 상태/부서)으로 엑셀 다운로드
+    _, body = session.request('GET /admin/vacations', 'GET', '/admin/vacations')
+    session.request('POST /admin/vacations [export]', 'POST', '/admin/vacations', _with_csrf(body, {
+        'employee_name': '',
+        'year': str(date.today().year),
+        'month': '0',
+        'status': 'all',
+        'department': 'all',
+        'start_date': '',
+        'end_date': '',
+        'export': '엑셀 다운로드'
+    }))
+
+
+EMPLOYEE_SCENARIOS = [scenario_employee_dashboard, scenario_request_vacation]
+ADMIN_SCENARIOS = [scenario_admin_dashboard, scenario_approve, scenario_export]
+
+
+def _worker(make_session, worker_id, args, recorder, deadline):
+    rng = random.Random(args.seed + worker_id)
+    employee = make_session(recorder)
+    username = f'{BENCH_PREFIX}{rng.randint(1, args.users):05d}'
+    scenario_login(employee, username, BENCH_PASSWORD)
+
+    # --admin-every 0이면 첫 가상 사용자만 관리자로 로그인해서 매 반복마다 관리자 시나리오 실행
+    admin = None
+    admin_every = args.admin_every or 1
+    if worker_id == 0 or args.admin_every:
+        admin = make_session(recorder)
+        scenario_login(admin, args.admin_user, args.admin_password)
+
+    for iteration in range(args.iterations):
+        if deadline and time.monotonic() > deadline:
+            break
+        for scenario in EMPLOYEE_SCENARIOS:
+            scenario(employee, rng)
+        if admin and iteration % admin_every == 0:
+            for scenario in ADMIN_SCENARIOS:
+                scenario(admin, rng)
+
+
+def run(args):
+    """시나리오 실행 후 결과 dict 반환"""
+    recorder = Recorder()
+
+    if args.target == 'testclient':
+        from app import app
+        app.config['WTF_CSRF_ENABLED'] = False
+        app.config['TESTING'] = True
+
+        def make_session(rec):
+            return TestClientSession(app, rec)
+    else:
+        def make_session(rec):
+            return HttpSession(args.target, rec)
+
+    deadline = time.monotonic() + args.duration if args.duration else None
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=_worker, args=(make_session, worker_id, args, recorder, deadline))
+        for worker_id in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'meta': {
+            'target': args.target,
+            'database': os.environ.get('DATABASE_URL') if args.target == 'testclient' else None,
+            'iterations': args.iterations,
+            'concurrency': args.concurrency,
+            'users': args.users,
+            'seed': args.seed,
+            'elapsed_s': round(elapsed, 2),
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version()
+        },
+        'routes': recorder.summary()
+    }
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD, metric='p95_ms',
+                    section='routes', queries_key='queries_per_request'):
+    """기준 결과 대비 느려진 항목 목록 [(라우트, 항목, 기준값, 현재값)]
+
+    benchmark_utils.py 결과도 section/queries_key만 바꿔서 같은 방식으로 비교한다.
+    """
+    regressions = []
+    for label, base in baseline.get(section, {}).items():
+        now = current.get(section, {}).get(label)
+        if not now:
+            continue
+        if base.get(metric) and now.get(metric) and now[metric] > base[metric] * (1 + threshold):
+            regressions.append((label, metric, base[metric], now[metric]))
+        base_queries = base.get(queries_key)
+        now_queries = now.get(queries_key)
+        if base_queries is not None and now_queries is not None and now_queries > base_queries:
+            regressions.append((label, queries_key, base_queries, now_queries))
+    return regressions
+
+
+def print_summary(result):
+    print(f"{'라우트':<36} {'건수':>6} {'오류':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'쿼리':>7}")
+    for label, stats in result['routes'].items():
+        queries = stats['queries_per_request']
+        print(f"{label:<36} {stats['count']:>6} {stats['errors']:>5} {stats['p50_ms']:>8.1f}ms "
+              f"{stats['p95_ms']:>8.1f}ms {stats['p99_ms']:>8.1f}ms {queries if queries is not None else '-':>7}")
+
+
+def print_regressions(regressions, threshold):
+    if not regressions:
+        print('✅ 기준 대비 성능 저하 없음')
+        return
+    for label, metric, base, now in regressions:
+        print(f'❌ {label} {metric}: {base} -> {now}')
+    print(f'⚠️ {len(regressions)}개 항목이 기준보다 나빠졌습니다 (허용 증가율 {threshold:.0%})')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='라우트별 부하 테스트')
+    parser.add_argument('--target', default='testclient',
+                        help="'testclient' 또는 서버 주소 (예: http://127.0.0.1:8000)")
+    parser.add_argument('--iterations', type=int, default=20, help='가상 사용자별 반복 횟수 (기본값: 20)')
+    parser.add_argument('--concurrency', type=int, default=1, help='동시 가상 사용자 수 (기본값: 1)')
+    parser.add_argument('--duration', type=int, help='최대 실행 시간(초)')
+    parser.add_argument('--users', type=int, default=800, help='로그인에 사용할 bench_ 계정 수 (기본값: 800)')
+    parser.add_argument('--admin-user', default='admin', help='관리자 아이디 (기본값: admin)')
+    parser.add_argument('--admin-password', default='admin123', help='관리자 비밀번호')
+    parser.add_argument('--admin-every', type=int, default=5,
+                        help='관리자 시나리오 실행 간격 (반복 횟수 기준, 0이면 첫 가상 사용자만 매 반복 실행)')
+    parser.add_argument('--seed', type=int, default=42, help='난수 seed (기본값: 42)')
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help='두 결과 JSON 비교')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='비교 시 허용하는 p95 증가율 (기본값: 0.2)')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.compare[1], encoding='utf-8') as f:
+            current = json.load(f)
+        regressions = compare_results(baseline, current, args.threshold)
+        print_regressions(regressions, args.threshold)
+        return 1 if regressions else 0
+
+    result = run(args)
+    print_summary(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f'📄 결과 저장: {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""논리 백업/복원 스크립트 (SQLite, PostgreSQL 공통)
+
+backup_database.py는 SQLite 파일만 백업하므로, DB 종류와 관계없이 SQLAlchemy 메타데이터 기준으로
+모든 테이블을 기본키 순서의 청크 단위로 읽어 gzip NDJSON(또는 Parquet) 파일로 저장한다.
+전체 내보내기는 한 읽기 트랜잭션(PostgreSQL은 REPEATABLE READ) 안에서 수행되어 같은 시점의 스냅샷이 된다.
+
+증분 백업은 휴가 신청/재직증명서의 created_at, approval_date 워터마크 이후 변경분만 저장하고,
+워터마크 컬럼이 없는 작은 테이블(직원, 연차, 공휴일, 보관된 휴가 신청 등)은 매번 전체를 저장한다.
+집계/버전 테이블(department_vacation_stats, data_versions)은 복원 후 다시 계산하므로 저장하지 않는다.
+
+워터마크 이후 변경분에는 삭제된 행과 vacation_archive.py가 보관 테이블로 옮긴 행이 나타나지 않으므로,
+증분 백업은 워터마크 테이블의 백업 시점 기본키 목록(<테이블>.keys.ndjson.gz)을 함께 저장한다.
+증분 복원은 변경분을 적용한 뒤 백업 시점에 없던 행(기본키 목록/전체 저장 파일에 없는 행)을 지운다.
+제한 사항:
+- 기본키 목록이 없는 이전 형식의 증분 백업은 삭제/보관 이동을 복원하지 못한다 (복원 시 경고, 새 전체 백업부터 복원 권장).
+- created_at/approval_date가 바뀌지 않은 수정(승인 후 사유/기간 변경 등)은 증분에 포함되지 않는다.
+
+    python logical_backup.py                            # 전체 백업 (gzip NDJSON)
+    python logical_backup.py --incremental              # 마지막 백업 이후 증분
+    python logical_backup.py --format parquet           # pyarrow 필요
+    python logical_backup.py --restore instance/logical_backups/20260101_030000_full --replace
+    python logical_backup.py --restore <전체 백업> <증분 백업> ...   # 순서대로 적용
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import date, datetime
+
+from sqlalchemy import delete, func, insert, or_, select, text
+
+# Flask 앱 컨텍스트 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from app import app, db
+from models import User, Department, DataVersion
+from data_versions import VACATIONS, HOLIDAYS, bump_version, user_scope, department_scope
+from department_stats import rebuild_department_stats
+
+BACKUP_ROOT = os.environ.get('LOGICAL_BACKUP_DIR', 'instance/logical_backups')
+MANIFEST_NAME = 'manifest.json'
+KEYS_EXTENSION = '.keys.ndjson.gz'
+
+# 한 번에 읽고 쓸 행 수
+CHUNK_SIZE = 5000
+
+# 복원 후 다시 계산하는 파생 테이블
+DERIVED_TABLES = {'department_vacation_stats', 'data_versions'}
+
+# 증분 백업 기준 컬럼 (이 외의 테이블은 매번 전체 저장)
+INCREMENTAL_WATERMARKS = {
+    'vacation_requests': ('created_at', 'approval_date'),
+    'employment_certificates': ('created_at', 'approval_date'),
+}
+
+FORMATS = ('ndjson', 'parquet')
+
+
+def backup_tables():
+    """백업 대상 테이블 (외래키 의존 순서)"""
+    return [table for table in db.metadata.sorted_tables if table.name not in DERIVED_TABLES]
+
+
+def _primary_key(table):
+    return list(table.primary_key.columns)[0]
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode('ascii')
+    raise TypeError(f'JSON으로 변환할 수 없는 값: {value!r}')
+
+
+def _decoders(table):
+    """NDJSON 문자열을 컬럼 타입 값으로 되돌리는 변환 함수 {컬럼명: 함수}"""
+    decoders = {}
+    for column in table.columns:
+        if isinstance(column.type, db.DateTime):
+            decoders[column.name] = datetime.fromisoformat
+        elif isinstance(column.type, db.Date):
+            decoders[column.name] = date.fromisoformat
+        elif isinstance(column.type, db.LargeBinary):
+            decoders[column.name] = base64.b64decode
+    return decoders
+
+
+def _arrow_schema(table):
+    import pyarrow as pa
+
+    fields = []
+    for column in table.columns:
+        if isinstance(column.type, db.Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, db.Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, db.Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, db.DateTime):
+            arrow_type = pa.timestamp('us')
+        elif isinstance(column.type, db.Date):
+            arrow_type = pa.date32()
+        elif isinstance(column.type, db.LargeBinary):
+            arrow_type = pa.binary()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+class NdjsonWriter:
+    """gzip 압축 NDJSON (한 줄에 한 행)"""
+
+    extension = '.ndjson.gz'
+
+    def __init__(self, path, table):
+        self._file = gzip.open(path, 'wt', encoding='utf-8', compresslevel=6)
+
+    def write(self, rows):
+        for row in rows:
+            self._file.write(json.dumps(dict(row), ensure_ascii=False, default=_json_default))
+            self._file.write('\n')
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """Parquet (컬럼 타입은 SQLAlchemy 모델 기준으로 고정)"""
+
+    extension = '.parquet'
+
+    def __init__(self, path, table):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = _arrow_schema(table)
+        self._writer = pq.ParquetWriter(path, self._schema, compression='zstd')
+
+    def write(self, rows):
+        batch = self._pa.Table.from_pylist([dict(row) for row in rows], schema=self._schema)
+        self._writer.write_table(batch)
+
+    def close(self):
+        self._writer.close()
+
+
+_WRITERS = {'ndjson': NdjsonWriter, 'parquet': ParquetWriter}
+
+
+def _read_chunks(path, table, chunk_size=CHUNK_SIZE):
+    """백업 파일을 chunk_size 행씩 읽기 (행은 컬럼 타입으로 변환된 dict)"""
+    if path.endswith(ParquetWriter.extension):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+        return
+
+    decoders = _decoders(table)
+    rows = []
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            row = json.loads(line)
+            for name, decode in decoders.items():
+                if row.get(name) is not None:
+                    row[name] = decode(row[name])
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                yield rows
+                rows = []
+    if rows:
+        yield rows
+
+
+def _iter_chunks(connection, table, criteria=(), chunk_size=CHUNK_SIZE):
+    """기본키 순서로 chunk_size 행씩 읽기 (OFFSET 없이 마지막 키 이후부터)"""
+    pk = _primary_key(table)
+    last_key = None
+    while True:
+        query = select(table).where(*criteria).order_by(pk).limit(chunk_size)
+        if last_key is not None:
+            query = query.where(pk > last_key)
+        rows = connection.execute(query).mappings().all()
+        if not rows:
+            return
+        yield rows
+        last_key = rows[-1][pk.name]
+
+
+def _write_keys(connection, table, path, chunk_size=CHUNK_SIZE):
+    """백업 시점의 기본키 목록을 한 줄에 하나씩 저장
+
+    Returns:
+        dict: manifest 항목 (파일명, 개수, 체크섬)
+    """
+    pk = _primary_key(table)
+    count = 0
+    last_key = None
+    with gzip.open(path, 'wt', encoding='utf-8', compresslevel=6) as f:
+        while True:
+            query = select(pk).order_by(pk).limit(chunk_size)
+            if last_key is not None:
+                query = query.where(pk > last_key)
+            keys = connection.execute(query).scalars().all()
+            if not keys:
+                break
+            for key in keys:
+                f.write(json.dumps(key, ensure_ascii=False))
+                f.write('\n')
+            count += len(keys)
+            last_key = keys[-1]
+    return {'file': os.path.basename(path), 'rows': count, 'sha256': _file_sha256(path)}
+
+
+def _snapshot_connection():
+    """모든 테이블을 같은 시점으로 읽기 위한 읽기 트랜잭션 연결"""
+    connection = db.engine.connect()
+    if connection.dialect.name == 'postgresql':
+        connection = connection.execution_options(isolation_level='REPEATABLE READ', postgresql_readonly=True)
+    elif connection.dialect.name == 'sqlite':
+        # pysqlite는 SELECT에 트랜잭션을 시작하지 않으므로 직접 시작한다 (첫 조회 시점의 스냅샷 고정)
+        connection.exec_driver_sql('BEGIN')
+    return connection
+
+
+def _watermark(connection, table):
+    columns = INCREMENTAL_WATERMARKS.get(table.name)
+    if not columns:
+        return None
+    values = connection.execute(select(*[func.max(table.c[name]) for name in columns])).one()
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def latest_manifest(root=BACKUP_ROOT):
+    """가장 최근 백업의 manifest (없으면 None)"""
+    if not os.path.isdir(root):
+        return None
+    for name in sorted(os.listdir(root), reverse=True):
+        path = os.path.join(root, name, MANIFEST_NAME)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+    return None
+
+
+def export_backup(root=BACKUP_ROOT, fmt='ndjson', since_manifest=None, chunk_size=CHUNK_SIZE):
+    """전체 또는 증분 논리 백업 (since_manifest가 있으면 해당 백업의 워터마크 이후만 저장)
+
+    Returns:
+        str: 백업 디렉토리 경로
+    """
+    writer_class = _WRITERS[fmt]
+    if fmt == 'parquet':
+        import pyarrow  # noqa: F401  (디렉토리를 만들기 전에 의존성 확인)
+
+    mode = 'incremental' if since_manifest else 'full'
+    started_at = datetime.now()
+    backup_dir = os.path.join(root, f"{started_at.strftime('%Y%m%d_%H%M%S')}_{mode}")
+    os.makedirs(backup_dir)
+
+    manifest = {
+        'created_at': started_at.isoformat(timespec='seconds'),
+        'mode': mode,
+        'format': fmt,
+        'base': since_manifest.get('name') if since_manifest else None,
+        'name': os.path.basename(backup_dir),
+        'tables': {}
+    }
+
+    connection = _snapshot_connection()
+    manifest['backend'] = connection.dialect.name
+    try:
+        for table in backup_tables():
+            criteria = []
+            since = None
+            if since_manifest and table.name in INCREMENTAL_WATERMARKS:
+                since = since_manifest['tables'].get(table.name, {}).get('watermark')
+            if since:
+                # 경계 시각은 다시 포함한다 (복원은 기본키 기준 upsert라 중복되어도 안전)
+                since_value = datetime.fromisoformat(since)
+                criteria.append(or_(*[
+                    table.c[name] >= since_value for name in INCREMENTAL_WATERMARKS[table.name]
+                ]))
+
+            # 미래 시각이 들어간 행이 있어도 다음 증분에서 빠지지 않도록 백업 시작 시각을 넘지 않게 한다
+            watermark = _watermark(connection, table)
+            if watermark and watermark > started_at:
+                watermark = started_at
+            path = os.path.join(backup_dir, table.name + writer_class.extension)
+            writer = writer_class(path, table)
+            rows = 0
+            try:
+                for chunk in _iter_chunks(connection, table, criteria, chunk_size):
+                    writer.write(chunk)
+                    rows += len(chunk)
+            finally:
+                writer.close()
+
+            manifest['tables'][table.name] = {
+                'file': os.path.basename(path),
+                'rows': rows,
+                'sha256': _file_sha256(path),
+                'since': since,
+                'watermark': watermark.isoformat() if watermark else since
+            }
+            if since:
+                # 변경분만 저장한 테이블은 삭제/보관 이동을 복원할 수 있도록 현재 기본키 목록도 저장
+                keys_path = os.path.join(backup_dir, table.name + KEYS_EXTENSION)
+                manifest['tables'][table.name]['keys'] = _write_keys(connection, table, keys_path, chunk_size)
+    finally:
+        connection.rollback()
+        connection.close()
+
+    with open(os.path.join(backup_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return backup_dir
+
+
+def _load_manifest(backup_dir):
+    with open(os.path.join(backup_dir, MANIFEST_NAME), encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    for name, info in manifest['tables'].items():
+        for entry in (info, info.get('keys')):
+            if not entry:
+                continue
+            path = os.path.join(backup_dir, entry['file'])
+            if _file_sha256(path) != entry['sha256']:
+                raise ValueError(f'체크섬 불일치: {path}')
+    return manifest
+
+
+def _live_keys(backup_dir, info, table, chunk_size=CHUNK_SIZE):
+    """백업 시점에 있던 기본키 집합 (이전 형식의 증분 백업이라 알 수 없으면 None)"""
+    if info.get('keys'):
+        with gzip.open(os.path.join(backup_dir, info['keys']['file']), 'rt', encoding='utf-8') as f:
+            return {json.loads(line) for line in f}
+    if info.get('since'):
+        return None
+
+    # 전체 저장한 테이블은 데이터 파일의 행이 곧 백업 시점의 전체 행
+    pk = _primary_key(table)
+    keys = set()
+    for chunk in _read_chunks(os.path.join(backup_dir, info['file']), table, chunk_size):
+        keys.update(row[pk.name] for row in chunk)
+    return keys
+
+
+def _delete_missing(connection, table, live_keys, chunk_size=CHUNK_SIZE):
+    """live_keys에 없는 행 삭제 (백업 이후 삭제되었거나 보관 테이블로 옮겨진 행)
+
+    Returns:
+        int: 삭제한 행 수
+    """
+    pk = _primary_key(table)
+    missing = [key for key in connection.execute(select(pk)).scalars() if key not in live_keys]
+    for start in range(0, len(missing), chunk_size):
+        connection.execute(delete(table).where(pk.in_(missing[start:start + chunk_size])))
+    return len(missing)
+
+
+def _upsert_statement(table, dialect_name):
+    """기본키 충돌 시 나머지 컬럼을 덮어쓰는 INSERT"""
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    statement = dialect_insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[column.name for column in table.primary_key.columns],
+        set_={column.name: statement.excluded[column.name] for column in table.columns if not column.primary_key}
+    )
+
+
+def _reset_sequences(connection, tables):
+    """PostgreSQL 기본키 시퀀스를 복원된 최대값 이후로 맞춤"""
+    for table in tables:
+        pk = _primary_key(table)
+        if not isinstance(pk.type, db.Integer):
+            continue
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', '{pk.name}'), "
+            f"COALESCE((SELECT MAX({pk.name}) FROM {table.name}), 0) + 1, false)"
+        ))
+
+
+def restore_backups(backup_dirs, replace=False, chunk_size=CHUNK_SIZE):
+    """백업을 순서대로 복원 (전체 백업 후 증분 백업들)
+
+    replace=True면 첫 백업(전체) 적용 전에 기존 데이터를 모두 지우고 일괄 INSERT,
+    그 외에는 기본키 기준 upsert로 적용한다. 증분 백업은 적용 후 백업 시점에 없던 행을 지운다.
+    모든 적용은 한 트랜잭션으로 처리한다.
+
+    Returns:
+        tuple: (테이블별 적용 행 수, 테이블별 삭제 행 수) - 삭제 행 수가 None이면
+            기본키 목록이 없는 이전 형식의 증분 백업이라 삭제/보관 이동을 반영하지 못한 테이블
+    """
+    manifests = [_load_manifest(backup_dir) for backup_dir in backup_dirs]
+    if replace and manifests[0]['mode'] != 'full':
+        raise ValueError('--replace는 전체 백업부터 복원할 때만 사용할 수 있습니다.')
+
+    connection = db.session.connection()
+    dialect_name = connection.dialect.name
+    tables = {table.name: table for table in backup_tables()}
+    applied = {}
+    removed = {}
+
+    if replace:
+        for table in reversed(db.metadata.sorted_tables):
+            if table.name != 'data_versions':
+                connection.execute(delete(table))
+
+    for index, (backup_dir, manifest) in enumerate(zip(backup_dirs, manifests)):
+        bulk_insert = replace and index == 0
+        for name, table in tables.items():
+            info = manifest['tables'].get(name)
+            if not info or not info['rows']:
+                continue
+            statement = insert(table) if bulk_insert else _upsert_statement(table, dialect_name)
+            for chunk in _read_chunks(os.path.join(backup_dir, info['file']), table, chunk_size):
+                connection.execute(statement, chunk)
+                applied[name] = applied.get(name, 0) + len(chunk)
+
+        if manifest['mode'] != 'incremental':
+            continue
+        # 참조하는 테이블부터 삭제
+        for name, table in reversed(list(tables.items())):
+            info = manifest['tables'].get(name)
+            if not info:
+                continue
+            live_keys = _live_keys(backup_dir, info, table, chunk_size)
+            if live_keys is None:
+                removed[name] = None
+                continue
+            count = _delete_missing(connection, table, live_keys, chunk_size)
+            if count and removed.get(name, 0) is not None:
+                removed[name] = removed.get(name, 0) + count
+
+    if dialect_name == 'postgresql':
+        _reset_sequences(connection, tables.values())
+
+    # 세션을 거치지 않은 변경이므로 캐시 버전을 모두 올리고 부서 집계를 다시 만든다 (여기서 커밋)
+    scopes = {VACATIONS, HOLIDAYS}
+    scopes.update(connection.execute(select(DataVersion.scope)).scalars())
+    scopes.update(user_scope(user_id) for user_id in connection.execute(select(User.id)).scalars())
+    scopes.update(department_scope(name) for name in connection.execute(select(Department.name)).scalars())
+    bump_version(*scopes, connection=connection)
+    rebuild_department_stats()
+    return applied, removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='논리 백업/복원 (SQLite, PostgreSQL 공통)')
+    parser.add_argument('--root', default=BACKUP_ROOT, help=f'백업 저장 디렉토리 (기본값: {BACKUP_ROOT})')
+    parser.add_argument('--format', choices=FORMATS, default='ndjson', help='저장 형식 (기본값: ndjson)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='마지막 백업 이후 변경분만 저장 (삭제/보관 이동은 기본키 목록으로 반영, '
+                             'created_at/approval_date가 바뀌지 않은 수정은 포함되지 않음)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help=f'청크 행 수 (기본값: {CHUNK_SIZE})')
+    parser.add_argument('--restore', nargs='+', metavar='BACKUP_DIR', help='백업 디렉토리를 순서대로 복원')
+    parser.add_argument('--replace', action='store_true', help='복원 전에 기존 데이터를 모두 삭제')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    with app.app_context():
+        if args.restore:
+            try:
+                applied, removed = restore_backups(args.restore, replace=args.replace, chunk_size=args.chunk_size)
+            except Exception as e:
+                db.session.rollback()
+                print(f'❌ 복원 실패: {e}')
+                return 1
+            print(f'✅ 복원 완료: {sum(applied.values())}행 ({time.perf_counter() - started:.1f}초)')
+            for name, rows in applied.items():
+                print(f'  - {name}: {rows}행')
+            for name, rows in removed.items():
+                if rows is None:
+                    print(f'⚠️ {name}: 기본키 목록이 없는 이전 형식의 증분 백업이라 삭제/보관 이동이 반영되지 않았습니다.')
+                else:
+                    print(f'  - {name}: {rows}행 삭제 (백업 이후 삭제/보관)')
+            return 0
+
+        since_manifest = None
+        if args.incremental:
+            since_manifest = latest_manifest(args.root)
+            if since_manifest is None:
+                print('⚠️ 이전 백업이 없어 전체 백업을 수행합니다.')
+
+        try:
+            backup_dir = export_backup(args.root, args.format, since_manifest, args.chunk_size)
+        except ImportError:
+            print('❌ Parquet 형식은 pyarrow가 필요합니다 (pip install pyarrow)')
+            return 1
+
+    with open(os.path.join(backup_dir, MANIFEST_NAME), encoding='utf-8') as f:
+        manifest = json.load(f)
+    total = sum(info['rows'] for info in manifest['tables'].values())
+    print(f"✅ {'증분' if manifest['mode'] == 'incremental' else '전체'} 백업 완료: {backup_dir} "
+          f"({total}행, {time.perf_counter() - started:.1f}초)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
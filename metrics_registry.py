@@ -0,0 +1,386 @@
+"""워커 프로세스 간 합산되는 지표 레지스트리 (Prometheus 텍스트 형식)
+
+각 프로세스는 메모리에 카운터/히스토그램을 누적한다. 기본값은 메모리 전용이라 현재 프로세스의 값만 내려주며,
+앱을 불러오는 CLI 스크립트(vacation_archive.py 등)는 파일을 남기지 않는다.
+
+METRICS_MULTIPROCESS=1이면(gunicorn.conf.py가 설정) 파일 모드로 동작한다. 워커는 값이 바뀌면
+METRICS_FLUSH_SECONDS마다 워커별 파일(METRICS_DIR/metrics_<pid>.json)에 기록하고, /admin/metrics를 처리하는
+워커는 자기 값을 먼저 기록한 뒤 디렉터리의 모든 파일을 합산하므로 어느 워커가 요청을 받아도 전체 값이 나온다
+(prometheus_client multiprocess 모드와 같은 방식, 외부 패키지 없이 구현).
+
+- 종료된 워커의 파일은 gunicorn 마스터(child_exit)가 누적 파일(metrics_aggregate.json)에 더한 뒤 삭제하므로
+  카운터가 줄어들지 않고, max_requests로 워커가 재시작되어도 파일 수는 살아 있는 워커 수 + 1로 유지된다.
+  누적 파일에는 합친 워커 pid도 기록해서, 삭제 전에 남아 있는 같은 워커 파일을 두 번 더하지 않는다.
+  디렉터리는 서버 시작 시 clear_directory()로 비운다.
+- 디렉터리에 쓸 수 없으면 현재 프로세스의 값만 내려준다.
+
+업무 지표(휴가 신청/승인, 증명서 생성 시간, 엑셀 출력, 대량 업로드, 잔여 연차 계산)는 아래에 정의한다.
+"""
+
+import atexit
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'vacation_metrics'))
+METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', '5'))
+# 워커별 파일 기록/합산 사용 여부 (gunicorn.conf.py에서 워커용으로 켠다)
+METRICS_MULTIPROCESS = os.environ.get('METRICS_MULTIPROCESS', '0') == '1'
+
+AGGREGATE_FILE = 'metrics_aggregate.json'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger(__name__)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _add_value(totals, key, value):
+    """파일에 기록된 값 합산 (카운터: 숫자, 히스토그램: 목록)"""
+    if not isinstance(value, list):
+        totals[key] = totals.get(key, 0) + value
+        return
+    series = totals.setdefault(key, [0] * len(value))
+    if len(series) != len(value):
+        # 구간 정의가 바뀌기 전 워커가 남긴 값
+        return
+    for i, part in enumerate(value):
+        series[i] += part
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # 다른 프로세스가 교체/삭제 중이거나 손상된 파일
+        return None
+
+
+def _write_json(path, data):
+    """임시 파일에 쓴 뒤 교체 (읽는 쪽이 쓰다 만 파일을 보지 않도록)"""
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} 라벨은 {self.labelnames} 이어야 합니다: {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key, extra=None):
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter(_Metric):
+    """증가만 하는 값"""
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError('카운터는 감소할 수 없습니다.')
+        key = self._key(labels)
+        with self.registry.updating():
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _merge(self, totals, key, value):
+        totals[key] = totals.get(key, 0) + value
+
+    def _render(self, totals):
+        return [f'{self.name}{self._labels(key)} {_format_value(value)}' for key, value in sorted(totals.items())]
+
+
+class Histogram(_Metric):
+    """구간별 누적 개수 + 합계 + 개수 (값: [구간별 개수..., 합계, 개수])"""
+    kind = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.registry.updating():
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록 처리 시간(초) 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _merge(self, totals, key, value):
+        if len(value) != len(self.buckets) + 2:
+            # 구간 정의가 바뀌기 전 워커가 남긴 값
+            return
+        series = totals.setdefault(key, [0] * len(value))
+        for i, part in enumerate(value):
+            series[i] += part
+
+    def _render(self, totals):
+        lines = []
+        for key, series in sorted(totals.items()):
+            for bound, count in zip(self.buckets, series):
+                le = f'le="{bound}"'
+                lines.append(f'{self.name}_bucket{self._labels(key, le)} {count}')
+            le = 'le="+Inf"'
+            lines.append(f'{self.name}_bucket{self._labels(key, le)} {series[-1]}')
+            lines.append(f'{self.name}_sum{self._labels(key)} {series[-2]:.6f}')
+            lines.append(f'{self.name}_count{self._labels(key)} {series[-1]}')
+        return lines
+
+
+class MetricsRegistry:
+    """프로세스별 지표 (파일 모드면 워커별 파일 합산)"""
+
+    def __init__(self, directory=METRICS_DIR, flush_seconds=METRICS_FLUSH_SECONDS, multiprocess=METRICS_MULTIPROCESS):
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self.multiprocess = multiprocess
+        self._metrics = {}
+        self._lock = threading.RLock()
+        self._pid = None
+        self._dirty = False
+        self._write_failed = False
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if existing.kind != metric.kind or existing.labelnames != metric.labelnames:
+                    raise ValueError(f'이미 다른 형태로 등록된 지표입니다: {metric.name}')
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    @contextmanager
+    def updating(self):
+        """지표 값 변경 구간 (포크된 프로세스면 먼저 상태를 초기화)"""
+        if self._pid != os.getpid():
+            self._start_process()
+        with self._lock:
+            yield
+            self._dirty = True
+
+    def _start_process(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None and self.multiprocess:
+                # 포크 전(--preload 마스터)에 쌓인 값은 마스터 파일에 있으므로 자식은 0부터 시작
+                for metric in self._metrics.values():
+                    metric._values.clear()
+            self._pid = os.getpid()
+            self._dirty = False
+            if self.multiprocess:
+                threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+
+    def _flush_loop(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(self.flush_seconds)
+            if self._dirty:
+                self.flush()
+
+    def _path(self, pid=None):
+        return os.path.join(self.directory, f'metrics_{pid or os.getpid()}.json')
+
+    def _aggregate_path(self):
+        return os.path.join(self.directory, AGGREGATE_FILE)
+
+    def _snapshot(self):
+        with self._lock:
+            return {
+                name: {json.dumps(key, ensure_ascii=False): list(value) if isinstance(value, list) else value
+                       for key, value in metric._values.items()}
+                for name, metric in self._metrics.items() if metric._values
+            }
+
+    def flush(self):
+        """현재 프로세스 값을 파일에 기록 (임시 파일에 쓴 뒤 교체, 파일 모드에서만)"""
+        if not self.multiprocess or self._pid != os.getpid():
+            return False
+        with self._lock:
+            self._dirty = False
+            snapshot = self._snapshot()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            _write_json(self._path(), snapshot)
+        except OSError as e:
+            if not self._write_failed:
+                logger.warning(f'⚠️ 지표 파일을 기록하지 못해 이 워커의 값만 제공합니다: {e}')
+                self._write_failed = True
+            return False
+        return True
+
+    def _read_files(self):
+        """워커별 파일 내용 [{지표 이름: {라벨 키: 값}}] (현재 프로세스 파일을 쓸 수 없으면 메모리 값 사용)"""
+        if not self.multiprocess:
+            return [self._snapshot()]
+        snapshots = []
+        skip = {self._aggregate_path()}
+        if self._pid == os.getpid() and not self.flush():
+            snapshots.append(self._snapshot())
+            skip.add(self._path())
+        # 목록을 먼저 구한 뒤 누적 파일을 읽어야, 그 사이 합쳐진 워커 파일을 누적 파일에 포함된 것으로 건너뛴다
+        paths = glob.glob(os.path.join(self.directory, 'metrics_*.json'))
+        aggregate = _read_json(self._aggregate_path()) or {}
+        if aggregate.get('metrics'):
+            snapshots.append(aggregate['metrics'])
+        skip.update(self._path(pid) for pid in aggregate.get('merged', []))
+        for path in paths:
+            if path in skip:
+                continue
+            snapshot = _read_json(path)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+        return snapshots
+
+    def collect(self):
+        """{지표 이름: {라벨 튜플: 합산 값}}"""
+        totals = {name: {} for name in self._metrics}
+        for snapshot in self._read_files():
+            for name, series in snapshot.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                for key, value in series.items():
+                    metric._merge(totals[name], tuple(json.loads(key)), value)
+        return totals
+
+    def render(self):
+        """Prometheus 텍스트 (파일 모드면 모든 워커 합산)"""
+        totals = self.collect()
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            lines.extend(metric._render(totals[name]))
+        return '\n'.join(lines) + '\n'
+
+    def merge_worker_file(self, pid):
+        """종료된 워커의 파일을 누적 파일에 더하고 삭제 (gunicorn 마스터의 child_exit에서 호출)
+
+        마스터가 워커 종료를 하나씩 처리하므로 누적 파일은 한 프로세스만 쓴다.
+        Returns:
+            bool: 합친 파일이 있었는지 여부
+        """
+        if not self.multiprocess:
+            return False
+        path = self._path(pid)
+        snapshot = _read_json(path)
+        if snapshot is None:
+            return False
+
+        aggregate = _read_json(self._aggregate_path()) or {}
+        metrics = aggregate.get('metrics', {})
+        for name, series in snapshot.items():
+            totals = metrics.setdefault(name, {})
+            for key, value in series.items():
+                _add_value(totals, key, value)
+        # 삭제하지 못한 파일의 pid만 남겨서 목록이 계속 늘어나지 않게 한다
+        merged = [old for old in aggregate.get('merged', []) if old != pid and os.path.exists(self._path(old))]
+        try:
+            _write_json(self._aggregate_path(), {'merged': merged + [pid], 'metrics': metrics})
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f'⚠️ 종료된 워커(pid {pid})의 지표 파일을 합치지 못했습니다: {e}')
+            return False
+        return True
+
+    def clear_directory(self):
+        """워커별 파일 삭제 (서버 시작 시, 워커를 띄우기 전에 호출)"""
+        for path in glob.glob(os.path.join(self.directory, 'metrics_*.json*')):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+registry = MetricsRegistry()
+
+
+@atexit.register
+def _flush_on_exit():
+    if registry.multiprocess and registry._dirty:
+        registry.flush()
+
+
+# 업무 지표
+vacation_requests_created = registry.counter(
+    'vacation_requests_created_total', '휴가 신청 생성 수 (source: employee/admin/bulk)', ('source',)
+)
+vacation_decisions = registry.counter(
+    'vacation_decisions_total', '휴가 신청 승인/반려 처리 수 (mode: single/bulk)', ('status', 'mode')
+)
+certificate_generation_seconds = registry.histogram(
+    'certificate_generation_seconds', '재직증명서 문서 생성 시간 (초)', ('channel',),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+export_rows = registry.histogram(
+    'export_rows', '엑셀 출력 행 수', ('export',),
+    buckets=(10, 100, 1000, 5000, 10000, 50000, 100000)
+)
+export_duration_seconds = registry.histogram(
+    'export_duration_seconds', '엑셀 출력 처리 시간 (초, 조회 + 파일 생성)', ('export',)
+)
+bulk_upload_rows = registry.counter(
+    'bulk_upload_rows_total', '대량 업로드 처리 행 수 (result: created/failed)', ('upload', 'result')
+)
+bulk_upload_rows_per_second = registry.histogram(
+    'bulk_upload_rows_per_second', '대량 업로드 처리 속도 (행/초)', ('upload',),
+    buckets=(10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+)
+remaining_vacation_calculations = registry.counter(
+    'remaining_vacation_calculations_total',
+    'calculate_remaining_vacation_days 호출 수 (result: unchanged/corrected/no_record/no_user)', ('result',)
+)
+
+
+def observe_export(export, rows, started):
+    """엑셀 출력 행 수/처리 시간 기록 (started: time.perf_counter() 시작 값)"""
+    export_rows.observe(rows, export=export)
+    export_duration_seconds.observe(time.perf_counter() - started, export=export)
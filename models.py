@@ -26,12 +26,27 @@ class CompanyInfo(db.Model):
     phone = db.Column(db.String(20))  # 전화번호
     fax = db.Column(db.String(20))  # 팩스번호
     website = db.Column(db.String(100))  # 웹사이트
-    stamp_image = db.Column(db.Text)  # 직인 이미지 (base64)
+    stamp_image = db.deferred(db.Column(db.Text))  # (이전 방식) 직인 이미지 base64, 시작 시 stamp_asset으로 옮기고 비움
+    stamp_asset = db.Column(db.String(64), db.ForeignKey('stored_assets.digest'))  # 직인 이미지 (StoredAsset.digest)
     
     def __repr__(self):
         return f'<CompanyInfo {self.name}>'
 
 
+class StoredAsset(db.Model):
+    """내용 주소 기반 바이너리 저장소 (직인 등 이미지, asset_store.py 참고)"""
+    __tablename__ = 'stored_assets'
+    
+    digest = db.Column(db.String(64), primary_key=True)  # 내용의 sha256 (hex)
+    content_type = db.Column(db.String(100), nullable=False)  # 예: image/png
+    size = db.Column(db.Integer, nullable=False)  # 바이트 수
+    data = db.deferred(db.Column(db.LargeBinary, nullable=False))
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    
+    def __repr__(self):
+        return f'<StoredAsset {self.digest[:12]} {self.content_type}>'
+
+
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
     
@@ -46,6 +61,7 @@ class User(UserMixin, db.Model):
     department = db.Column(db.String(50))  # 부서
     position = db.Column(db.String(50))  # 직급
     hire_date = db.Column(db.Date)  # 입사일
+    feed_secret = db.Column(db.String(32))  # 캘린더 구독 URL 비밀값 (재발급하면 이전 URL 무효)
     created_at = db.Column(db.DateTime, default=datetime.now)
     
     # 관계 설정
@@ -85,6 +101,12 @@ class VacationDays(db.Model):
 
 class VacationRequest(db.Model):
     __tablename__ = 'vacation_requests'
+    __table_args__ = (
+        # 직원별 기간 중복 검사용 인덱스
+        db.Index('ix_vacation_requests_user_period', 'user_id', 'start_date', 'end_date'),
+        # 보관 테이블이 원본 id를 유지하므로 SQLite에서도 삭제/보관된 id를 재사용하지 않는다
+        {'sqlite_autoincrement': True},
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -105,10 +127,45 @@ class VacationRequest(db.Model):
     # 관계 설정
     approver = db.relationship('User', foreign_keys=[approved_by])
     
+    # 보관 테이블 행과 구분 (목록 화면에서 처리/삭제 버튼 표시 여부)
+    is_archived = False
+
     def __repr__(self):
         return f'<VacationRequest {self.id} {self.user_id} {self.status}>'
 
 
+class VacationRequestArchive(db.Model):
+    """보관된 과거 휴가 신청 (vacation_archive.py로 이동, id는 원본 그대로 유지)"""
+    __tablename__ = 'vacation_requests_archive'
+    __table_args__ = (
+        db.Index('ix_vacation_requests_archive_user_period', 'user_id', 'start_date', 'end_date'),
+        db.Index('ix_vacation_requests_archive_start_date', 'start_date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)
+    days = db.Column(db.Float, nullable=False)
+    reason = db.Column(db.Text)
+    status = db.Column(db.String(20), nullable=False)
+    type = db.Column(db.String(20), nullable=False)
+    approved_by = db.Column(db.Integer, db.ForeignKey('users.id'))
+    approval_date = db.Column(db.DateTime)
+    comments = db.Column(db.Text)
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.now)  # 보관 처리 일시
+
+    # 관계 설정
+    user = db.relationship('User', foreign_keys=[user_id])
+    approver = db.relationship('User', foreign_keys=[approved_by])
+
+    is_archived = True
+
+    def __repr__(self):
+        return f'<VacationRequestArchive {self.id} {self.user_id} {self.status}>'
+
+
 # 재직증명서 상태 정의
 class CertificateStatus:
     PENDING = '대기중'
@@ -151,3 +208,51 @@ class Holiday(db.Model):
     
     def __repr__(self):
         return f'<Holiday {self.date} {self.name}>'
+
+
+class Department(db.Model):
+    """부서 기준 정보 모델"""
+    __tablename__ = 'departments'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False, unique=True)  # 부서명 (User.department와 동일한 값)
+    sort_order = db.Column(db.Integer, nullable=False, default=0)  # 표시 순서
+    is_active = db.Column(db.Boolean, nullable=False, default=True)  # 검색 목록 노출 여부
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    
+    def __repr__(self):
+        return f'<Department {self.name}>'
+
+
+class DepartmentVacationStats(db.Model):
+    """부서별 월간 휴가 집계 모델 (신청/승인/처리 시 함께 갱신)"""
+    __tablename__ = 'department_vacation_stats'
+    __table_args__ = (
+        db.UniqueConstraint('department_id', 'year', 'month', name='uq_department_vacation_stats_period'),
+        db.Index('ix_department_vacation_stats_year_month', 'year', 'month'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), nullable=False)
+    year = db.Column(db.Integer, nullable=False)  # 휴가 시작일 기준 연도
+    month = db.Column(db.Integer, nullable=False)  # 휴가 시작일 기준 월
+    requested_days = db.Column(db.Float, nullable=False, default=0)  # 신청된 휴가 일수 (상태 무관)
+    approved_days = db.Column(db.Float, nullable=False, default=0)  # 승인된 휴가 일수 (특별휴가 포함)
+    used_days = db.Column(db.Float, nullable=False, default=0)  # 연차에서 차감된 일수 (특별휴가 제외)
+    
+    department = db.relationship('Department', backref=db.backref('vacation_stats', lazy='dynamic'))
+    
+    def __repr__(self):
+        return f'<DepartmentVacationStats {self.department_id} {self.year}-{self.month}>'
+
+
+class DataVersion(db.Model):
+    """데이터 변경 버전 카운터 (캐시 무효화용)"""
+    __tablename__ = 'data_versions'
+    
+    scope = db.Column(db.String(100), primary_key=True)  # 예: 'vacations', 'holidays'
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    
+    def __repr__(self):
+        return f'<DataVersion {self.scope} {self.version}>'
@@ -0,0 +1,236 @@
+"""요청 추적, 경로별 응답 시간 히스토그램, 느린 요청 프로파일
+
+- 요청마다 요청 ID(X-Request-ID)를 붙이고 경로/상태/처리 시간을 한 줄 JSON 로그로 남긴다.
+  느린 요청(SLOW_REQUEST_SECONDS 이상)은 WARNING으로 남긴다.
+- 경로(URL 규칙)별 응답 시간 히스토그램을 지표 레지스트리(metrics_registry)에 모아 /admin/metrics에서
+  Prometheus 텍스트 형식으로 내려준다 (gunicorn 실행 시 모든 워커 합산).
+- 일부 요청(PROFILE_SAMPLE_RATE)과 직전에 느렸던 경로의 다음 요청은 프로파일러를 켠 채 처리하고,
+  느린 요청으로 끝난 경우에만 결과를 PROFILE_DIR에 저장한다 (/admin/profiles에서 내려받기).
+  pyinstrument가 설치되어 있고 PROFILER=pyinstrument이면 HTML 보고서, 아니면 cProfile 통계 텍스트.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from flask import g, request
+from flask_login import current_user
+
+from metrics_registry import registry
+
+# 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SLOW_REQUEST_SECONDS = float(os.environ.get('SLOW_REQUEST_SECONDS', '1.0'))
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0.01'))
+PROFILER = os.environ.get('PROFILER', 'cprofile')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'vacation_profiles'))
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', '50'))
+
+PROFILE_NAME = re.compile(r'^[\w.-]+\.(txt|html)$')
+
+trace_logger = logging.getLogger('request_trace')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+latency = registry.histogram(
+    'http_request_duration_seconds', '경로별 요청 처리 시간 (초)', ('route', 'method', 'status'),
+    buckets=LATENCY_BUCKETS
+)
+
+# 프로파일러는 프로세스에 하나만 켤 수 있으므로 동시에 한 요청만 프로파일
+_profile_lock = threading.Lock()
+# 느렸지만 프로파일하지 못한 경로 (다음 요청을 프로파일)
+_flagged_routes = set()
+
+
+class _Capture:
+    """요청 하나의 프로파일러 (pyinstrument 또는 cProfile)"""
+
+    def __init__(self):
+        self.kind = 'cprofile'
+        self._profiler = None
+        if PROFILER == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+                self._profiler = Profiler()
+                self.kind = 'pyinstrument'
+            except ImportError:
+                pass
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+
+    def start(self):
+        if self.kind == 'pyinstrument':
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self):
+        if self.kind == 'pyinstrument':
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+
+    def render(self):
+        """(확장자, 내용)"""
+        if self.kind == 'pyinstrument':
+            return 'html', self._profiler.output_html()
+        buffer = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=buffer)
+        stats.sort_stats('cumulative').print_stats(60)
+        return 'txt', buffer.getvalue()
+
+
+def _route_label():
+    # 매칭되지 않은 경로는 한 값으로 묶어 라벨 종류가 늘어나지 않게 한다
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+def _should_profile(route):
+    if route in _flagged_routes:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def _save_profile(capture, route, duration):
+    ext, content = capture.render()
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    slug = re.sub(r'[^\w]+', '_', route).strip('_') or 'root'
+    name = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{int(duration * 1000)}ms_{request.method}_{slug}_{os.getpid()}.{ext}"
+    header = '' if ext == 'html' else f'# {request.method} {request.full_path} {duration:.3f}s\n\n'
+    with open(os.path.join(PROFILE_DIR, name), 'w', encoding='utf-8') as f:
+        f.write(header + content)
+
+    # 오래된 파일 정리
+    files = sorted(list_profiles(), key=lambda item: item['created_at'], reverse=True)
+    for old in files[PROFILE_KEEP:]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, old['name']))
+        except OSError:
+            pass
+    return name
+
+
+def list_profiles():
+    """저장된 프로파일 목록 [{'name', 'size', 'created_at'}]"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for name in os.listdir(PROFILE_DIR):
+        if not PROFILE_NAME.match(name):
+            continue
+        stat = os.stat(os.path.join(PROFILE_DIR, name))
+        profiles.append({
+            'name': name,
+            'size': stat.st_size,
+            'created_at': datetime.fromtimestamp(stat.st_mtime).isoformat(timespec='seconds')
+        })
+    return sorted(profiles, key=lambda item: item['created_at'], reverse=True)
+
+
+def _before_request():
+    g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+    g.request_started = time.perf_counter()
+    g.request_capture = None
+
+    route = _route_label()
+    if _should_profile(route) and _profile_lock.acquire(blocking=False):
+        try:
+            capture = _Capture()
+            capture.start()
+            g.request_capture = capture
+            _flagged_routes.discard(route)
+        except Exception:
+            # 다른 프로파일링 도구가 이미 켜져 있는 경우 등
+            _profile_lock.release()
+
+
+def _after_request(response):
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    duration = time.perf_counter() - started
+    route = _route_label()
+
+    capture = g.pop('request_capture', None)
+    profile = None
+    if capture is not None:
+        try:
+            capture.stop()
+            if duration >= SLOW_REQUEST_SECONDS:
+                profile = _save_profile(capture, route, duration)
+        except Exception as e:
+            trace_logger.warning(f'프로파일 저장 실패: {e}')
+        finally:
+            _profile_lock.release()
+    elif duration >= SLOW_REQUEST_SECONDS:
+        _flagged_routes.add(route)
+
+    latency.observe(duration, route=route, method=request.method, status=response.status_code)
+    response.headers['X-Request-ID'] = g.request_id
+
+    record = {
+        'request_id': g.request_id,
+        'method': request.method,
+        'route': route,
+        'path': request.path,
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000, 1),
+        'user_id': current_user.get_id() if current_user and current_user.is_authenticated else None,
+    }
+    if profile:
+        record['profile'] = profile
+    level = logging.WARNING if duration >= SLOW_REQUEST_SECONDS else logging.INFO
+    trace_logger.log(level, json.dumps(record, ensure_ascii=False))
+    return response
+
+
+def _teardown_request(exc):
+    # after_request까지 가지 못하고 끝난 요청의 프로파일러 정리
+    capture = g.pop('request_capture', None)
+    if capture is not None:
+        try:
+            capture.stop()
+        finally:
+            _profile_lock.release()
+
+
+def render_metrics():
+    """/admin/metrics 응답 본문 (레지스트리 지표 + 이 워커의 템플릿 조각 캐시 통계)"""
+    from fragment_cache import fragment_cache
+
+    stats = fragment_cache.stats()
+    lines = [
+        '# HELP fragment_cache_lookups_total 템플릿 조각 캐시 조회 수 (현재 워커)',
+        '# TYPE fragment_cache_lookups_total counter',
+    ]
+    for name, counts in stats['fragments'].items():
+        for result in ('hits', 'shared_hits', 'misses'):
+            lines.append(f'fragment_cache_lookups_total{{fragment="{_escape(name)}",result="{result}"}} {counts[result]}')
+    lines += [
+        '# HELP fragment_cache_entries 프로세스 조각 캐시 항목 수',
+        '# TYPE fragment_cache_entries gauge',
+        f"fragment_cache_entries {stats['entries']}",
+    ]
+    return registry.render() + '\n'.join(lines) + '\n'
+
+
+def init_app(app):
+    """요청 추적/측정 훅 등록"""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, render_template, redirect, url_for, flash, request, make_response, abort
 from flask_login import login_required, current_user
 from app import db
 from models import User, VacationDays, VacationRequest
@@ -41,6 +41,44 @@ def manual():
     """시스템 사용설명서"""
     return render_template('manual.html')
 
+@main_bp.route('/assets/<digest>')
+@login_required
+def stored_asset(digest):
+    """저장소 이미지 (내용 해시 주소이므로 영구 캐시)"""
+    if request.if_none_match.contains(digest):
+        response = make_response('', 304)
+    else:
+        from asset_store import load_asset
+        asset = load_asset(digest)
+        if asset is None:
+            abort(404)
+        content_type, data = asset
+        response = make_response(data)
+        response.headers['Content-Type'] = content_type
+    response.set_etag(digest)
+    response.headers['Cache-Control'] = 'private, max-age=31536000, immutable'
+    return response
+
+@main_bp.route('/assets/<digest>/<variant>.png')
+@login_required
+def stored_asset_variant(digest, variant):
+    """저장소 이미지를 정해진 크기로 줄인 PNG (원본 대신 화면 미리보기에 사용)"""
+    from asset_store import VARIANT_SIZES, asset_png
+    if variant not in VARIANT_SIZES:
+        abort(404)
+    etag = f'{digest}-{variant}'
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        data = asset_png(digest, VARIANT_SIZES[variant])
+        if data is None:
+            abort(404)
+        response = make_response(data)
+        response.headers['Content-Type'] = 'image/png'
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, max-age=31536000, immutable'
+    return response
+
 @main_bp.app_context_processor
 def inject_today():
     """템플릿에서 사용할 전역 변수"""
@@ -0,0 +1,60 @@
+"""스키마 보정
+
+db.create_all()은 이미 존재하는 테이블에는 아무것도 하지 않으므로,
+기존 테이블에 모델에서 새로 선언한 컬럼과 인덱스를 추가로 생성한다.
+"""
+
+from sqlalchemy import inspect, text
+
+from app import db
+
+
+def ensure_columns():
+    """모델에 선언되었지만 데이터베이스에 없는 컬럼 추가
+
+    기존 행이 있어도 추가할 수 있는 NULL 허용 컬럼만 대상으로 한다 (외래키 제약은 추가하지 않음).
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    dialect = db.engine.dialect
+    preparer = dialect.identifier_preparer
+
+    created = []
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                if not column.nullable:
+                    print(f"⚠️ NOT NULL 컬럼은 자동으로 추가하지 않습니다: {table.name}.{column.name}")
+                    continue
+                column_type = column.type.compile(dialect=dialect)
+                connection.execute(text(
+                    f'ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {column_type}'
+                ))
+                created.append(f'{table.name}.{column.name}')
+
+    return created
+
+
+def ensure_indexes():
+    """모델에 선언되었지만 데이터베이스에 없는 인덱스 생성"""
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+
+    created = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(bind=db.engine, checkfirst=True)
+                created.append(index.name)
+
+    return created
@@ -29,18 +29,7 @@ echo "🗄️  데이터베이스 초기 설정 중..."
 python3 create_admin.py
 python3 add_holidays.py
 
-echo "🎯 성능 최적화된 애플리케이션 시작..."
-# 성능 최적화된 Gunicorn 설정
-exec gunicorn \
-    --bind 0.0.0.0:$PORT \
-    --workers 2 \
-    --worker-class sync \
-    --worker-connections 1000 \
-    --timeout 30 \
-    --keep-alive 2 \
-    --max-requests 1000 \
-    --max-requests-jitter 50 \
-    --preload \
-    --access-logfile - \
-    --error-logfile - \
-    main:app
\ No newline at end of file
+echo "🎯 애플리케이션 시작 (워커 방식: ${GUNICORN_PROFILE:-gthread})..."
+# 워커 수/방식/스레드 등은 gunicorn.conf.py에서 환경변수로 설정
+# (WEB_CONCURRENCY, GUNICORN_PROFILE=gthread|gevent|sync, GUNICORN_THREADS, GUNICORN_WORKER_CONNECTIONS)
+exec gunicorn --config gunicorn.conf.py main:app
@@ -0,0 +1,173 @@
+/**
+ * 직원 선택 자동완성
+ *
+ * <select data-employee-lookup="/admin/employees/search"> 를 검색 입력창으로 바꾼다.
+ * 입력한 검색어로 직원 검색 API를 호출해 한 페이지씩 보여주고(검색어가 없으면 이름순 목록),
+ * 선택한 직원은 원래 select 값으로 넣어서 폼 전송/서버 검증은 그대로 사용한다.
+ */
+
+document.addEventListener('DOMContentLoaded', function() {
+    const DEBOUNCE_MS = 200;
+    const RESULT_LIMIT = 10;
+
+    function employeeLabel(employee) {
+        return `${employee.name} (${employee.department || '미지정'})`;
+    }
+
+    function setupPicker(select) {
+        const lookupUrl = select.dataset.employeeLookup;
+
+        const wrapper = document.createElement('div');
+        wrapper.style.position = 'relative';
+
+        const input = document.createElement('input');
+        input.type = 'text';
+        input.className = select.className;
+        input.placeholder = '이름, 아이디, 부서, 이메일로 검색';
+        input.autocomplete = 'off';
+        input.setAttribute('role', 'combobox');
+        input.setAttribute('aria-autocomplete', 'list');
+        input.setAttribute('aria-expanded', 'false');
+
+        const list = document.createElement('ul');
+        list.setAttribute('role', 'listbox');
+        list.style.cssText = 'display: none; position: absolute; left: 0; right: 0; z-index: 1000; margin: 2px 0 0; padding: 0; list-style: none; background: white; border: 1px solid #ced4da; border-radius: 6px; box-shadow: 0 4px 12px rgba(0,0,0,0.1); max-height: 320px; overflow-y: auto;';
+
+        select.parentNode.insertBefore(wrapper, select);
+        wrapper.appendChild(input);
+        wrapper.appendChild(list);
+        wrapper.appendChild(select);
+        select.style.display = 'none';
+
+        // 서버에서 선택된 값이 있으면 (검증 실패 후 다시 표시 등) 입력창에 이름 표시
+        const selected = select.options[select.selectedIndex];
+        if (selected && selected.value) {
+            input.value = selected.textContent;
+        }
+
+        let results = [];
+        let active = -1;
+        let timer = null;
+        let sequence = 0;
+        let lastQuery = '';
+        let nextPage = null;
+
+        function close() {
+            list.style.display = 'none';
+            input.setAttribute('aria-expanded', 'false');
+            active = -1;
+        }
+
+        function highlight(index) {
+            Array.from(list.children).forEach((item, i) => {
+                item.style.background = i === index ? '#e7f1ff' : '';
+            });
+            active = index;
+        }
+
+        function choose(employee) {
+            let option = Array.from(select.options).find(opt => opt.value === String(employee.id));
+            if (!option) {
+                option = new Option(employeeLabel(employee), employee.id);
+                select.appendChild(option);
+            }
+            select.value = String(employee.id);
+            select.dispatchEvent(new Event('change', { bubbles: true }));
+            input.value = employeeLabel(employee);
+            close();
+        }
+
+        function render(items, query, hasNext) {
+            results = items;
+            list.innerHTML = '';
+            if (!items.length) {
+                const empty = document.createElement('li');
+                empty.textContent = query ? `'${query}'에 해당하는 직원이 없습니다.` : '등록된 직원이 없습니다.';
+                empty.style.cssText = 'padding: 8px 12px; color: #6c757d; font-size: 13px;';
+                list.appendChild(empty);
+            }
+            items.forEach((employee, index) => {
+                const item = document.createElement('li');
+                item.setAttribute('role', 'option');
+                item.style.cssText = 'padding: 8px 12px; cursor: pointer; font-size: 14px;';
+                item.textContent = employeeLabel(employee);
+
+                const detail = document.createElement('span');
+                detail.textContent = ` · ${employee.username}${employee.position ? ' · ' + employee.position : ''}`;
+                detail.style.cssText = 'color: #6c757d; font-size: 12px;';
+                item.appendChild(detail);
+
+                item.addEventListener('mousedown', function(event) {
+                    event.preventDefault();  // 입력창 blur보다 먼저 선택 처리
+                    choose(employee);
+                });
+                item.addEventListener('mouseenter', () => highlight(index));
+                list.appendChild(item);
+            });
+            if (hasNext) {
+                const more = document.createElement('li');
+                more.textContent = '더 보기';
+                more.style.cssText = 'padding: 8px 12px; cursor: pointer; text-align: center; color: #003d82; font-size: 13px; border-top: 1px solid #e9ecef;';
+                more.addEventListener('mousedown', function(event) {
+                    event.preventDefault();
+                    search(lastQuery, nextPage);
+                });
+                list.appendChild(more);
+            }
+            list.style.display = 'block';
+            input.setAttribute('aria-expanded', 'true');
+            active = -1;
+        }
+
+        function search(query, page = 1) {
+            const current = ++sequence;
+            const url = `${lookupUrl}?q=${encodeURIComponent(query)}&page=${page}&limit=${RESULT_LIMIT}`;
+            fetch(url, { headers: { 'Accept': 'application/json' }, credentials: 'same-origin' })
+                .then(response => {
+                    if (!response.ok) throw new Error(response.status);
+                    return response.json();
+                })
+                .then(data => {
+                    // 늦게 도착한 이전 검색 결과는 무시
+                    if (current !== sequence) return;
+                    lastQuery = query;
+                    nextPage = data.has_next ? data.page + 1 : null;
+                    render(page > 1 ? results.concat(data.results) : data.results, query, data.has_next);
+                })
+                .catch(error => console.error('직원 검색 오류:', error));
+        }
+
+        input.addEventListener('input', function() {
+            // 입력을 바꾸면 이전 선택은 취소
+            select.value = '';
+            clearTimeout(timer);
+            const query = input.value.trim();
+            timer = setTimeout(() => search(query), DEBOUNCE_MS);
+        });
+
+        // 검색어 없이 입력창을 누르면 이름순 목록 표시
+        input.addEventListener('focus', function() {
+            if (!input.value.trim()) search('');
+        });
+
+        input.addEventListener('keydown', function(event) {
+            if (list.style.display === 'none' || !results.length) return;
+            if (event.key === 'ArrowDown') {
+                event.preventDefault();
+                highlight(Math.min(active + 1, results.length - 1));
+            } else if (event.key === 'ArrowUp') {
+                event.preventDefault();
+                highlight(Math.max(active - 1, 0));
+            } else if (event.key === 'Enter') {
+                event.preventDefault();  // 직원 선택 중에는 폼 전송 방지
+                choose(results[active >= 0 ? active : 0]);
+            } else if (event.key === 'Escape') {
+                close();
+            }
+        });
+
+        input.addEventListener('blur', close);
+    }
+
+    document.querySelectorAll('select[data-employee-lookup]').forEach(setupPicker);
+});
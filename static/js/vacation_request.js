@@ -52,7 +52,93 @@ document.addEventListener('DOMContentLoaded', function() {
         calculateBtn.addEventListener('click', calculateVacationDays);
     }
     
-    // 휴가 일수 계산 함수
+    // 공휴일 비트마스크 (서버 왕복 없이 일수를 계산하기 위해 연 단위로 받아둔다)
+    const holidayMaskUrl = vacationForm.dataset.holidayMaskUrl;
+    const calculateUrl = vacationForm.dataset.calculateUrl || '/employee/calculate-vacation-days';
+    const holidayWindows = [];
+    const DAY_MS = 24 * 60 * 60 * 1000;
+    let calculationSeq = 0;
+    
+    function parseDate(value) {
+        const parts = value.split('-').map(Number);
+        return Date.UTC(parts[0], parts[1] - 1, parts[2]);
+    }
+    
+    function decodeMask(data) {
+        const binary = atob(data.mask);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        return {start: parseDate(data.start), end: parseDate(data.end), bytes: bytes};
+    }
+    
+    function findWindow(start, end) {
+        return holidayWindows.find(w => w.start <= start && end <= w.end);
+    }
+    
+    function loadHolidayWindow(start, end) {
+        const found = findWindow(start, end);
+        if (found) return Promise.resolve(found);
+        if (!holidayMaskUrl) return Promise.reject(new Error('공휴일 정보 URL 없음'));
+        
+        const startYear = new Date(start).getUTCFullYear();
+        const years = new Date(end).getUTCFullYear() - startYear + 1;
+        return fetch(holidayMaskUrl + '?year=' + startYear + '&years=' + Math.max(years, 2), {credentials: 'same-origin'})
+            .then(response => {
+                if (!response.ok) throw new Error('공휴일 정보 조회 실패');
+                return response.json();
+            })
+            .then(data => {
+                const holidayWindow = decodeMask(data);
+                holidayWindows.push(holidayWindow);
+                if (!(holidayWindow.start <= start && end <= holidayWindow.end)) throw new Error('조회 기간 초과');
+                return holidayWindow;
+            });
+    }
+    
+    // 주말과 공휴일을 제외한 일수 (서버의 get_vacation_days_count와 같은 규칙)
+    function countBusinessDays(start, end, holidayWindow) {
+        let count = 0;
+        for (let day = start; day <= end; day += DAY_MS) {
+            const weekday = new Date(day).getUTCDay();
+            const offset = Math.round((day - holidayWindow.start) / DAY_MS);
+            const isHoliday = (holidayWindow.bytes[offset >> 3] >> (offset & 7)) & 1;
+            if (weekday !== 0 && weekday !== 6 && !isHoliday) {
+                count++;
+            }
+        }
+        return count;
+    }
+    
+    function showDays(days) {
+        calculatedDaysElement.textContent = days + '일';
+        daysHiddenInput.value = days;
+        
+        // 0일인 경우 (주말/공휴일만 있는 경우) 경고 표시
+        if (days === 0) {
+            calculatedDaysElement.innerHTML = '<span class="text-red-600">0일 (선택한 기간에 평일이 없습니다)</span>';
+        }
+    }
+    
+    // 공휴일 정보를 받지 못하면 서버에서 계산
+    function calculateOnServer(startDate, endDate, type) {
+        return fetch(calculateUrl, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                start_date: startDate,
+                end_date: endDate,
+                type: type
+            }),
+        })
+        .then(response => response.json())
+        .then(data => data.days);
+    }
+    
+    // 휴가 일수 계산 함수 (신청 시에는 서버에서 다시 계산한 값으로 저장된다)
     function calculateVacationDays() {
         if (!startDateInput || !endDateInput || !typeSelect || !daysHiddenInput || !calculatedDaysElement) {
             return;
@@ -71,32 +157,25 @@ document.addEventListener('DOMContentLoaded', function() {
             return;
         }
         
-        // API를 통해 휴가 일수 계산
-        fetch('/employee/calculate-vacation-days', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                start_date: startDate,
-                end_date: endDate,
-                type: type
-            }),
-        })
-        .then(response => response.json())
-        .then(data => {
-            calculatedDaysElement.textContent = data.days + '일';
-            daysHiddenInput.value = data.days;
-            
-            // 0일인 경우 (주말/공휴일만 있는 경우) 경고 표시
-            if (data.days === 0) {
-                calculatedDaysElement.innerHTML = '<span class="text-red-600">0일 (선택한 기간에 평일이 없습니다)</span>';
-            }
-        })
-        .catch(error => {
-            console.error('Error:', error);
-            calculatedDaysElement.textContent = '계산 오류';
-        });
+        const start = parseDate(startDate);
+        const end = parseDate(endDate);
+        if (start > end) {
+            showDays(0);
+            return;
+        }
+        
+        const seq = ++calculationSeq;
+        loadHolidayWindow(start, end)
+            .then(holidayWindow => countBusinessDays(start, end, holidayWindow))
+            .catch(() => calculateOnServer(startDate, endDate, type))
+            .then(days => {
+                // 더 최근에 시작한 계산이 있으면 무시
+                if (seq === calculationSeq) showDays(days);
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                calculatedDaysElement.textContent = '계산 오류';
+            });
     }
     
     // 폼 제출 전 유효성 검사
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""휴가 신청 일괄 승인 테스트 (연차/반차/특별휴가 혼합)
+
+운영 DB를 건드리지 않도록 앱을 불러오기 전에 임시 디렉터리의 SQLite 파일을 지정한다.
+
+    python -m pytest -q test_bulk_decision.py
+    python test_bulk_decision.py
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import date
+
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(prefix='bulk_decision_'), 'test.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DATABASE_PATH}'
+
+# Flask 앱 컨텍스트 설정
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from app import app, db
+from models import User, Role, VacationDays, VacationRequest, VacationStatus, DepartmentVacationStats
+from bulk_decision import (SKIP_INSUFFICIENT, SKIP_NOT_FOUND, SKIP_NOT_PENDING,
+                           decide_vacation_requests, _lock_balances)
+from department_stats import get_department, record_vacation_added
+
+YEAR = 2030
+DEPARTMENT = '품질팀'
+
+
+def _create_employee(username, total_days, used_days):
+    user = User(username=username, email=f'{username}@sspower.com', name=username, role=Role.EMPLOYEE,
+                department=DEPARTMENT, position='사원', hire_date=date(2020, 1, 1))
+    user.set_password('test123456')
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(VacationDays(user_id=user.id, year=YEAR, total_days=total_days, used_days=used_days))
+    return user
+
+
+def _request(user, day, days, vacation_type, status=VacationStatus.PENDING):
+    vacation_request = VacationRequest(user_id=user.id, start_date=date(YEAR, 3, day), end_date=date(YEAR, 3, day),
+                                       days=days, type=vacation_type, status=status, reason='테스트')
+    db.session.add(vacation_request)
+    db.session.flush()
+    record_vacation_added(vacation_request, user)
+    return vacation_request
+
+
+def _used_days(user):
+    return VacationDays.query.filter_by(user_id=user.id, year=YEAR).one().used_days
+
+
+def test_mixed_batch():
+    """잔여 연차가 충분한 직원은 모두 승인, 부족한 직원은 연차/반차만 제외하고 특별휴가는 승인"""
+    assert app.config['SQLALCHEMY_DATABASE_URI'].endswith(DATABASE_PATH)
+
+    with app.app_context():
+        enough = _create_employee('bulk_enough', total_days=15, used_days=13)  # 잔여 2일
+        short = _create_employee('bulk_short', total_days=15, used_days=14)  # 잔여 1일
+        admin = User.query.filter_by(role=Role.ADMIN).first()
+
+        enough_annual = _request(enough, 2, 1.0, '연차')
+        enough_half = _request(enough, 3, 0.5, '반차(오전)')
+        enough_special = _request(enough, 4, 3.0, '특별휴가')
+        short_annual = _request(short, 2, 1.0, '연차')
+        short_half = _request(short, 3, 0.5, '반차(오후)')
+        short_special = _request(short, 4, 2.0, '특별휴가')
+        already = _request(short, 5, 1.0, '연차', status=VacationStatus.REJECTED)
+        db.session.commit()
+
+        request_ids = [enough_annual.id, enough_half.id, enough_special.id,
+                       short_annual.id, short_half.id, short_special.id, already.id, 999999]
+        result = decide_vacation_requests(request_ids, VacationStatus.APPROVED, admin.id)
+        db.session.commit()
+
+        skipped = {item['id']: item['reason'] for item in result['skipped']}
+        assert skipped == {
+            short_annual.id: SKIP_INSUFFICIENT,
+            short_half.id: SKIP_INSUFFICIENT,
+            already.id: SKIP_NOT_PENDING,
+            999999: SKIP_NOT_FOUND,
+        }
+        assert result['processed'] == 4
+
+        # 특별휴가는 사용 일수에 더하지 않는다
+        assert _used_days(enough) == 14.5
+        assert _used_days(short) == 14
+
+        statuses = {vacation.id: vacation.status for vacation in VacationRequest.query.filter(
+            VacationRequest.id.in_(request_ids))}
+        assert statuses[enough_special.id] == VacationStatus.APPROVED
+        assert statuses[short_special.id] == VacationStatus.APPROVED
+        assert statuses[short_annual.id] == VacationStatus.PENDING
+        assert statuses[short_half.id] == VacationStatus.PENDING
+
+        # 부서 집계: 승인 일수는 특별휴가 포함, 사용 일수는 제외
+        stats = DepartmentVacationStats.query.filter_by(
+            department_id=get_department(DEPARTMENT).id, year=YEAR, month=3).one()
+        assert stats.approved_days == 1.0 + 0.5 + 3.0 + 2.0
+        assert stats.used_days == 1.0 + 0.5
+
+
+def test_balance_rows_locked_until_commit():
+    """잔여 연차 확인 후 차감할 때까지 다른 연결이 연차 행을 바꿀 수 없다"""
+    with app.app_context():
+        user = _create_employee('bulk_locked', total_days=15, used_days=0)
+        db.session.commit()
+
+        _lock_balances({(user.id, YEAR)})
+        other = sqlite3.connect(DATABASE_PATH, timeout=0)
+        try:
+            other.execute('UPDATE vacation_days SET used_days = 15 WHERE user_id = ?', (user.id,))
+            raise AssertionError('잠금 중인 연차 행이 다른 연결에서 변경되었습니다.')
+        except sqlite3.OperationalError as e:
+            assert 'locked' in str(e)
+        finally:
+            other.close()
+            db.session.rollback()
+
+
+if __name__ == '__main__':
+    test_mixed_batch()
+    test_balance_rows_locked_until_commit()
+    print('✅ 일괄 승인 테스트 통과')
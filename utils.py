@@ -1,6 +1,7 @@
 from app import db
-from models import Holiday, VacationRequest
+from models import Holiday, VacationRequest, VacationStatus
 from datetime import datetime, timedelta
+from metrics_registry import remaining_vacation_calculations
 
 def is_weekend(date):
     """주말인지 확인 (토:5, 일:6)"""
@@ -11,6 +12,11 @@ def is_holiday(date):
     holiday = Holiday.query.filter_by(date=date).first()
     return holiday is not None
 
+def holiday_dates(start_date, end_date):
+    """기간 안의 공휴일 날짜 집합 (한 번의 범위 조회)"""
+    rows = db.session.query(Holiday.date).filter(Holiday.date.between(start_date, end_date)).all()
+    return {row.date for row in rows}
+
 def get_vacation_days_count(start_date, end_date, vacation_type=None):
     """휴가 일수 계산 (주말, 공휴일 제외)"""
     if start_date > end_date:
@@ -20,35 +26,84 @@ def get_vacation_days_count(start_date, end_date, vacation_type=None):
     if vacation_type and '반차' in vacation_type:
         return 0.5
     
-    # 같은 날짜면 1일
-    if start_date == end_date:
-        if is_weekend(start_date) or is_holiday(start_date):
-            return 0
-        return 1
-    
+    holidays = holiday_dates(start_date, end_date)
     business_days = 0
     current_date = start_date
     
     while current_date <= end_date:
-        if not is_weekend(current_date) and not is_holiday(current_date):
+        if not is_weekend(current_date) and current_date not in holidays:
             business_days += 1
         current_date += timedelta(days=1)
     
     return business_days
 
-def check_overlapping_vacation(user_id, start_date, end_date):
-    """같은 기간에 이미 신청한 휴가가 있는지 확인"""
-    overlapping = VacationRequest.query.filter(
+# 기간을 점유하는 휴가 상태 (반려/취소된 신청은 중복 검사에서 제외)
+ACTIVE_VACATION_STATUSES = (VacationStatus.PENDING, VacationStatus.APPROVED)
+
+# IN 절 한 번에 넣을 직원 수 (SQLite 바인드 변수 제한 고려)
+OVERLAP_BATCH_SIZE = 500
+
+def find_overlapping_vacation(user_id, start_date, end_date, exclude_id=None):
+    """같은 기간에 겹치는 유효한(대기/승인) 휴가 신청 조회 (user_id, start_date, end_date 인덱스 사용)"""
+    query = VacationRequest.query.filter(
         VacationRequest.user_id == user_id,
         VacationRequest.start_date <= end_date,
-        VacationRequest.end_date >= start_date
-    ).first()
+        VacationRequest.end_date >= start_date,
+        VacationRequest.status.in_(ACTIVE_VACATION_STATUSES)
+    )
+    if exclude_id is not None:
+        query = query.filter(VacationRequest.id != exclude_id)
     
-    return overlapping is not None
+    return query.first()
+
+def check_overlapping_vacation(user_id, start_date, end_date):
+    """같은 기간에 이미 신청한 휴가가 있는지 확인"""
+    return find_overlapping_vacation(user_id, start_date, end_date) is not None
+
+def check_overlapping_vacations(candidates):
+    """여러 (user_id, start_date, end_date) 후보 기간을 한 번에 중복 검사
+    
+    반환값: {후보 인덱스: [겹치는 휴가 신청 id, ...]} (겹치는 후보만 포함)
+    """
+    if not candidates:
+        return {}
+    
+    min_start = min(start for _, start, _ in candidates)
+    max_end = max(end for _, _, end in candidates)
+    user_ids = sorted({user_id for user_id, _, _ in candidates})
+    
+    # 후보 기간 전체를 덮는 범위에서 직원별 유효 휴가 구간 조회
+    intervals = {}
+    for i in range(0, len(user_ids), OVERLAP_BATCH_SIZE):
+        chunk = user_ids[i:i + OVERLAP_BATCH_SIZE]
+        rows = db.session.query(
+            VacationRequest.id,
+            VacationRequest.user_id,
+            VacationRequest.start_date,
+            VacationRequest.end_date
+        ).filter(
+            VacationRequest.user_id.in_(chunk),
+            VacationRequest.start_date <= max_end,
+            VacationRequest.end_date >= min_start,
+            VacationRequest.status.in_(ACTIVE_VACATION_STATUSES)
+        ).all()
+        for request_id, user_id, start, end in rows:
+            intervals.setdefault(user_id, []).append((start, end, request_id))
+    
+    conflicts = {}
+    for position, (user_id, start, end) in enumerate(candidates):
+        overlapping = [
+            request_id for existing_start, existing_end, request_id in intervals.get(user_id, ())
+            if existing_start <= end and existing_end >= start
+        ]
+        if overlapping:
+            conflicts[position] = overlapping
+    
+    return conflicts
 
 def calculate_remaining_vacation_days(user_id, year=None):
     """사용자의 잔여 휴가일수 계산"""
-    from models import User, VacationDays
+    from models import User
     
     if year is None:
         year = datetime.now().year
@@ -56,41 +111,53 @@ def calculate_remaining_vacation_days(user_id, year=None):
     # 사용자 정보 조회
     user = User.query.get(user_id)
     if not user:
+        remaining_vacation_calculations.inc(result='no_user')
         return 0
     
-    # 해당 연도의 휴가 일수 설정 조회
-    vacation_days = VacationDays.query.filter_by(
-        user_id=user_id,
-        year=year
-    ).first()
+    # 해당 연도의 휴가 일수 설정 조회 (없으면 부여 기준으로 계산만 하고 저장하지 않음)
+    from year_rollover import get_vacation_days
+    vacation_days = get_vacation_days(user_id, year, user)
     
-    # 없으면 기본값으로 생성
-    if not vacation_days:
-        vacation_days = VacationDays(
-            user_id=user_id,
-            year=year,
-            total_days=15,  # 기본값
-            used_days=0
-        )
-        db.session.add(vacation_days)
-        db.session.commit()
-    
-    # 해당 연도의 승인된 휴가 총 일수 계산
+    # 해당 연도의 승인된 휴가 총 일수 계산 (보관된 연도면 보관 테이블도 합산, 특별휴가는 연차 차감 없음)
     from sqlalchemy import func
-    used_days = db.session.query(
-        func.coalesce(func.sum(VacationRequest.days), 0)
-    ).filter(
-        VacationRequest.user_id == user_id,
-        VacationRequest.status == '승인됨',
-        func.strftime('%Y', VacationRequest.start_date) == str(year)
-    ).scalar()
+    from vacation_archive import year_range, vacation_sources
+    from department_stats import NON_DEDUCTIBLE_TYPES
+    year_start, year_end = year_range(year)
+    used_days = 0
+    for model in vacation_sources(year_start, year_end):
+        used_days += db.session.query(
+            func.coalesce(func.sum(model.days), 0)
+        ).filter(
+            model.user_id == user_id,
+            model.status == '승인됨',
+            model.type.notin_(NON_DEDUCTIBLE_TYPES),
+            model.start_date.between(year_start, year_end)
+        ).scalar()
     
-    # VacationDays 테이블의 used_days도 업데이트
-    vacation_days.used_days = used_days or 0
-    db.session.commit()
+    # VacationDays 테이블의 used_days도 업데이트 (저장된 레코드가 있고 값이 다를 때만)
+    # 읽은 값과 같을 때만 쓰므로 그 사이 승인/삭제로 바뀐 값을 덮어쓰지 않는다
+    used_days = used_days or 0
+    if vacation_days.id is None:
+        remaining_vacation_calculations.inc(result='no_record')
+    elif vacation_days.used_days == used_days:
+        remaining_vacation_calculations.inc(result='unchanged')
+    else:
+        from sqlalchemy import update
+        from models import VacationDays
+        from data_versions import bump_version, user_scope
+        written = db.session.execute(
+            update(VacationDays)
+            .where(VacationDays.id == vacation_days.id, VacationDays.used_days == vacation_days.used_days)
+            .values(used_days=used_days)
+            .execution_options(synchronize_session='fetch')
+        ).rowcount
+        if written:
+            bump_version(user_scope(user_id))
+        db.session.commit()
+        remaining_vacation_calculations.inc(result='corrected')
     
     # 잔여 휴가일수 = 총 휴가일수 - 사용한 휴가일수
-    remaining = vacation_days.total_days - (used_days or 0)
+    remaining = vacation_days.total_days - used_days
     return max(0, remaining)  # 음수가 되지 않도록
 
 def get_current_year_vacations(year=None):
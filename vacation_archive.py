@@ -0,0 +1,182 @@
+"""과거 휴가 신청 보관 및 조회 라우팅
+
+업무 화면은 대부분 올해와 작년 휴가만 다루므로, 그 이전 연도에 시작한 처리 완료(승인/반려) 신청은
+vacation_requests_archive 테이블로 옮겨서 목록/엑셀 조회가 작은 현재 테이블만 읽도록 한다.
+SQLite/PostgreSQL 모두 같은 보관 테이블 방식을 사용한다 (기존 테이블을 파티션 테이블로 바꾸려면
+기본키에 start_date가 포함되어야 해서 마이그레이션 없이 적용할 수 없다).
+
+조회 라우터(vacation_sources/query_vacations)는 검색 기간이 보관된 범위에 닿을 때만 보관 테이블을 함께 읽는다.
+기간 조건이 없는 기본 목록은 현재 테이블만 조회한다.
+
+보관 테이블은 원본 id를 그대로 쓴다. AUTOINCREMENT 없이 만들어진 기존 SQLite 테이블은 가장 큰 id가
+보관/삭제된 뒤 같은 id를 다시 발급할 수 있으므로, 이미 보관 테이블에 있는 id는 옮기지 않고 건너뛴 id로 보고한다.
+
+매년 초에 실행한다 (예: 매년 1월 2일 03:00 cron):
+    python vacation_archive.py                 # 올해 - VACATION_ACTIVE_YEARS + 1 이전 연도 보관
+    python vacation_archive.py --before 2024-01-01 [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, func, insert, literal, select
+
+from app import db
+from models import User, VacationRequest, VacationRequestArchive, VacationStatus
+from data_versions import VACATIONS, bump_version, user_scope, department_scope
+
+# 현재 테이블에 남겨둘 연도 수 (기본 2: 올해 + 작년)
+ACTIVE_YEARS = int(os.environ.get('VACATION_ACTIVE_YEARS', '2'))
+
+# 원본과 보관 테이블에 공통인 컬럼
+_COLUMNS = [column.name for column in VacationRequest.__table__.columns]
+
+
+def archive_cutoff(today=None):
+    """이 날짜 이전에 시작한 휴가를 보관 대상으로 본다"""
+    today = today or date.today()
+    return date(today.year - ACTIVE_YEARS + 1, 1, 1)
+
+
+def year_range(year, month=None):
+    """연도(월) 검색 조건의 시작일/종료일 (양 끝 포함)"""
+    if month:
+        first = date(year, month, 1)
+        last = (first.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        return first, last
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def archived_through():
+    """보관 테이블의 가장 늦은 휴가 시작일 (보관된 데이터가 없으면 None)"""
+    return db.session.query(func.max(VacationRequestArchive.start_date)).scalar()
+
+
+def vacation_sources(date_from=None, date_to=None):
+    """검색 기간(휴가 시작일 기준)에 해당하는 모델 목록
+
+    기간 조건이 없으면 현재 테이블만, 시작 조건이 보관된 범위 이전이거나 종료 조건만 있으면 보관 테이블도 포함한다.
+    """
+    if date_from is None and date_to is None:
+        return [VacationRequest]
+
+    through = archived_through()
+    if through is not None and (date_from is None or date_from <= through):
+        return [VacationRequest, VacationRequestArchive]
+    return [VacationRequest]
+
+
+def query_vacations(build_query, date_from=None, date_to=None, key=None, reverse=True):
+    """모델별 쿼리(build_query(model))를 필요한 테이블에만 실행하고 결과를 합쳐 정렬
+
+    key를 주지 않으면 행의 created_at 기준 최신순으로 정렬한다.
+    """
+    sources = vacation_sources(date_from, date_to)
+    if len(sources) == 1:
+        return build_query(sources[0]).all()
+
+    rows = []
+    for model in sources:
+        rows.extend(build_query(model).all())
+    return sorted(rows, key=key or (lambda row: row.created_at), reverse=reverse)
+
+
+def _archive_criteria(before):
+    return (
+        VacationRequest.start_date < before,
+        VacationRequest.status != VacationStatus.PENDING
+    )
+
+
+def _archived_ids():
+    return select(VacationRequestArchive.id)
+
+
+def count_archivable(before):
+    """보관 대상 건수 (id 충돌로 건너뛸 신청 포함)"""
+    return db.session.query(func.count(VacationRequest.id)).filter(*_archive_criteria(before)).scalar()
+
+
+def conflicting_ids(before):
+    """보관 대상 중 같은 id가 이미 보관 테이블에 있는 신청 id 목록 (재사용된 id)"""
+    return db.session.scalars(
+        select(VacationRequest.id)
+        .where(*_archive_criteria(before), VacationRequest.id.in_(_archived_ids()))
+        .order_by(VacationRequest.id)
+    ).all()
+
+
+def archive_vacations(before=None):
+    """before 이전에 시작한 처리 완료 휴가 신청을 보관 테이블로 이동 (커밋은 호출하는 쪽에서 수행)
+
+    대기중 신청은 처리될 수 있도록 현재 테이블에 남긴다. 부서별 집계는 그대로 유지된다.
+    같은 id가 이미 보관 테이블에 있는 신청(conflicting_ids)은 현재 테이블에 남긴다.
+    Returns:
+        int: 이동한 건수
+    """
+    before = before or archive_cutoff()
+    criteria = _archive_criteria(before)
+    # 옮긴 뒤에는 보관 테이블에 id가 생기므로 충돌 id는 먼저 확정해 둔다
+    conflicts = conflicting_ids(before)
+    if conflicts:
+        criteria += (VacationRequest.id.notin_(conflicts),)
+
+    affected = db.session.execute(
+        select(User.id, User.department)
+        .where(User.id.in_(select(VacationRequest.user_id).where(*criteria)))
+    ).all()
+    if not affected:
+        return 0
+
+    source = select(*[VacationRequest.__table__.c[name] for name in _COLUMNS], literal(datetime.now()))\
+        .where(*criteria)
+    db.session.execute(
+        insert(VacationRequestArchive).from_select(_COLUMNS + ['archived_at'], source)
+    )
+    result = db.session.execute(delete(VacationRequest).where(*criteria))
+
+    # 세션을 거치지 않은 변경이므로 버전을 직접 증가
+    scopes = {VACATIONS}
+    for user_id, department in affected:
+        scopes.add(user_scope(user_id))
+        if department:
+            scopes.add(department_scope(department))
+    bump_version(*scopes)
+    return result.rowcount
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='과거 휴가 신청 보관')
+    parser.add_argument('--before', type=lambda value: datetime.strptime(value, '%Y-%m-%d').date(),
+                        help='이 날짜 이전에 시작한 휴가 보관 (기본값: 올해 - VACATION_ACTIVE_YEARS + 1년 1월 1일)')
+    parser.add_argument('--dry-run', action='store_true', help='이동하지 않고 대상 건수만 확인')
+    args = parser.parse_args(argv)
+
+    from app import app
+
+    with app.app_context():
+        before = args.before or archive_cutoff()
+        conflicts = conflicting_ids(before)
+        if conflicts:
+            print(f'⚠️ 보관 테이블에 같은 id가 있어 옮기지 않는 신청 {len(conflicts)}건: '
+                  f'{", ".join(str(vacation_id) for vacation_id in conflicts)}')
+        if args.dry_run:
+            print(f'📦 {before} 이전 휴가 신청 보관 대상: {count_archivable(before) - len(conflicts)}건')
+            return 0
+
+        try:
+            moved = archive_vacations(before)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ 휴가 신청 보관 중 오류: {e}')
+            return 1
+
+    print(f'✅ {before} 이전 휴가 신청 보관 완료: {moved}건')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
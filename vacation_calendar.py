@@ -0,0 +1,160 @@
+"""팀 휴가 현황 캘린더
+
+승인된 휴가를 부서별로 정렬된 시작일/종료일 배열(interval index)로 보관하고,
+특정 날짜의 휴가자 수를 이진 탐색 두 번으로 계산한다.
+  휴가자 수(d) = (시작일 <= d 인 건수) - (종료일 < d 인 건수)
+
+인덱스는 워커 프로세스마다 한 번 만들어 두고, 'vacations' 버전이 바뀐 경우에만 다시 만든다.
+보관 테이블(vacation_archive)로 옮겨진 기간을 조회하면 해당 기간의 보관 휴가만 따로 읽어서 더한다.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+
+from app import db
+from models import User, Role, VacationRequest, VacationStatus, Holiday
+from data_versions import VACATIONS, get_version
+from vacation_archive import vacation_sources
+
+# 부서 미지정 직원 표시용 이름
+UNASSIGNED = '미지정'
+
+
+class VacationIntervalIndex:
+    """부서별 승인 휴가 구간 인덱스"""
+
+    def __init__(self, intervals, version=0):
+        """intervals: (부서명, 시작일, 종료일) 목록"""
+        self.version = version
+        starts = {}
+        ends = {}
+        for department, start_date, end_date in intervals:
+            department = department or UNASSIGNED
+            starts.setdefault(department, []).append(start_date.toordinal())
+            ends.setdefault(department, []).append(end_date.toordinal())
+
+        self._starts = {dept: sorted(values) for dept, values in starts.items()}
+        self._ends = {dept: sorted(values) for dept, values in ends.items()}
+
+    @property
+    def departments(self):
+        return sorted(self._starts)
+
+    def count_out(self, department, day):
+        """해당 날짜에 휴가 중인 인원 수"""
+        starts = self._starts.get(department)
+        if not starts:
+            return 0
+        ordinal = day.toordinal()
+        return bisect_right(starts, ordinal) - bisect_left(self._ends[department], ordinal)
+
+    def daily_counts(self, date_from, date_to, departments=None):
+        """기간 내 날짜별/부서별 휴가 인원 {부서명: [인원, ...]}"""
+        departments = departments if departments is not None else self.departments
+        num_days = (date_to - date_from).days + 1
+        days = [date_from + timedelta(days=offset) for offset in range(num_days)]
+        return {dept: [self.count_out(dept, day) for day in days] for dept in departments}
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _load_intervals(model=VacationRequest, date_from=None, date_to=None):
+    """승인된 휴가 구간 (부서명, 시작일, 종료일) 조회 (기간을 주면 겹치는 휴가만)"""
+    query = db.session.query(
+        User.department,
+        model.start_date,
+        model.end_date
+    ).join(User, User.id == model.user_id)\
+    .filter(model.status == VacationStatus.APPROVED)
+    if date_from is not None and date_to is not None:
+        query = query.filter(model.start_date <= date_to, model.end_date >= date_from)
+    return query.all()
+
+
+def get_interval_index():
+    """현재 버전의 구간 인덱스 (변경이 있었을 때만 재생성)"""
+    global _index
+
+    version = get_version(VACATIONS)
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _index_lock:
+        if _index is None or _index.version != version:
+            _index = VacationIntervalIndex(_load_intervals(), version)
+        return _index
+
+
+def get_archived_index(date_from, date_to):
+    """보관 테이블에서 기간과 겹치는 승인 휴가 구간 인덱스 (보관된 범위가 아니면 None)
+
+    보관 휴가는 다시 바뀌지 않고 조회 빈도도 낮아서 캐시하지 않는다.
+    """
+    intervals = []
+    for model in vacation_sources(date_from, date_to):
+        if model is not VacationRequest:
+            intervals.extend(_load_intervals(model, date_from, date_to))
+    return VacationIntervalIndex(intervals) if intervals else None
+
+
+def department_headcounts():
+    """부서별 재직 인원 {부서명: 인원}"""
+    rows = db.session.query(User.department, db.func.count(User.id))\
+        .filter(User.role == Role.EMPLOYEE)\
+        .group_by(User.department).all()
+    return {(department or UNASSIGNED): count for department, count in rows}
+
+
+def build_calendar(date_from, date_to, department=None):
+    """기간별 부서 휴가 인원 및 공휴일 정보"""
+    index = get_interval_index()
+    archived = get_archived_index(date_from, date_to)
+    headcounts = department_headcounts()
+
+    if department:
+        departments = [department]
+    else:
+        departments = set(index.departments) | set(headcounts)
+        if archived:
+            departments |= set(archived.departments)
+        departments = sorted(departments)
+
+    counts = index.daily_counts(date_from, date_to, departments)
+    if archived:
+        archived_counts = archived.daily_counts(date_from, date_to, departments)
+        counts = {
+            dept: [current + old for current, old in zip(counts[dept], archived_counts[dept])]
+            for dept in departments
+        }
+
+    holidays = {
+        holiday.date: holiday.name
+        for holiday in Holiday.query.filter(Holiday.date.between(date_from, date_to)).all()
+    }
+
+    days = []
+    for offset in range((date_to - date_from).days + 1):
+        day = date_from + timedelta(days=offset)
+        by_department = {dept: counts[dept][offset] for dept in departments if counts[dept][offset]}
+        days.append({
+            'date': day.isoformat(),
+            'weekday': day.weekday(),
+            'weekend': day.weekday() >= 5,
+            'holiday': holidays.get(day),
+            'total_out': sum(by_department.values()),
+            'by_department': by_department
+        })
+
+    return {
+        'from': date_from.isoformat(),
+        'to': date_to.isoformat(),
+        'department': department,
+        'departments': [
+            {'name': dept, 'headcount': headcounts.get(dept, 0)} for dept in departments
+        ],
+        'days': days
+    }
@@ -0,0 +1,154 @@
+"""연도별 휴가 일수(VacationDays) 일괄 생성
+
+새해 첫 화면 조회 때마다 직원별로 VacationDays를 만들던 방식을 대신해서,
+대상 연도 레코드가 없는 직원 전체를 INSERT ... SELECT 한 번으로 생성한다.
+부여 일수는 leave_policy의 근속 기준 + 전년도 이월 규칙을 따른다.
+
+연말에 다음 해 레코드를 미리 만들어 둔다 (예: 매년 12월 31일 23:00 cron):
+    python year_rollover.py            # 다음 연도
+    python year_rollover.py --year 2026 [--dry-run]
+
+입사일 일괄 반영 등 인사 데이터 변경 후 기존 레코드의 부여 일수 재계산:
+    python year_rollover.py --year 2026 --recalculate
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from sqlalchemy import case, exists, func, insert, literal, select, update
+from sqlalchemy.orm import aliased
+
+from app import db
+from models import User, VacationDays
+from data_versions import bump_version, user_scope
+from leave_policy import annual_entitlement, entitlement_expression, carryover_expression, recalculate_entitlements
+
+
+def _missing_criteria(year):
+    """해당 연도 레코드가 없는 직원 조건"""
+    return ~exists().where(VacationDays.user_id == User.id, VacationDays.year == year)
+
+
+def count_missing(year, *criteria):
+    """해당 연도 레코드가 없는 직원 수"""
+    return db.session.query(func.count(User.id))\
+        .filter(_missing_criteria(year), *criteria).scalar()
+
+
+def provision_year(year, *criteria):
+    """해당 연도 레코드가 없는 직원의 VacationDays 일괄 생성 (커밋은 호출하는 쪽에서 수행)
+
+    criteria로 대상 직원을 좁힐 수 있다. 예) provision_year(2026, User.id == user_id)
+    Returns:
+        int: 생성된 레코드 수
+    """
+    user_ids = db.session.execute(
+        select(User.id).where(_missing_criteria(year), *criteria)
+    ).scalars().all()
+    if not user_ids:
+        return 0
+
+    previous = aliased(VacationDays)
+    source = select(
+        User.id,
+        literal(year),
+        entitlement_expression(year) + carryover_expression(previous),
+        literal(0.0)
+    ).select_from(User).outerjoin(
+        previous,
+        (previous.user_id == User.id) & (previous.year == year - 1)
+    ).where(_missing_criteria(year), *criteria)
+
+    result = db.session.execute(
+        insert(VacationDays).from_select(['user_id', 'year', 'total_days', 'used_days'], source)
+    )
+    # 세션을 거치지 않은 변경이므로 직원별 버전을 직접 증가
+    bump_version(*[user_scope(user_id) for user_id in user_ids])
+    return result.rowcount
+
+
+def ensure_vacation_days(user_id, year):
+    """쓰기 작업(승인/등록 등) 전에 해당 직원의 연도 레코드를 보장"""
+    vacation_days = VacationDays.query.filter_by(user_id=user_id, year=year).first()
+    if vacation_days is None:
+        provision_year(year, User.id == user_id)
+        vacation_days = VacationDays.query.filter_by(user_id=user_id, year=year).first()
+    return vacation_days
+
+
+def adjust_used_days(user_id, year, delta):
+    """연차 사용 일수 증감 (커밋은 호출하는 쪽에서 수행)
+
+    값을 읽어서 더한 뒤 다시 쓰지 않고 UPDATE ... SET used_days = used_days + :delta 한 문장으로
+    처리하므로, 여러 워커에서 동시에 승인/삭제해도 서로의 변경을 덮어쓰지 않는다.
+    차감 복구(delta < 0)는 0 아래로 내려가지 않으며, 레코드가 없으면 복구할 것도 없으므로 건너뛴다.
+    """
+    if not delta:
+        return
+
+    new_value = VacationDays.used_days + delta
+    statement = (
+        update(VacationDays)
+        .where(VacationDays.user_id == user_id, VacationDays.year == year)
+        .values(used_days=case((new_value < 0, 0), else_=new_value))
+        .execution_options(synchronize_session='fetch')
+    )
+    if db.session.execute(statement).rowcount == 0:
+        if delta < 0:
+            return
+        provision_year(year, User.id == user_id)
+        db.session.execute(statement)
+
+    # 세션을 거치지 않은 변경이므로 직원별 버전을 직접 증가
+    bump_version(user_scope(user_id))
+
+
+def get_vacation_days(user_id, year, user=None):
+    """조회용 연도 레코드 (없으면 부여 기준으로 계산한 저장되지 않은 객체 반환)"""
+    vacation_days = VacationDays.query.filter_by(user_id=user_id, year=year).first()
+    if vacation_days is not None:
+        return vacation_days
+
+    user = user or User.query.get(user_id)
+    return VacationDays(
+        user_id=user_id,
+        year=year,
+        total_days=annual_entitlement(user.hire_date if user else None, year),
+        used_days=0
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='연도별 휴가 일수 일괄 생성')
+    parser.add_argument('--year', type=int, default=datetime.now().year + 1,
+                        help='생성할 연도 (기본값: 다음 연도)')
+    parser.add_argument('--dry-run', action='store_true', help='생성하지 않고 대상 인원만 확인')
+    parser.add_argument('--recalculate', action='store_true', help='기존 레코드의 부여 일수도 입사일 기준으로 재계산')
+    args = parser.parse_args(argv)
+
+    from app import app
+
+    with app.app_context():
+        missing = count_missing(args.year)
+        if args.dry_run:
+            print(f'📅 {args.year}년 휴가 일수 생성 대상: {missing}명')
+            return 0
+
+        try:
+            created = provision_year(args.year)
+            changed = recalculate_entitlements(args.year) if args.recalculate else 0
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ {args.year}년 휴가 일수 생성 중 오류: {e}')
+            return 1
+
+    print(f'✅ {args.year}년 휴가 일수 생성 완료: {created}명')
+    if args.recalculate:
+        print(f'✅ {args.year}년 부여 일수 재계산: {changed}명 변경')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())